@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+全流程压力测试 - 用本地合成数据源按指定规模运行 main.py，记录各阶段耗时和峰值内存
+
+启动 scripts/synthetic_sources.py 的模拟接口，为每个规模生成临时配置（数据源
+base_url 指向本地服务，状态和输出目录使用临时目录，关闭 AI 处理），在子进程中
+运行 `python -m src.main --profile-memory`，从追踪文件中读取各阶段的墙钟时间、
+CPU 时间和峰值 RSS。
+
+使用方法:
+    # 默认规模 1000 / 10000 / 100000 条
+    python scripts/load_test.py
+
+    # 指定规模和数据源比例，模拟 50ms 延迟和 2% 失败率
+    python scripts/load_test.py --scales 1000 10000 --mix rss=0.5 twitter=0.2 youtube=0.1 reddit=0.2 \\
+        --latency-ms 50 --failure-rate 0.02
+
+    # 取消每个分类的 Top N 截断，让全部条目进入排序之后的阶段
+    python scripts/load_test.py --top-n 0
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+# 添加项目根目录到路径
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_sources import SyntheticSources, serve
+
+# 每个请求返回的条目数（与合成数据源一致）
+TWEETS_PER_QUERY = 100
+VIDEOS_PER_QUERY = 50
+POSTS_PER_SUBREDDIT = 100
+RSS_CATEGORIES = ["科技热点", "AI新闻", "开发者", "产品发布"]
+
+# 汇总表中展示的流水线阶段（追踪 span 名称前缀）
+STAGES = ("collect:", "keywords", "rank", "cluster", "ai:", "generate", "run")
+
+
+def build_config(base: Dict[str, Any], scale: int, mix: Dict[str, float], base_url: str,
+                 entries_per_feed: int, work_dir: Path, top_n) -> Dict[str, Any]:
+    """生成某个规模的配置：各数据源按比例分配条目数，指向本地合成数据源"""
+    config = json.loads(json.dumps(base))
+    counts = {name: int(round(scale * share)) for name, share in mix.items()}
+    sources = {name: {"enabled": False} for name in config.get("sources", {})}
+
+    if counts.get("rss"):
+        feeds = math.ceil(counts["rss"] / entries_per_feed)
+        sources["rss"] = {
+            "enabled": True, "max_per_feed": entries_per_feed, "delay": 0,
+            "feeds": [{"name": f"Synthetic {i}", "url": f"{base_url}/{'atom' if i % 2 else 'rss'}/{i}.xml",
+                       "category": RSS_CATEGORIES[i % len(RSS_CATEGORIES)]} for i in range(feeds)],
+        }
+    if counts.get("twitter"):
+        sources["twitter"] = {"enabled": True, "base_url": base_url, "delay": 0, "max_results": TWEETS_PER_QUERY,
+                              "queries": [f"q{i}" for i in range(math.ceil(counts["twitter"] / TWEETS_PER_QUERY))]}
+    if counts.get("youtube"):
+        sources["youtube"] = {"enabled": True, "base_url": f"{base_url}/youtube/v3", "delay": 0,
+                              "max_results": VIDEOS_PER_QUERY, "days": 2,
+                              "queries": [f"v{i}" for i in range(math.ceil(counts["youtube"] / VIDEOS_PER_QUERY))]}
+    if counts.get("reddit"):
+        sources["reddit"] = {"enabled": True, "base_url": base_url, "min_score": 0, "hours": 24,
+                             "subreddits": [f"sub{i}" for i in range(math.ceil(counts["reddit"] / POSTS_PER_SUBREDDIT))]}
+    config["sources"] = sources
+
+    config["state_dir"] = str(work_dir / "state")
+    config.setdefault("output", {})["dir"] = str(work_dir / "docs")
+    config.setdefault("ai", {})["enabled"] = False
+    if top_n is not None:
+        config.setdefault("ranking", {})["top_n_per_category"] = top_n
+    return config
+
+
+def run_scale(config_path: Path, state_dir: Path, timeout: float) -> Dict[str, Any]:
+    """在子进程中运行 main.py，返回总耗时、子进程峰值 RSS 和各阶段数据"""
+    env = dict(os.environ, TWITTER_API_KEY="synthetic", YOUTUBE_API_KEY="synthetic",
+               LITELLM_LOCAL_MODEL_COST_MAP="True")
+    log_path = state_dir.parent / "main.log"
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "src.main", "--config", str(config_path), "--profile-memory", "--force"],
+            cwd=PROJECT_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            return {"error": f"超时 ({timeout:.0f}s)", "seconds": time.perf_counter() - start}
+    seconds = time.perf_counter() - start
+    if process.returncode != 0:
+        tail = log_path.read_text(encoding="utf-8", errors="replace").splitlines()[-5:]
+        return {"error": f"退出码 {process.returncode}: {' | '.join(tail)}", "seconds": seconds}
+
+    traces = sorted((state_dir / "profile").glob("trace-*.json"))
+    if not traces:
+        return {"error": "未找到追踪文件", "seconds": seconds}
+    return {"seconds": seconds, "stages": stage_summary(json.loads(traces[-1].read_text(encoding="utf-8")))}
+
+
+def stage_summary(trace: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """从 Chrome Trace 中提取流水线阶段: {名称: {wall_ms, cpu_ms, rss_peak_mb, items}}"""
+    stages: Dict[str, Dict[str, float]] = {}
+    for event in trace.get("traceEvents", []):
+        if event.get("ph") != "X" or not event["name"].startswith(STAGES):
+            continue
+        if event["name"].startswith("collect:") and event.get("cat") != "collect":
+            continue
+        args = event.get("args", {})
+        stages[event["name"]] = {
+            "wall_ms": round(event["dur"] / 1000, 1),
+            "cpu_ms": args.get("cpu_ms", 0.0),
+            "rss_peak_mb": args.get("rss_peak_mb", 0.0),
+            "items": args.get("items", 0),
+        }
+    return stages
+
+
+def parse_mix(values: List[str]) -> Dict[str, float]:
+    mix = {}
+    for value in values:
+        name, _, share = value.partition("=")
+        mix[name] = float(share)
+    total = sum(mix.values())
+    return {name: share / total for name, share in mix.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="全流程压力测试")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000, 100000], help="采集条目总数")
+    parser.add_argument("--mix", nargs="+", default=["rss=0.7", "twitter=0.1", "youtube=0.1", "reddit=0.1"],
+                        help="各数据源条目比例 (名称=比例)")
+    parser.add_argument("--entries-per-feed", type=int, default=100, help="每个订阅源的条目数 (默认100)")
+    parser.add_argument("--body-bytes", type=int, default=1500, help="订阅源条目正文字节数 (默认1500)")
+    parser.add_argument("--latency-ms", type=float, default=20, help="模拟接口响应延迟 (默认20ms)")
+    parser.add_argument("--jitter-ms", type=float, default=10, help="延迟随机波动 (默认10ms)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="模拟接口返回 503 的比例")
+    parser.add_argument("--top-n", type=int, help="覆盖 ranking.top_n_per_category，0 表示不截断")
+    parser.add_argument("--timeout", type=float, default=3600, help="单个规模的超时 (秒)")
+    parser.add_argument("--keep", help="保留各规模的配置、日志和输出到该目录")
+    parser.add_argument("--output", default="tests/results/load_test.json", help="结果文件")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    base = yaml.safe_load(Path(PROJECT_ROOT, "config", "config.yaml").read_text(encoding="utf-8"))
+    sources = SyntheticSources(args.entries_per_feed, args.body_bytes, args.latency_ms,
+                               args.jitter_ms, args.failure_rate)
+    server = serve(sources)
+    host, port = server.server_address[:2]
+    base_url = f"http://{host}:{port}"
+    print(f"合成数据源: {base_url} | 延迟 {args.latency_ms}±{args.jitter_ms}ms, 失败率 {args.failure_rate:.0%}")
+
+    results = {}
+    tmp = tempfile.TemporaryDirectory()
+    root = Path(args.keep) if args.keep else Path(tmp.name)
+    try:
+        for scale in args.scales:
+            work_dir = root / f"scale-{scale}"
+            work_dir.mkdir(parents=True, exist_ok=True)
+            config = build_config(base, scale, mix, base_url, args.entries_per_feed, work_dir, args.top_n)
+            config_path = work_dir / "config.yaml"
+            config_path.write_text(yaml.safe_dump(config, allow_unicode=True), encoding="utf-8")
+
+            print(f"\n▶ {scale} 条 ...")
+            requests_before = sources.requests
+            result = run_scale(config_path, Path(config["state_dir"]), args.timeout)
+            result["requests"] = sources.requests - requests_before
+            results[scale] = result
+            print_result(result)
+    finally:
+        server.shutdown()
+        tmp.cleanup()
+
+    output = Path(PROJECT_ROOT, args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "cpus": os.cpu_count(),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("output", "keep")},
+        "results": results,
+    }, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n结果已保存: {output}")
+
+
+def print_result(result: Dict[str, Any]):
+    if "error" in result:
+        print(f"  ❌ {result['error']}")
+        return
+    print(f"  总耗时 {result['seconds']:.1f}s, 请求 {result['requests']} 次")
+    print(f"  {'阶段':<20} {'条目':>8} {'墙钟(ms)':>10} {'CPU(ms)':>10} {'峰值RSS(MB)':>12}")
+    for name, stage in result["stages"].items():
+        print(f"  {name:<20} {stage['items'] or '':>8} {stage['wall_ms']:>10.1f} "
+              f"{stage['cpu_ms']:>10.1f} {stage['rss_peak_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
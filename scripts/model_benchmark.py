@@ -2,27 +2,37 @@
 """
 模型对比测试工具 - 用于对比不同 LLM 的翻译和摘要效果
 
+测试数据首次运行时从启用的采集器获取并保存为快照，之后重复使用，
+保证不同次运行之间可比较；各模型的请求并发执行，先预热再重复多轮。
+
 使用方法:
-    # 使用真实采集数据对比所有模型
+    # 使用数据快照对比所有模型（快照不存在时先采集真实数据）
     python scripts/model_benchmark.py
 
     # 只测试特定模型
     python scripts/model_benchmark.py --models qwen glm
 
-    # 限制测试数据条数
-    python scripts/model_benchmark.py --limit 10
+    # 限制测试数据条数（重新采集快照时生效）
+    python scripts/model_benchmark.py --limit 10 --refresh-dataset
 
     # 只使用 RSS 数据源
-    python scripts/model_benchmark.py --source rss
+    python scripts/model_benchmark.py --sources RSS
+
+    # 重复 5 轮、预热 2 次、并发 8 个请求、每批 5 条
+    python scripts/model_benchmark.py --trials 5 --warmup 2 --concurrency 8 --batch-size 5
+
+    # 对比 JSON 与紧凑行格式的延迟和解析成功率
+    python scripts/model_benchmark.py --formats json compact
 """
 import os
 import sys
 import json
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 
 # 添加项目根目录到路径
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -32,10 +42,10 @@ import litellm
 litellm.suppress_debug_info = True
 
 from src.config import Config
-from src.collectors.rss import RSSCollector
-from src.collectors.twitter import TwitterCollector
-from src.collectors.youtube import YouTubeCollector
 from src.prompts import PromptManager
+from src.processors.api_mode import APIProcessor
+from src.processors.parsers import parse_results
+from src.registry import build_collectors
 
 
 # ============ 模型配置 ============
@@ -60,127 +70,194 @@ MODELS = {
     # },
 }
 
+# 采集器名称 -> 报告中的来源名
+SOURCE_LABELS = {"rss": "RSS", "twitter": "Twitter", "youtube": "YouTube", "reddit": "Reddit"}
+
+DEFAULT_DATASET = os.path.join(PROJECT_ROOT, "tests", "fixtures", "model_benchmark_dataset.json")
+CONFIG_PATH = os.path.join(PROJECT_ROOT, "config", "config.yaml")
+
+
+def with_token_settings(models: Dict[str, Dict], ai: Dict[str, Any]) -> Dict[str, Dict]:
+    """为各模型附加 ai 配置中的 max_tokens / reasoning_tokens / tokens_per_item，
+    与 APIProcessor 使用相同的 token 预算"""
+    settings = {key: ai[key] for key in ("max_tokens", "reasoning_tokens", "tokens_per_item")
+                if ai.get(key) is not None}
+    return {key: {**settings, **model} for key, model in models.items()}
+
+
+def max_tokens_for(config: Dict, response_format: str, batch_size: int) -> int:
+    """与 APIProcessor._calculate_max_tokens 相同的计算"""
+    tokens_per_item = config.get("tokens_per_item", get_task_info(response_format).get('tokens_per_item', 100))
+    reasoning = APIProcessor.reasoning_tokens(config["model"], config.get("reasoning_tokens"))
+    return min(config.get("max_tokens", 2000), APIProcessor.BASE_TOKENS + reasoning + tokens_per_item * batch_size)
+
+
+# ============ 测试数据快照 ============
 
 def collect_real_data(limit_per_source: int = 5) -> Dict[str, List[str]]:
     """从项目所有启用的采集器获取真实数据，按来源分组"""
-    config_path = os.path.join(PROJECT_ROOT, "config", "config.yaml")
-    config = Config(config_path)
+    config = Config(CONFIG_PATH)
 
     data_by_source = {}
-
-    # RSS 采集
-    rss_config = config.get_source_config("rss")
-    if rss_config.get("enabled"):
-        print("📥 采集 RSS 数据...")
-        collector = RSSCollector(rss_config)
+    for collector in build_collectors(config):
+        label = SOURCE_LABELS.get(collector.name, collector.name)
+        print(f"📥 采集 {label} 数据...")
         items = collector.collect()
         titles = list(dict.fromkeys([item.title for item in items]))[:limit_per_source]
         if titles:
-            data_by_source["RSS"] = titles
-            print(f"   RSS: {len(titles)} 条")
-
-    # Twitter 采集
-    twitter_config = config.get_source_config("twitter")
-    if twitter_config.get("enabled"):
-        print("📥 采集 Twitter 数据...")
-        collector = TwitterCollector(twitter_config)
-        items = collector.collect()
-        titles = list(dict.fromkeys([item.title for item in items]))[:limit_per_source]
-        if titles:
-            data_by_source["Twitter"] = titles
-            print(f"   Twitter: {len(titles)} 条")
-
-    # YouTube 采集
-    youtube_config = config.get_source_config("youtube")
-    if youtube_config.get("enabled"):
-        print("📥 采集 YouTube 数据...")
-        collector = YouTubeCollector(youtube_config)
-        items = collector.collect()
-        titles = list(dict.fromkeys([item.title for item in items]))[:limit_per_source]
-        if titles:
-            data_by_source["YouTube"] = titles
-            print(f"   YouTube: {len(titles)} 条")
+            data_by_source[label] = titles
+            print(f"   {label}: {len(titles)} 条")
+    return data_by_source
+
 
+def load_dataset(path: str, limit_per_source: int = 5, refresh: bool = False) -> Dict[str, List[str]]:
+    """读取数据快照，不存在或要求刷新时重新采集并保存"""
+    if not refresh and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        print(f"📂 使用数据快照: {path} ({snapshot.get('created', '')})")
+        return snapshot.get("sources", {})
+
+    data_by_source = collect_real_data(limit_per_source)
+    if data_by_source:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"created": datetime.now().isoformat(timespec="seconds"),
+                       "limit_per_source": limit_per_source, "sources": data_by_source},
+                      f, ensure_ascii=False, indent=2)
+        print(f"💾 数据快照已保存: {path}")
     return data_by_source
 
 
+# ============ 结果 ============
+
 @dataclass
 class TestResult:
-    """单次测试结果"""
+    """单条测试结果"""
     model_key: str
     model_name: str
-    source: str  # 数据来源: RSS, Twitter, YouTube
+    source: str  # 数据来源: RSS, Twitter, YouTube, Reddit
     title: str
     translated: str
     summary: str
+    latency_ms: float  # 所在批次的请求延迟
+    success: bool
+    response_format: str = "json"
+    parsed: bool = False  # 该条是否在返回结果中被解析到
+    trial: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class CallResult:
+    """单次请求（一个批次）结果"""
+    model_key: str
+    source: str
+    response_format: str
+    trial: int
+    items: int
     latency_ms: float
     success: bool
+    parsed: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
     error: Optional[str] = None
 
 
 @dataclass
 class ModelStats:
-    """模型统计数据"""
+    """模型统计数据（延迟按请求统计）"""
     model_key: str
     model_name: str
     total_tests: int
     success_count: int
     fail_count: int
     avg_latency_ms: float
-    min_latency_ms: float
-    max_latency_ms: float
+    p50_latency_ms: float
+    p95_latency_ms: float
+    p99_latency_ms: float
+    tokens_per_s: float  # 输出 token / 请求耗时
+    items_per_s: float  # 条目 / 请求耗时（单个请求流的吞吐）
+    response_format: str = "json"
+    source: str = "全部"
+    calls: int = 0
+    parse_success_rate: float = 0.0
+
+
+@dataclass
+class BenchmarkRun:
+    """一次基准测试的全部结果，按 "模型:格式" 分组"""
+    items: Dict[str, List[TestResult]] = field(default_factory=dict)
+    calls: Dict[str, List[CallResult]] = field(default_factory=dict)
+    wall_seconds: float = 0.0
 
 
 # 初始化 PromptManager
 prompt_manager = PromptManager()
 
 
-def build_prompt(titles: List[str], model: str = None) -> Dict[str, str]:
+def build_prompt(titles: List[str], model: str = None, response_format: str = "json") -> Dict[str, str]:
     """构建测试提示词，返回 system 和 user prompt"""
     content = prompt_manager.format_content_list(titles)
     return prompt_manager.get_prompt(
-        task_name='translate_summarize',
+        task_name=APIProcessor.TASKS.get(response_format, 'translate_summarize'),
         model=model,
         variables={'content': content}
     )
 
 
-def parse_response(text: str, count: int) -> List[Dict]:
-    """解析模型响应"""
+def get_task_info(response_format: str) -> Dict[str, Any]:
+    """获取输出格式对应的任务配置"""
+    task_name = APIProcessor.TASKS.get(response_format, 'translate_summarize')
+    return prompt_manager.get_task_info(task_name) or {}
+
+
+def parse_response(text: str, response_format: str = "json") -> Dict[int, Dict]:
+    """解析模型响应，返回 {序号: {translated, summary}}"""
     try:
-        start = text.find('[')
-        end = text.rfind(']') + 1
-        if start >= 0 and end > start:
-            return json.loads(text[start:end])
-    except:
-        pass
-    return [{"index": i+1, "translated": "", "summary": ""} for i in range(count)]
+        return parse_results(text, get_task_info(response_format).get('output_format', 'json'))
+    except Exception:
+        return {}
 
 
-def test_model(model_key: str, config: Dict, titles: List[str], source: str) -> List[TestResult]:
-    """测试单个模型"""
-    results = []
+def percentile(values: List[float], pct: float) -> float:
+    """线性插值百分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def call_model(model_key: str, config: Dict, titles: List[str], source: str,
+               response_format: str = "json", trial: int = 0) -> Tuple[CallResult, List[TestResult]]:
+    """发送一个批次的请求，返回 (CallResult, [TestResult])"""
     api_key = os.environ.get(config["api_key_env"], "")
 
+    def failed(latency_ms: float, error: str):
+        call = CallResult(model_key, source, response_format, trial, len(titles), latency_ms, False, error=error)
+        return call, [TestResult(
+            model_key=model_key,
+            model_name=config["name"],
+            source=source,
+            title=title,
+            translated="",
+            summary="",
+            latency_ms=latency_ms,
+            success=False,
+            response_format=response_format,
+            trial=trial,
+            error=error
+        ) for title in titles]
+
     if not api_key:
-        print(f"  [跳过] 未设置环境变量 {config['api_key_env']}")
-        for title in titles:
-            results.append(TestResult(
-                model_key=model_key,
-                model_name=config["name"],
-                source=source,
-                title=title,
-                translated="",
-                summary="",
-                latency_ms=0,
-                success=False,
-                error=f"Missing {config['api_key_env']}"
-            ))
-        return results
-
-    prompts = build_prompt(titles, config["model"])
-
-    start_time = time.time()
+        return failed(0, f"Missing {config['api_key_env']}")
+
+    prompts = build_prompt(titles, config["model"], response_format)
+
+    start_time = time.perf_counter()
     try:
         messages = []
         if prompts['system']:
@@ -191,52 +268,100 @@ def test_model(model_key: str, config: Dict, titles: List[str], source: str) ->
             "model": config["model"],
             "messages": messages,
             "api_key": api_key,
-            "max_tokens": 2000,
+            "max_tokens": max_tokens_for(config, response_format, len(titles)),
         }
         if config.get("api_base"):
             kwargs["api_base"] = config["api_base"]
 
         response = litellm.completion(**kwargs)
-        latency_ms = (time.time() - start_time) * 1000
-
-        result_text = response.choices[0].message.content
-        parsed = parse_response(result_text, len(titles))
-
-        for i, title in enumerate(titles):
-            item = next((p for p in parsed if p.get("index") == i+1), {})
-            results.append(TestResult(
-                model_key=model_key,
-                model_name=config["name"],
-                source=source,
-                title=title,
-                translated=item.get("translated", ""),
-                summary=item.get("summary", ""),
-                latency_ms=latency_ms / len(titles),
-                success=True,
-            ))
-
+        latency_ms = (time.perf_counter() - start_time) * 1000
     except Exception as e:
-        latency_ms = (time.time() - start_time) * 1000
-        for title in titles:
-            results.append(TestResult(
-                model_key=model_key,
-                model_name=config["name"],
-                source=source,
-                title=title,
-                translated="",
-                summary="",
-                latency_ms=latency_ms / len(titles),
-                success=False,
-                error=str(e)
-            ))
-
-    return results
-
-
-def calculate_stats(results: List[TestResult]) -> ModelStats:
+        return failed((time.perf_counter() - start_time) * 1000, str(e))
+
+    result_text = response.choices[0].message.content or ""
+    parsed = parse_response(result_text, response_format)
+    usage = getattr(response, 'usage', None)
+
+    results = []
+    for i, title in enumerate(titles):
+        item = parsed.get(i + 1, {})
+        results.append(TestResult(
+            model_key=model_key,
+            model_name=config["name"],
+            source=source,
+            title=title,
+            translated=item.get("translated", ""),
+            summary=item.get("summary", ""),
+            latency_ms=latency_ms,
+            success=True,
+            response_format=response_format,
+            parsed=bool(item.get("translated")),
+            trial=trial,
+        ))
+    call = CallResult(
+        model_key, source, response_format, trial, len(titles), latency_ms, True,
+        parsed=sum(1 for r in results if r.parsed),
+        prompt_tokens=getattr(usage, 'prompt_tokens', 0) or 0,
+        completion_tokens=getattr(usage, 'completion_tokens', 0) or 0,
+    )
+    return call, results
+
+
+def split_batches(titles: List[str], batch_size: int) -> List[List[str]]:
+    """按批次大小切分，0 表示整个来源作为一批"""
+    if batch_size <= 0:
+        return [titles]
+    return [titles[i:i + batch_size] for i in range(0, len(titles), batch_size)]
+
+
+def run_benchmark(model_keys: List[str], formats: List[str], data_by_source: Dict[str, List[str]],
+                  trials: int = 3, warmup: int = 1, concurrency: int = 4, batch_size: int = 0,
+                  models: Optional[Dict[str, Dict]] = None) -> BenchmarkRun:
+    """并发运行全部 (模型, 格式, 来源, 批次, 轮次) 请求
+
+    每个 (模型, 格式) 先发送 warmup 个不计入统计的请求（建立连接、触发服务端缓存），
+    之后 trials 轮请求交错提交到线程池，避免某个模型集中在同一时间段
+    """
+    models = models or MODELS
+    run = BenchmarkRun()
+    jobs = []
+    for trial in range(trials):
+        for source, titles in data_by_source.items():
+            for batch in split_batches(titles, batch_size):
+                for model_key in model_keys:
+                    for fmt in formats:
+                        jobs.append((model_key, fmt, source, batch, trial))
+    for model_key in model_keys:
+        for fmt in formats:
+            run.items[f"{model_key}:{fmt}"] = []
+            run.calls[f"{model_key}:{fmt}"] = []
+
+    first_batch = next((split_batches(titles, batch_size)[0]
+                        for titles in data_by_source.values() if titles), [])
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        if warmup and first_batch:
+            print(f"🔥 预热 {warmup} 次...")
+            list(pool.map(lambda job: call_model(job[0], models[job[0]], first_batch, "warmup", job[1]),
+                          [(k, fmt) for k in model_keys for fmt in formats for _ in range(warmup)]))
+
+        print(f"🔄 发送 {len(jobs)} 个请求 (并发 {concurrency})...")
+        start = time.perf_counter()
+        futures = [(job, pool.submit(call_model, job[0], models[job[0]], job[3], job[2], job[1], job[4]))
+                   for job in jobs]
+        for (model_key, fmt, _, _, _), future in futures:
+            call, results = future.result()
+            run.calls[f"{model_key}:{fmt}"].append(call)
+            run.items[f"{model_key}:{fmt}"].extend(results)
+        run.wall_seconds = time.perf_counter() - start
+    return run
+
+
+def calculate_stats(results: List[TestResult], calls: List[CallResult], source: str = "全部") -> ModelStats:
     """计算模型统计数据"""
     success_results = [r for r in results if r.success]
-    latencies = [r.latency_ms for r in success_results] if success_results else [0]
+    ok_calls = [c for c in calls if c.success]
+    latencies = [c.latency_ms for c in ok_calls] or [0]
+    busy_seconds = sum(c.latency_ms for c in ok_calls) / 1000
 
     return ModelStats(
         model_key=results[0].model_key,
@@ -245,70 +370,94 @@ def calculate_stats(results: List[TestResult]) -> ModelStats:
         success_count=len(success_results),
         fail_count=len(results) - len(success_results),
         avg_latency_ms=sum(latencies) / len(latencies),
-        min_latency_ms=min(latencies),
-        max_latency_ms=max(latencies),
+        p50_latency_ms=percentile(latencies, 50),
+        p95_latency_ms=percentile(latencies, 95),
+        p99_latency_ms=percentile(latencies, 99),
+        tokens_per_s=sum(c.completion_tokens for c in ok_calls) / busy_seconds if busy_seconds else 0.0,
+        items_per_s=sum(c.items for c in ok_calls) / busy_seconds if busy_seconds else 0.0,
+        response_format=results[0].response_format,
+        source=source,
+        calls=len(calls),
+        parse_success_rate=sum(1 for r in results if r.parsed) / len(results),
     )
 
 
-def print_comparison(all_results: Dict[str, List[TestResult]]):
+def stats_by_source(run: BenchmarkRun, run_key: str) -> List[ModelStats]:
+    """按来源拆分的统计，第一项为全部来源"""
+    results, calls = run.items[run_key], run.calls[run_key]
+    if not results:
+        return []
+    stats = [calculate_stats(results, calls)]
+    for source in dict.fromkeys(r.source for r in results):
+        stats.append(calculate_stats([r for r in results if r.source == source],
+                                     [c for c in calls if c.source == source], source))
+    return stats
+
+
+def print_comparison(run: BenchmarkRun):
     """打印对比结果"""
-    print("\n" + "=" * 80)
+    print("\n" + "=" * 100)
     print("模型对比结果")
-    print("=" * 80)
+    print("=" * 100)
 
     # 统计信息
-    print("\n📊 性能统计:")
-    print("-" * 60)
-    print(f"{'模型':<25} {'成功率':<12} {'平均延迟':<15} {'状态'}")
-    print("-" * 60)
-
-    for model_key, results in all_results.items():
-        stats = calculate_stats(results)
-        success_rate = f"{stats.success_count}/{stats.total_tests}"
-        latency = f"{stats.avg_latency_ms:.0f}ms" if stats.success_count > 0 else "N/A"
-        status = "✅" if stats.success_count == stats.total_tests else "⚠️" if stats.success_count > 0 else "❌"
-        print(f"{stats.model_name:<25} {success_rate:<12} {latency:<15} {status}")
-
-    # 按来源分组显示详细对比
-    sources = list(set(r.source for results in all_results.values() for r in results))
+    print(f"\n📊 性能统计 (墙钟 {run.wall_seconds:.1f}s):")
+    print("-" * 100)
+    print(f"{'模型':<22} {'格式':<8} {'来源':<8} {'成功率':<10} {'解析率':<7} "
+          f"{'p50':>7} {'p95':>7} {'p99':>7} {'token/s':>8} {'条/s':>6}  状态")
+    print("-" * 100)
+
+    for run_key in run.items:
+        for stats in stats_by_source(run, run_key):
+            success_rate = f"{stats.success_count}/{stats.total_tests}"
+            status = "✅" if stats.success_count == stats.total_tests else "⚠️" if stats.success_count > 0 else "❌"
+            if stats.success_count:
+                latency = f"{stats.p50_latency_ms:>7.0f} {stats.p95_latency_ms:>7.0f} {stats.p99_latency_ms:>7.0f}"
+            else:
+                latency = f"{'N/A':>7} {'N/A':>7} {'N/A':>7}"
+            print(f"{stats.model_name[:22]:<22} {stats.response_format:<8} {stats.source:<8} {success_rate:<10} "
+                  f"{stats.parse_success_rate:<7.0%} {latency} {stats.tokens_per_s:>8.1f} "
+                  f"{stats.items_per_s:>6.2f}  {status}")
+
+    # 按来源分组显示详细对比（取第一轮结果）
+    first_trial = {k: [r for r in v if r.trial == 0] for k, v in run.items.items()}
+    sources = list(dict.fromkeys(r.source for results in first_trial.values() for r in results))
 
     for source in sources:
         print(f"\n📝 [{source}] 翻译对比:")
         print("-" * 80)
 
         # 获取该来源的标题（取前2条）
-        titles = []
-        for results in all_results.values():
-            for r in results:
-                if r.source == source and r.title not in titles:
-                    titles.append(r.title)
-                    if len(titles) >= 2:
-                        break
-            if len(titles) >= 2:
-                break
+        titles = list(dict.fromkeys(r.title for results in first_trial.values()
+                                    for r in results if r.source == source))[:2]
 
         for title in titles:
             # 截断过长的标题
             display_title = title[:60] + "..." if len(title) > 60 else title
             print(f"\n原文: {display_title}")
-            for model_key, results in all_results.items():
+            for run_key, results in first_trial.items():
                 result = next((r for r in results if r.title == title), None)
+                label = f"{results[0].model_name[:12]}/{results[0].response_format}" if results else run_key
                 if result and result.success:
-                    print(f"  [{MODELS[model_key]['name'][:12]}]")
+                    print(f"  [{label}]")
                     print(f"    翻译: {result.translated}")
                     print(f"    摘要: {result.summary}")
                 else:
                     error = result.error if result else "未测试"
-                    print(f"  [{MODELS[model_key]['name'][:12]}] ❌ {error}")
+                    print(f"  [{label}] ❌ {error}")
 
 
-def save_results(all_results: Dict[str, List[TestResult]], output_path: str):
+def save_results(run: BenchmarkRun, output_path: str, settings: Dict[str, Any]):
     """保存结果到 JSON"""
     data = {
         "timestamp": datetime.now().isoformat(),
-        "results": {k: [asdict(r) for r in v] for k, v in all_results.items()},
-        "stats": {k: asdict(calculate_stats(v)) for k, v in all_results.items()},
+        "settings": settings,
+        "wall_seconds": run.wall_seconds,
+        "stats": {k: [asdict(s) for s in stats_by_source(run, k)] for k in run.items},
+        "calls": {k: [asdict(c) for c in v] for k, v in run.calls.items()},
+        "results": {k: [asdict(r) for r in v] for k, v in run.items.items()},
     }
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
     print(f"\n💾 结果已保存到: {output_path}")
@@ -317,7 +466,16 @@ def save_results(all_results: Dict[str, List[TestResult]], output_path: str):
 def main():
     parser = argparse.ArgumentParser(description="模型对比测试工具")
     parser.add_argument("--models", nargs="+", help="要测试的模型 (默认全部)")
-    parser.add_argument("--limit", type=int, default=5, help="每个数据源的测试条数 (默认5)")
+    parser.add_argument("--limit", type=int, default=5, help="采集快照时每个数据源的条数 (默认5)")
+    parser.add_argument("--sources", nargs="+", help="只使用指定来源 (如 RSS Twitter)")
+    parser.add_argument("--formats", nargs="+", default=["json"], choices=list(APIProcessor.TASKS.keys()),
+                        help="要对比的返回格式 (默认 json)")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET, help="测试数据快照文件")
+    parser.add_argument("--refresh-dataset", action="store_true", help="重新采集并覆盖数据快照")
+    parser.add_argument("--trials", type=int, default=3, help="每个批次重复轮数 (默认3)")
+    parser.add_argument("--warmup", type=int, default=1, help="每个模型/格式的预热请求数，不计入统计 (默认1)")
+    parser.add_argument("--concurrency", type=int, default=4, help="并发请求数 (默认4)")
+    parser.add_argument("--batch-size", type=int, default=0, help="每批条数，0 表示每个来源一批 (默认0)")
     parser.add_argument("--output", default="tests/results/benchmark_results.json", help="输出文件")
     args = parser.parse_args()
 
@@ -329,38 +487,35 @@ def main():
         print("❌ 没有有效的模型配置")
         return
 
-    # 采集真实数据（按来源分组）
+    # 读取或采集测试数据（按来源分组）
     print("🚀 模型对比测试\n")
-    data_by_source = collect_real_data(limit_per_source=args.limit)
+    data_by_source = load_dataset(args.dataset, args.limit, args.refresh_dataset)
+    if args.sources:
+        data_by_source = {k: v for k, v in data_by_source.items() if k in args.sources}
 
     if not data_by_source:
-        print("❌ 未能采集到测试数据")
+        print("❌ 未能获取测试数据")
         return
 
     total_count = sum(len(titles) for titles in data_by_source.values())
     print(f"\n📊 测试配置:")
     print(f"   模型: {', '.join(model_keys)}")
+    print(f"   格式: {', '.join(args.formats)}")
     print(f"   数据源: {', '.join(data_by_source.keys())}")
-    print(f"   总数据: {total_count} 条")
+    print(f"   总数据: {total_count} 条 × {args.trials} 轮 (预热 {args.warmup}, 并发 {args.concurrency})")
     print()
 
-    # 运行测试（按来源分批测试）
-    all_results = {k: [] for k in model_keys}
-
-    for source, titles in data_by_source.items():
-        print(f"\n🔄 测试 [{source}] 数据 ({len(titles)} 条)...")
-        for model_key in model_keys:
-            config = MODELS[model_key]
-            print(f"   📡 {config['name']}...")
-            results = test_model(model_key, config, titles, source)
-            all_results[model_key].extend(results)
-
-            success = sum(1 for r in results if r.success)
-            print(f"      完成: {success}/{len(results)} 成功")
+    models = with_token_settings(MODELS, Config(CONFIG_PATH).ai)
+    run = run_benchmark(model_keys, args.formats, data_by_source, args.trials, args.warmup,
+                        args.concurrency, args.batch_size, models)
 
     # 输出结果
-    print_comparison(all_results)
-    save_results(all_results, args.output)
+    print_comparison(run)
+    save_results(run, args.output, {
+        "models": model_keys, "formats": args.formats, "sources": list(data_by_source),
+        "dataset": args.dataset, "trials": args.trials, "warmup": args.warmup,
+        "concurrency": args.concurrency, "batch_size": args.batch_size,
+    })
 
 
 if __name__ == "__main__":
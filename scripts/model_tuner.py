@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+模型批处理参数自动调优 - 基于 model_benchmark.py 的测试框架
+
+对每个模型在固定数据快照上遍历 batch_size × max_title_chars × concurrency，
+按 APIProcessor 相同的动态分批方式发送请求，测量吞吐（条/秒，墙钟）、延迟和
+完整率（返回结果覆盖的序号比例），从 Pareto 最优组合中选出满足完整率要求且
+吞吐最高的一组，写入 config/model_profiles.yaml，APIProcessor 按模型名自动加载。
+
+使用方法:
+    # 调优所有模型（快照不存在时先采集，每个来源 20 条）
+    python scripts/model_tuner.py
+
+    # 只调优 qwen，自定义搜索范围
+    python scripts/model_tuner.py --models qwen --batch-sizes 5 10 15 --char-budgets 800 1500 --concurrency 1 4
+
+    # 只输出结果，不写入配置档
+    python scripts/model_tuner.py --dry-run
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import product
+from typing import Any, Dict, List
+
+# 添加项目根目录到路径
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from model_benchmark import CONFIG_PATH, MODELS, call_model, load_dataset, percentile, with_token_settings
+from src.config import Config
+from src.collectors.base import HotspotItem
+from src.processors.api_mode import APIProcessor
+from src.processors.profiles import DEFAULT_PATH, save_profile
+
+DEFAULT_DATASET = os.path.join(PROJECT_ROOT, "tests", "fixtures", "model_tuner_dataset.json")
+
+
+def make_batches(titles: List[str], batch_size: int, max_title_chars: int, state_dir: str) -> List[List[str]]:
+    """按 APIProcessor 的动态批次算法切分标题"""
+    processor = APIProcessor({"batch_size": batch_size, "max_title_chars": max_title_chars,
+                              "model_profiles": ""}, state_dir=state_dir)
+    items = [HotspotItem(title=title, url="", source="", category="") for title in titles]
+    batches = []
+    i = 0
+    while i < len(items):
+        size = processor._calculate_batch_size(items, i)
+        batches.append(titles[i:i + size])
+        i += size
+    return batches
+
+
+def evaluate(model_key: str, config: Dict[str, Any], fmt: str, batches: List[List[str]],
+             concurrency: int, trials: int) -> Dict[str, Any]:
+    """以指定并发发送全部批次 trials 轮，返回吞吐、延迟和完整率"""
+    calls = []
+    wall = 0.0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for trial in range(trials):
+            start = time.perf_counter()
+            calls.extend(call for call, _ in pool.map(
+                lambda batch: call_model(model_key, config, batch, "tune", fmt, trial), batches))
+            wall += time.perf_counter() - start
+
+    items = sum(call.items for call in calls)
+    ok_calls = [call for call in calls if call.success]
+    latencies = [call.latency_ms for call in ok_calls]
+    return {
+        "items_per_s": items / wall if wall else 0.0,
+        "p50_latency_ms": percentile(latencies, 50),
+        "p95_latency_ms": percentile(latencies, 95),
+        "completeness": sum(call.parsed for call in calls) / items if items else 0.0,
+        "success_rate": len(ok_calls) / len(calls) if calls else 0.0,
+        "tokens_per_s": sum(call.completion_tokens for call in ok_calls) / wall if wall else 0.0,
+        "calls": len(calls),
+    }
+
+
+def dominates(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    """a 在吞吐、p95 延迟、完整率上都不差于 b，且至少一项更好"""
+    not_worse = (a["items_per_s"] >= b["items_per_s"] and a["p95_latency_ms"] <= b["p95_latency_ms"]
+                 and a["completeness"] >= b["completeness"])
+    better = (a["items_per_s"] > b["items_per_s"] or a["p95_latency_ms"] < b["p95_latency_ms"]
+              or a["completeness"] > b["completeness"])
+    return not_worse and better
+
+
+def pareto_front(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [c for c in candidates if not any(dominates(o["metrics"], c["metrics"]) for o in candidates)]
+
+
+def choose(front: List[Dict[str, Any]], min_completeness: float) -> Dict[str, Any]:
+    """完整率达标的组合中吞吐最高者（同吞吐取 p95 更低）；都不达标时取完整率最高者"""
+    qualified = [c for c in front if c["metrics"]["completeness"] >= min_completeness]
+    if qualified:
+        return max(qualified, key=lambda c: (c["metrics"]["items_per_s"], -c["metrics"]["p95_latency_ms"]))
+    return max(front, key=lambda c: (c["metrics"]["completeness"], c["metrics"]["items_per_s"]))
+
+
+def tune_model(model_key: str, config: Dict[str, Any], titles: List[str], args, state_dir: str) -> Dict[str, Any]:
+    """遍历参数组合，返回 {candidates, front, best}"""
+    if not os.environ.get(config["api_key_env"]):
+        print(f"  [跳过] 未设置环境变量 {config['api_key_env']}")
+        return {}
+
+    for _ in range(args.warmup):
+        call_model(model_key, config, titles[:min(args.batch_sizes)], "warmup", args.format)
+
+    candidates = []
+    for batch_size, chars, concurrency in product(args.batch_sizes, args.char_budgets, args.concurrency):
+        batches = make_batches(titles, batch_size, chars, state_dir)
+        metrics = evaluate(model_key, config, args.format, batches, concurrency, args.trials)
+        settings = {"batch_size": batch_size, "max_title_chars": chars, "concurrency": concurrency}
+        candidates.append({"settings": settings, "metrics": metrics})
+        print(f"  batch={batch_size:<3} chars={chars:<5} conc={concurrency:<2} "
+              f"{metrics['items_per_s']:>7.2f} 条/s  p95 {metrics['p95_latency_ms']:>6.0f}ms  "
+              f"完整率 {metrics['completeness']:.0%}")
+
+    front = pareto_front(candidates)
+    return {"candidates": candidates, "front": front, "best": choose(front, args.min_completeness)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模型批处理参数自动调优")
+    parser.add_argument("--models", nargs="+", help="要调优的模型 (默认全部)")
+    parser.add_argument("--format", default="json", choices=list(APIProcessor.TASKS.keys()), help="返回格式")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET, help="测试数据快照文件")
+    parser.add_argument("--limit", type=int, default=20, help="采集快照时每个数据源的条数 (默认20)")
+    parser.add_argument("--refresh-dataset", action="store_true", help="重新采集并覆盖数据快照")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[3, 5, 8, 10], help="batch_size 取值")
+    parser.add_argument("--char-budgets", type=int, nargs="+", default=[500, 1000, 2000],
+                        help="max_title_chars 取值")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4], help="并发请求数取值")
+    parser.add_argument("--trials", type=int, default=1, help="每个组合重复轮数 (默认1)")
+    parser.add_argument("--warmup", type=int, default=1, help="每个模型先发送的预热请求数 (默认1)")
+    parser.add_argument("--min-completeness", type=float, default=0.95, help="可选组合的最低完整率 (默认0.95)")
+    parser.add_argument("--profiles", default=DEFAULT_PATH, help="模型配置档文件")
+    parser.add_argument("--output", default="tests/results/tuning_results.json", help="全部组合结果输出文件")
+    parser.add_argument("--dry-run", action="store_true", help="不写入模型配置档")
+    args = parser.parse_args()
+
+    model_keys = [k for k in (args.models or MODELS) if k in MODELS]
+    if not model_keys:
+        print("❌ 没有有效的模型配置")
+        return
+
+    data_by_source = load_dataset(args.dataset, args.limit, args.refresh_dataset)
+    titles = [title for source_titles in data_by_source.values() for title in source_titles]
+    if not titles:
+        print("❌ 未能获取测试数据")
+        return
+    combos = len(args.batch_sizes) * len(args.char_budgets) * len(args.concurrency)
+    print(f"\n🎛️  调优: {', '.join(model_keys)} | {len(titles)} 条 | {combos} 个组合 × {args.trials} 轮\n")
+
+    report = {"timestamp": datetime.now().isoformat(), "dataset": args.dataset, "format": args.format,
+              "items": len(titles), "models": {}}
+    models = with_token_settings(MODELS, Config(CONFIG_PATH).ai)  # 与 APIProcessor 相同的 max_tokens 上限
+    with tempfile.TemporaryDirectory() as state_dir:
+        for model_key in model_keys:
+            config = models[model_key]
+            print(f"📡 {config['name']}")
+            result = tune_model(model_key, config, titles, args, state_dir)
+            if not result:
+                continue
+            report["models"][model_key] = result
+
+            best = result["best"]
+            print(f"\n  Pareto 最优 {len(result['front'])} 组:")
+            for candidate in result["front"]:
+                mark = "→" if candidate is best else " "
+                s, m = candidate["settings"], candidate["metrics"]
+                print(f"  {mark} batch={s['batch_size']:<3} chars={s['max_title_chars']:<5} "
+                      f"conc={s['concurrency']:<2} {m['items_per_s']:>7.2f} 条/s  "
+                      f"p95 {m['p95_latency_ms']:>6.0f}ms  完整率 {m['completeness']:.0%}")
+            if not args.dry_run:
+                save_profile(config["model"], best["settings"],
+                             {k: round(v, 3) for k, v in best["metrics"].items()}, args.profiles)
+                print(f"  💾 已写入配置档: {args.profiles} [{config['model']}]")
+            print()
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"💾 全部组合结果已保存到: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
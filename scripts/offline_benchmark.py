@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+离线基准测试 - 使用 tests/fixtures/ 中录制的数据测量各阶段耗时，无需网络和 API Key
+
+覆盖: 采集器解析 (RSS/Twitter/YouTube/Reddit)、_parse_date、APIProcessor 的
+_calculate_batch_size / _parse_results、PromptManager.get_prompt、
+HTMLGenerator.generate (100 / 1万 / 10万条)
+
+使用方法:
+    # 运行并与基线对比（基线不存在时只输出结果）
+    python scripts/offline_benchmark.py
+
+    # 把本次结果保存为基线
+    python scripts/offline_benchmark.py --save-baseline
+
+    # 只运行名称包含指定字符串的用例，调整生成规模
+    python scripts/offline_benchmark.py --only generate --sizes 100 10000
+
+结果写入 tests/results/offline_benchmark.json；与基线相比中位数变慢超过
+--threshold (默认 20%) 的用例标记为回退，此时退出码为 1
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# 添加项目根目录到路径
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from src.config import Config
+from src.collectors.base import HotspotItem
+from src.collectors.rss import RSSCollector
+from src.collectors.twitter import TwitterCollector
+from src.collectors.youtube import YouTubeCollector
+from src.collectors.reddit import RedditCollector
+from src.processors.api_mode import APIProcessor
+from src.prompts import PromptManager
+from src.generators.html import HTMLGenerator
+
+FIXTURES = Path(PROJECT_ROOT) / "tests" / "fixtures"
+RESULTS_DIR = Path(PROJECT_ROOT) / "tests" / "results"
+
+# 请求 URL 片段 -> 录制的响应文件
+ROUTES = {
+    "fixtures.local/": None,  # 直接映射到 tests/fixtures/<路径>
+    "api.twitterapi.io": "twitter/advanced_search.json",
+    "youtube/v3/search": "youtube/search.json",
+    "youtube/v3/videos": "youtube/videos.json",
+    "reddit.com": "reddit/hot.json",
+}
+
+
+class FixtureResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.status_code = 200
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        pass
+
+
+class FixtureSession:
+    """按 URL 返回录制响应的会话，替代采集器的 requests.Session"""
+
+    def __init__(self):
+        self._cache: Dict[str, bytes] = {}
+
+    def get(self, url: str, **kwargs) -> FixtureResponse:
+        for fragment, rel_path in ROUTES.items():
+            if fragment in url:
+                rel_path = rel_path or url.split(fragment, 1)[1]
+                if rel_path not in self._cache:
+                    self._cache[rel_path] = (FIXTURES / rel_path).read_bytes()
+                return FixtureResponse(self._cache[rel_path])
+        raise ValueError(f"没有录制的响应: {url}")
+
+
+def offline(collector):
+    collector._session = FixtureSession()
+    return collector
+
+
+# ---------------------------------------------------------------- 用例
+
+def build_cases(config: Config, sizes: List[int], work_dir: Path) -> Dict[str, Callable[[], int]]:
+    """返回 {用例名: 函数}，函数返回处理的条目数"""
+    os.environ.setdefault("TWITTER_API_KEY", "offline")
+    os.environ.setdefault("YOUTUBE_API_KEY", "offline")
+    cases: Dict[str, Callable[[], int]] = {}
+
+    rss_feeds = [{"name": path.stem, "url": f"https://fixtures.local/rss/{path.name}", "category": "RSS"}
+                 for path in sorted((FIXTURES / "rss").glob("*.xml"))] * 10
+    for fast in (True, False):
+        collector = offline(RSSCollector({"enabled": True, "feeds": rss_feeds, "max_per_feed": 20,
+                                          "parse_workers": 0, "fast_parse": fast}))
+        cases[f"collect:rss{'' if fast else ':feedparser'}"] = counted(collector.collect)
+    cases["collect:twitter"] = counted(offline(TwitterCollector(
+        {"enabled": True, "queries": ["AI"] * 10, "max_results": 100, "delay": 0})).collect)
+    cases["collect:youtube"] = counted(offline(YouTubeCollector(
+        {"enabled": True, "queries": ["AI"] * 10, "max_results": 50, "delay": 0})).collect)
+    cases["collect:reddit"] = counted(offline(RedditCollector(
+        {"enabled": True, "subreddits": ["artificial"] * 10, "min_score": 0, "hours": 24 * 365 * 100})).collect)
+
+    dates = ["Sun, 18 Oct 2026 12:00:00 +0000", "2026-10-18T12:00:00Z", "Sun Oct 18 12:00:00 +0000 2026",
+             "2026-10-18 12:00", "", None] * 500
+    date_parser = RSSCollector({})
+    cases["parse_date"] = lambda: len([date_parser._parse_date(value) for value in dates])
+
+    items = synthetic_items(10000)
+    for fmt, fixture in (("json", "translate_json.txt"), ("compact", "translate_compact.txt")):
+        processor = APIProcessor(dict(config.ai, response_format=fmt), state_dir=work_dir)
+        response = (FIXTURES / "llm" / fixture).read_text(encoding="utf-8")
+        batch = items[:10]
+        cases[f"api:parse_results:{fmt}"] = (
+            lambda p=processor, r=response: sum(p._parse_results(batch, r) for _ in range(1000)) * 10)
+    processor = APIProcessor(config.ai, state_dir=work_dir)
+    cases["api:calculate_batch_size"] = lambda: batch_all(processor, items)
+
+    prompt_manager = PromptManager()
+    content = prompt_manager.format_content_list([item.title for item in items[:20]])
+    model = config.ai.get("model", "openai/Qwen/Qwen3-8B")
+    cases["prompt:get_prompt"] = lambda: len([
+        prompt_manager.get_prompt(task_name="translate_summarize", model=model, variables={"content": content})
+        for _ in range(1000)])
+
+    output_config = dict(config.output, archive={"enabled": False})
+    for size in sizes:
+        generator = HTMLGenerator(output_config, state_dir=work_dir / f"state-{size}")
+        generator.output_dir = work_dir / f"docs-{size}"
+        size_items = synthetic_items(size)
+        cases[f"generate:{size}"] = (
+            lambda g=generator, s=size_items: (g.generate(s, keywords=[("ai", 1.0)], force=True), len(s))[1])
+    return cases
+
+
+def counted(collect: Callable[[], list]) -> Callable[[], int]:
+    return lambda: len(collect())
+
+
+def batch_all(processor: APIProcessor, items: List[HotspotItem]) -> int:
+    i = 0
+    while i < len(items):
+        i += processor._calculate_batch_size(items, i)
+    return len(items)
+
+
+def synthetic_items(count: int) -> List[HotspotItem]:
+    """用录制数据中的标题和翻译构造指定数量的已处理条目"""
+    titles = [tweet["text"] for tweet in json.loads((FIXTURES / "twitter" / "advanced_search.json").read_text())["tweets"]]
+    translations = [line.split("\t") for line in
+                    (FIXTURES / "llm" / "translate_compact.txt").read_text(encoding="utf-8").splitlines()]
+    categories = ["科技热点", "AI新闻", "YouTube频道", "Twitter热点", "Reddit热点"]
+    base = datetime(2026, 10, 18, 12)
+    items = []
+    for i in range(count):
+        _, translated, summary = translations[i % len(translations)]
+        items.append(HotspotItem(
+            title=f"{titles[i % len(titles)]} #{i}",
+            url=f"https://example.com/item/{i}",
+            source=f"source{i % 7}",
+            category=categories[i % len(categories)],
+            published_at=base - timedelta(minutes=7 * i),
+            summary=summary,
+            translated_title=translated,
+            extra={"hotness": round(1 - i / max(count, 1), 4)},
+        ))
+    return items
+
+
+# ---------------------------------------------------------------- 运行与对比
+
+def measure(func: Callable[[], int], repeat: int) -> Dict[str, float]:
+    func()  # 预热
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = func()
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {"min": min(timings), "median": median, "items": count,
+            "items_per_s": count / median if median > 0 else 0.0, "repeat": repeat}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """打印与基线的对比，返回回退的用例名"""
+    regressions = []
+    print(f"\n{'用例':<30} {'基线(ms)':>10} {'本次(ms)':>10} {'变化':>8}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<30} {'-':>10} {result['median'] * 1000:>10.2f} {'新增':>8}")
+            continue
+        ratio = result["median"] / base["median"] if base["median"] > 0 else 1.0
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  <- 回退"
+            regressions.append(name)
+        print(f"{name:<30} {base['median'] * 1000:>10.2f} {result['median'] * 1000:>10.2f} "
+              f"{(ratio - 1) * 100:>+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000, 100000],
+                        help="HTMLGenerator.generate 的条目数 (默认 100 10000 100000)")
+    parser.add_argument("--only", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--repeat", type=int, default=5, help="每个用例重复次数 (默认5，万条以上自动减少)")
+    parser.add_argument("--output", default=str(RESULTS_DIR / "offline_benchmark.json"), help="结果文件")
+    parser.add_argument("--baseline", default=str(RESULTS_DIR / "offline_baseline.json"), help="基线文件")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--threshold", type=float, default=0.2, help="判定回退的变慢比例 (默认0.2)")
+    args = parser.parse_args()
+
+    config = Config()
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = build_cases(config, args.sizes, Path(tmp))
+        print(f"{'用例':<30} {'中位数(ms)':>12} {'最小(ms)':>10} {'条/秒':>12}")
+        for name, func in cases.items():
+            if args.only and args.only not in name:
+                continue
+            repeat = args.repeat
+            if name.startswith("generate:"):
+                size = int(name.split(":")[1])
+                repeat = 1 if size >= 100000 else (3 if size >= 10000 else repeat)
+            result = measure(func, repeat)
+            results[name] = result
+            print(f"{name:<30} {result['median'] * 1000:>12.2f} {result['min'] * 1000:>10.2f} "
+                  f"{result['items_per_s']:>12.0f}")
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "cases": results,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n结果已保存: {output}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"基线已保存: {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print("未找到基线，使用 --save-baseline 保存")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline.get("cases", {}), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} 个用例回退: {', '.join(regressions)}")
+        return 1
+    print("\n没有回退")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
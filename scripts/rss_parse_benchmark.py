@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+RSS 解析基准测试 - 对比单进程解析、进程池并行解析和增量解析快速路径的耗时
+
+使用方法:
+    # 使用合成的订阅源 (默认 300 个，每个 100 条带 HTML 正文)
+    python scripts/rss_parse_benchmark.py
+
+    # 使用录制的订阅源文件（目录下的 *.xml）
+    python scripts/rss_parse_benchmark.py --feeds-dir tests/fixtures/feeds
+
+    # 先下载配置中的订阅源保存到目录，供之后离线测试
+    python scripts/rss_parse_benchmark.py --record tests/fixtures/feeds
+
+    # 指定进程数（单进程/进程池行使用 feedparser，另有一行为增量解析快速路径）
+    python scripts/rss_parse_benchmark.py --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+from xml.sax.saxutils import escape
+
+# 添加项目根目录到路径
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.collectors.feed_parse import parse_feed
+
+
+def synthetic_feed(index: int, entries: int) -> bytes:
+    """生成一个带 HTML 正文的 RSS 2.0 订阅源"""
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    body = escape("<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20 + "</p>") * 3
+    items = []
+    for i in range(entries):
+        items.append(
+            f"<item><title>Feed {index} entry {i}: model release and benchmark results</title>"
+            f"<link>https://example.com/{index}/{i}</link>"
+            f"<guid>https://example.com/{index}/{i}</guid>"
+            f"<pubDate>{format_datetime(now - timedelta(hours=i))}</pubDate>"
+            f"<author>author{i}@example.com</author>"
+            f"<category>AI</category><category>Tech</category>"
+            f"<description>{body}</description></item>"
+        )
+    return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>Feed {index}</title><link>https://example.com/{index}</link>"
+            f"<description>synthetic</description>{''.join(items)}</channel></rss>").encode("utf-8")
+
+
+def load_feeds(args) -> List[bytes]:
+    if args.feeds_dir:
+        paths = sorted(Path(args.feeds_dir).glob("*.xml"))
+        if not paths:
+            sys.exit(f"目录中没有 *.xml 文件: {args.feeds_dir}")
+        return [path.read_bytes() for path in paths]
+    return [synthetic_feed(i, args.entries) for i in range(args.feeds)]
+
+
+def record_feeds(target: Path):
+    """下载配置中的订阅源保存为 <序号>.xml"""
+    from src.config import Config
+    from src.collectors.rss import RSSCollector
+
+    collector = RSSCollector(Config().get_source_config("rss"))
+    target.mkdir(parents=True, exist_ok=True)
+    fetched = collector._fetch_all(collector.config.get('feeds', []))
+    for i, (feed_config, content) in enumerate(fetched):
+        (target / f"{i:03d}.xml").write_bytes(content)
+        print(f"  {feed_config.get('name')}: {len(content) / 1024:.1f}KB")
+    print(f"已保存 {len(fetched)} 个订阅源到 {target}")
+
+
+def run_serial(feeds: List[bytes], max_entries: int, fast: bool = False) -> int:
+    return sum(len(parse_feed(content, max_entries, fast)) for content in feeds)
+
+
+def run_pool(feeds: List[bytes], max_entries: int, workers: int, fast: bool = False) -> int:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(parse_feed, content, max_entries, fast) for content in feeds]
+        return sum(len(future.result()) for future in futures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS 解析基准测试")
+    parser.add_argument("--feeds-dir", help="录制的订阅源目录 (*.xml)")
+    parser.add_argument("--record", help="下载配置中的订阅源保存到该目录后退出")
+    parser.add_argument("--feeds", type=int, default=300, help="合成订阅源数量 (默认300)")
+    parser.add_argument("--entries", type=int, default=100, help="每个合成订阅源的条目数 (默认100)")
+    parser.add_argument("--max-per-feed", type=int, default=20, help="每个源保留条数 (默认20)")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}), help="进程池大小")
+    parser.add_argument("--repeat", type=int, default=3, help="每种配置重复次数，取最小值 (默认3)")
+    args = parser.parse_args()
+
+    if args.record:
+        record_feeds(Path(args.record))
+        return
+
+    feeds = load_feeds(args)
+    total_bytes = sum(len(content) for content in feeds)
+    print(f"订阅源: {len(feeds)} 个, 共 {total_bytes / 1024 / 1024:.1f}MB, CPU: {os.cpu_count()} 核")
+
+    def best_of(func):
+        best, entries = float("inf"), 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            entries = func()
+            best = min(best, time.perf_counter() - start)
+        return best, entries
+
+    baseline, entries = best_of(lambda: run_serial(feeds, args.max_per_feed))
+    print(f"\n{'方式':<16} {'耗时(s)':>10} {'订阅源/s':>10} {'加速比':>8}")
+    print(f"{'单进程':<16} {baseline:>10.2f} {len(feeds) / baseline:>10.1f} {1.0:>8.2f}")
+    for workers in args.workers:
+        elapsed, pool_entries = best_of(lambda: run_pool(feeds, args.max_per_feed, workers))
+        assert pool_entries == entries
+        print(f"{f'进程池 x{workers}':<16} {elapsed:>10.2f} {len(feeds) / elapsed:>10.1f} {baseline / elapsed:>8.2f}")
+    # 增量解析快速路径（合成订阅源为合法 XML，不会回退）
+    elapsed, fast_entries = best_of(lambda: run_serial(feeds, args.max_per_feed, fast=True))
+    assert fast_entries == entries
+    print(f"{'快速路径单进程':<16} {elapsed:>10.2f} {len(feeds) / elapsed:>10.1f} {baseline / elapsed:>8.2f}")
+    print(f"\n共解析 {entries} 条")
+
+
+if __name__ == "__main__":
+    main()
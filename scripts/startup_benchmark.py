@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+启动耗时基准测试 - 测量从进程启动到流水线组件就绪（采集开始前）的耗时
+
+每个场景在新的子进程中运行，分别测量:
+    - 按需导入（注册表）: 只导入配置启用的数据源和实际用到的处理器
+    - 全量导入（旧行为）: 启动时导入全部采集器和处理器
+
+使用方法:
+    python scripts/startup_benchmark.py
+    python scripts/startup_benchmark.py --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import yaml
+
+# 添加项目根目录到路径
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# 旧版 main.py 在模块加载时导入的组件
+EAGER_IMPORTS = [
+    "src.collectors.rss", "src.collectors.twitter", "src.collectors.youtube", "src.collectors.reddit",
+    "src.processors.api_mode", "src.processors.cli_mode",
+]
+
+# 子进程: 导入并构建流水线，输出耗时和是否导入了 litellm
+CHILD_CODE = """
+import sys, time, json
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+for name in {eager!r}:
+    __import__(name)
+from src.config import Config
+from src.pipeline import Pipeline
+config = Config({config!r})
+pipeline = Pipeline(config, {mode!r})
+if config.ai.get('enabled', True):
+    pipeline.processor
+print(json.dumps({{"seconds": time.perf_counter() - start, "litellm": "litellm" in sys.modules,
+                   "modules": len(sys.modules)}}))
+"""
+
+# 场景名 -> (修改配置的函数, 运行模式)
+SCENARIOS = {
+    "全部启用 (api)": (lambda c: None, "api"),
+    "仅 RSS + api": (lambda c: _only_rss(c), "api"),
+    "仅 RSS + 关闭 AI": (lambda c: (_only_rss(c), c["ai"].update(enabled=False)), "api"),
+    "全部启用 (cli)": (lambda c: None, "cli"),
+}
+
+
+def _only_rss(config):
+    for name, source in config["sources"].items():
+        source["enabled"] = name == "rss"
+
+
+def run_child(config_path: str, mode: str, eager: bool) -> dict:
+    code = CHILD_CODE.format(root=PROJECT_ROOT, eager=EAGER_IMPORTS if eager else [],
+                             config=config_path, mode=mode)
+    env = dict(os.environ, LITELLM_LOCAL_MODEL_COST_MAP="True")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准测试")
+    parser.add_argument("--repeat", type=int, default=5, help="每个场景运行次数，取中位数 (默认5)")
+    args = parser.parse_args()
+
+    base = yaml.safe_load(Path(PROJECT_ROOT, "config", "config.yaml").read_text(encoding="utf-8"))
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'场景':<20} {'按需导入(s)':>12} {'全量导入(s)':>12} {'加速比':>8}  litellm")
+        for name, (modify, mode) in SCENARIOS.items():
+            config = json.loads(json.dumps(base))
+            config["state_dir"] = tmp
+            modify(config)
+            config_path = str(Path(tmp) / "config.yaml")
+            Path(config_path).write_text(yaml.safe_dump(config, allow_unicode=True), encoding="utf-8")
+
+            lazy = [run_child(config_path, mode, eager=False) for _ in range(args.repeat)]
+            eager = [run_child(config_path, mode, eager=True) for _ in range(args.repeat)]
+            lazy_s = statistics.median(r["seconds"] for r in lazy)
+            eager_s = statistics.median(r["seconds"] for r in eager)
+            print(f"{name:<20} {lazy_s:>12.3f} {eager_s:>12.3f} {eager_s / lazy_s:>8.1f}x  "
+                  f"{'导入' if lazy[0]['litellm'] else '未导入'}")
+
+
+if __name__ == "__main__":
+    main()
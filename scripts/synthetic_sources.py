@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+合成数据源 - 本地模拟 RSS/Atom、Twitter、YouTube、Reddit 接口，用于压力测试
+
+内容由 (种子, 请求路径) 确定，同一请求总是返回相同数据；条目数、正文大小、
+响应延迟和失败率均可配置。
+
+接口:
+    /rss/<n>.xml                          RSS 2.0 订阅源
+    /atom/<n>.xml                         Atom 订阅源
+    /twitter/tweet/advanced_search?query= twitterapi.io 格式
+    /youtube/v3/search?q=&maxResults=     YouTube Data API 格式
+    /youtube/v3/videos?id=a,b             视频统计
+    /r/<subreddit>/hot.json               Reddit 格式
+
+使用方法:
+    # 单独启动（供手动运行 main.py 时使用），Ctrl+C 停止
+    python scripts/synthetic_sources.py --port 8700 --latency-ms 50 --failure-rate 0.02
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+COMPANIES = ["OpenAI", "Google", "Anthropic", "Meta", "Microsoft", "NVIDIA", "Apple", "Mistral",
+             "DeepSeek", "Alibaba", "Baidu", "Tencent", "Amazon", "xAI", "Hugging Face", "Stability"]
+ACTIONS = ["releases", "announces", "open-sources", "benchmarks", "delays", "acquires", "updates",
+           "previews", "launches", "cuts prices for", "partners on", "explains"]
+PRODUCTS = ["reasoning model", "coding agent", "video generator", "GPU cluster", "speech model",
+            "robotics stack", "search assistant", "inference chip", "vision model", "safety framework",
+            "embedding API", "on-device LLM"]
+TOPICS = ["with 1M context", "for enterprises", "under new license", "after safety review",
+          "beating GPT-4 on math", "for developers", "in 40 languages", "at half the cost",
+          "amid regulation debate", "with open weights", "for edge devices", "in public beta"]
+WORDS = ("model training inference latency throughput dataset benchmark agent tool memory context "
+         "token retrieval evaluation alignment reasoning scaling distillation quantization").split()
+
+
+class SyntheticSources:
+    """按请求路径确定性生成各数据源的响应"""
+
+    def __init__(self, entries_per_feed: int = 100, body_bytes: int = 1500, latency_ms: float = 0,
+                 jitter_ms: float = 0, failure_rate: float = 0.0, seed: int = 42):
+        self.entries_per_feed = entries_per_feed
+        self.body_bytes = body_bytes
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+
+    def _rng_for(self, key: str) -> random.Random:
+        return random.Random(f"{self.seed}:{key}")
+
+    def _title(self, rng: random.Random) -> str:
+        return f"{rng.choice(COMPANIES)} {rng.choice(ACTIONS)} {rng.choice(PRODUCTS)} {rng.choice(TOPICS)}"
+
+    def _body(self, rng: random.Random) -> str:
+        words = []
+        size = 0
+        while size < self.body_bytes:
+            word = rng.choice(WORDS)
+            words.append(word)
+            size += len(word) + 1
+        return " ".join(words)
+
+    # ---------------------------------------------------------------- 订阅源
+
+    def feed(self, index: int, atom: bool = False) -> bytes:
+        rng = self._rng_for(f"feed:{index}:{atom}")
+        entries = []
+        for i in range(self.entries_per_feed):
+            title = escape(self._title(rng))
+            link = f"https://feed{index}.example.com/{i}"
+            published = self.now - timedelta(minutes=i * 13 + rng.randint(0, 12))
+            body = escape(f"<p>{self._body(rng)}</p>")
+            if atom:
+                entries.append(f"<entry><title>{title}</title><link href=\"{link}\"/><id>{link}</id>"
+                               f"<updated>{published.isoformat()}</updated>"
+                               f"<author><name>author{i % 7}</name></author><category term=\"AI\"/>"
+                               f"<content type=\"html\">{body}</content></entry>")
+            else:
+                entries.append(f"<item><title>{title}</title><link>{link}</link><guid>{link}</guid>"
+                               f"<pubDate>{format_datetime(published)}</pubDate>"
+                               f"<author>author{i % 7}@example.com</author><category>AI</category>"
+                               f"<description>{body}</description></item>")
+        if atom:
+            return ('<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+                    f"<title>Synthetic {index}</title><id>urn:feed:{index}</id>"
+                    f"<updated>{self.now.isoformat()}</updated>{''.join(entries)}</feed>").encode("utf-8")
+        return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+                f"<title>Synthetic {index}</title><link>https://feed{index}.example.com</link>"
+                f"<description>synthetic</description>{''.join(entries)}</channel></rss>").encode("utf-8")
+
+    # ---------------------------------------------------------------- JSON 接口
+
+    def tweets(self, query: str, count: int = 100) -> Dict[str, Any]:
+        rng = self._rng_for(f"twitter:{query}")
+        tweets = []
+        for i in range(count):
+            created = self.now - timedelta(minutes=rng.randint(0, 24 * 60))
+            tweets.append({
+                "id": f"{query}-{i}",
+                "text": f"{self._title(rng)} {' '.join(rng.sample(WORDS, 5))}",
+                "url": f"https://x.com/user{i % 50}/status/{rng.getrandbits(60)}",
+                "createdAt": created.strftime("%a %b %d %H:%M:%S +0000 %Y"),
+                "likeCount": rng.randint(0, 50000),
+                "retweetCount": rng.randint(0, 5000),
+                "viewCount": rng.randint(100, 5000000),
+            })
+        return {"tweets": tweets, "has_next_page": False}
+
+    def youtube_search(self, query: str, count: int = 50) -> Dict[str, Any]:
+        rng = self._rng_for(f"youtube:{query}")
+        items = []
+        for i in range(count):
+            published = self.now - timedelta(minutes=rng.randint(0, 24 * 60))
+            items.append({
+                "id": {"kind": "youtube#video", "videoId": f"{query}-{i}"},
+                "snippet": {"title": self._title(rng), "channelTitle": f"channel{i % 20}",
+                            "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ")},
+            })
+        return {"items": items}
+
+    def youtube_videos(self, ids: List[str]) -> Dict[str, Any]:
+        items = []
+        for video_id in ids:
+            rng = self._rng_for(f"video:{video_id}")
+            items.append({"id": video_id, "statistics": {"viewCount": str(rng.randint(100, 9000000)),
+                                                         "likeCount": str(rng.randint(0, 200000))}})
+        return {"items": items}
+
+    def reddit(self, subreddit: str, count: int = 100) -> Dict[str, Any]:
+        rng = self._rng_for(f"reddit:{subreddit}")
+        children = []
+        for i in range(count):
+            created = self.now - timedelta(minutes=rng.randint(0, 20 * 60))
+            children.append({"kind": "t3", "data": {
+                "title": self._title(rng),
+                "permalink": f"/r/{subreddit}/comments/{i:06x}/post_{i}/",
+                "created_utc": created.timestamp(),
+                "ups": rng.randint(0, 20000),
+                "num_comments": rng.randint(0, 3000),
+                "author": f"redditor{i % 40}",
+            }})
+        return {"kind": "Listing", "data": {"children": children}}
+
+    # ---------------------------------------------------------------- 路由
+
+    def respond(self, path: str) -> Tuple[int, str, bytes]:
+        """返回 (状态码, Content-Type, 内容)，按配置注入延迟和失败"""
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            fail = self._rng.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        if delay:
+            time.sleep(delay)
+        if fail:
+            return 503, "text/plain", b"synthetic failure"
+
+        parsed = urlparse(path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        route = parsed.path.strip("/").split("/")
+        try:
+            if route[0] in ("rss", "atom") and len(route) == 2:
+                index = int(route[1].split(".")[0])
+                return 200, "application/xml", self.feed(index, atom=route[0] == "atom")
+            if route[:3] == ["twitter", "tweet", "advanced_search"]:
+                return self._json(self.tweets(params.get("query", "AI")))
+            if route[:3] == ["youtube", "v3", "search"]:
+                return self._json(self.youtube_search(params.get("q", "AI"), int(params.get("maxResults", 50))))
+            if route[:3] == ["youtube", "v3", "videos"]:
+                return self._json(self.youtube_videos(params.get("id", "").split(",")))
+            if route[0] == "r" and len(route) == 3 and route[2] == "hot.json":
+                return self._json(self.reddit(route[1]))
+        except ValueError:
+            pass
+        return 404, "text/plain", b"not found"
+
+    @staticmethod
+    def _json(data: Dict[str, Any]) -> Tuple[int, str, bytes]:
+        return 200, "application/json", json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def serve(sources: SyntheticSources, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """在后台线程启动 HTTP 服务，port=0 时自动分配端口（见 server.server_address）"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            status, content_type, body = sources.respond(self.path)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="synthetic-sources", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地合成数据源")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--entries-per-feed", type=int, default=100, help="每个订阅源的条目数 (默认100)")
+    parser.add_argument("--body-bytes", type=int, default=1500, help="订阅源条目正文字节数 (默认1500)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="响应延迟 (毫秒)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="延迟随机波动 (毫秒)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="返回 503 的比例")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    sources = SyntheticSources(args.entries_per_feed, args.body_bytes, args.latency_ms,
+                               args.jitter_ms, args.failure_rate, args.seed)
+    server = serve(sources, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"合成数据源: http://{host}:{port}/ (Ctrl+C 停止)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+本地分析模块 - 不依赖网络模型的排序、聚类等计算
+"""
+from .clustering import TopicClusterer
+from .keywords import KeywordExtractor
+from .ranking import HotspotRanker
+from .trending import TrendTracker
+
+__all__ = ['HotspotRanker', 'KeywordExtractor', 'TopicClusterer', 'TrendTracker']
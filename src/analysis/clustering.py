@@ -0,0 +1,115 @@
+"""
+话题聚类 - 哈希 TF-IDF 向量 + 余弦相似度（NumPy，无需网络模型）
+"""
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.collectors.base import HotspotItem
+from .text import hash_token, tokenize
+
+
+class TopicClusterer:
+    """把描述同一事件的热点聚成一组，每组只把代表条目送入 LLM"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.enabled = config.get('enabled', True)
+        self.threshold = config.get('threshold', 0.45)  # 余弦相似度阈值
+        self.n_features = config.get('n_features', 2048)  # 哈希向量维度
+        self.chunk_size = config.get('chunk_size', 1024)  # 分块计算相似度，控制内存
+        self.prompt_related = config.get('prompt_related', 3)  # 代表条目附带给 LLM 的相关标题数
+        self.related_title_chars = config.get('related_title_chars', 60)  # 相关标题截断长度
+
+    def is_enabled(self) -> bool:
+        return self.enabled
+
+    def vectorize(self, texts: List[str]) -> np.ndarray:
+        """哈希 TF-IDF 向量（L2 归一化），形状 (n, n_features)"""
+        cache: Dict[str, int] = {}
+        rows, cols, signs = [], [], []
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                h = hash_token(token, cache)
+                rows.append(row)
+                cols.append(h % self.n_features)
+                # 用高位决定符号，抵消哈希冲突带来的偏差
+                signs.append(1.0 if h & 0x80000000 else -1.0)
+
+        n = len(texts)
+        matrix = np.zeros((n, self.n_features), dtype=np.float32)
+        if not rows:
+            return matrix
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        np.add.at(matrix, (rows, cols), np.asarray(signs, dtype=np.float32))
+
+        # 文档频率按 (文档, 维度) 去重计数
+        df = np.bincount(np.unique(rows * self.n_features + cols) % self.n_features,
+                         minlength=self.n_features)
+        idf = np.log((1 + n) / (1 + df)) + 1
+        matrix *= idf.astype(np.float32)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def cluster(self, items: List[HotspotItem]) -> List[List[int]]:
+        """返回聚类结果（下标列表，第一个为代表条目），单条也自成一组"""
+        n = len(items)
+        if n == 0:
+            return []
+
+        vectors = self.vectorize([item.title for item in items])
+        neighbors = self._neighbors(vectors)
+
+        # 按热度从高到低选代表，代表吸收其未分配的相似条目（星形聚类，避免链式合并）
+        hotness = np.array([item.extra.get('hotness', 0.0) for item in items], dtype=np.float64)
+        order = np.argsort(-hotness, kind='stable')
+        assigned = np.zeros(n, dtype=bool)
+        clusters = []
+        for leader in order:
+            if assigned[leader]:
+                continue
+            assigned[leader] = True
+            members = [j for j in neighbors.get(int(leader), []) if not assigned[j]]
+            assigned[members] = True
+            clusters.append([int(leader)] + members)
+        return clusters
+
+    def _neighbors(self, vectors: np.ndarray) -> Dict[int, List[int]]:
+        """分块计算相似度矩阵，只保留超过阈值的近邻"""
+        n = len(vectors)
+        neighbors: Dict[int, List[int]] = {}
+        for start in range(0, n, self.chunk_size):
+            block = vectors[start:start + self.chunk_size] @ vectors.T
+            rows, cols = np.nonzero(block >= self.threshold)
+            rows += start
+            mask = rows != cols
+            for i, j in zip(rows[mask].tolist(), cols[mask].tolist()):
+                neighbors.setdefault(i, []).append(j)
+        return neighbors
+
+    def apply(self, items: List[HotspotItem]) -> List[HotspotItem]:
+        """执行聚类并标记条目，返回需要送入 LLM 的代表条目（保持原顺序）"""
+        # 清除上一轮的标记（常驻模式下条目会跨轮次复用）
+        for item in items:
+            for key in ('cluster_id', 'cluster_size', 'related_titles', 'cluster_of'):
+                item.extra.pop(key, None)
+        clusters = self.cluster(items)
+        representatives = set()
+        for cluster_id, members in enumerate(clusters):
+            leader = items[members[0]]
+            representatives.add(members[0])
+            if len(members) == 1:
+                continue
+            leader.extra['cluster_id'] = cluster_id
+            leader.extra['cluster_size'] = len(members)
+            leader.extra['related_titles'] = [
+                items[j].title[:self.related_title_chars] for j in members[1:self.prompt_related + 1]
+            ]
+            for j in members[1:]:
+                items[j].extra['cluster_id'] = cluster_id
+                items[j].extra['cluster_of'] = leader.url
+        return [item for i, item in enumerate(items) if i in representatives]
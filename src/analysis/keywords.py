@@ -0,0 +1,202 @@
+"""
+关键词提取 - 本地 TF-IDF（NumPy 向量化），文档频率按天增量更新并保存到 SQLite
+"""
+import hashlib
+import json
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.collectors.base import HotspotItem
+from .text import tokenize
+
+
+class DocumentFrequencyTable:
+    """滚动窗口文档频率表（SQLite）
+
+    按天分桶保存词频，总表增量维护：新增当天计数、减去过期分桶；已计数文档的 key
+    哈希按天保存，随分桶一起过期。每次运行只读写本次条目涉及的行和过期分桶，
+    开销与新条目数成正比，不重扫也不重写窗口内的历史
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+    CREATE TABLE IF NOT EXISTS df (term TEXT PRIMARY KEY, count INTEGER NOT NULL);
+    CREATE TABLE IF NOT EXISTS day_docs (day TEXT PRIMARY KEY, docs INTEGER NOT NULL);
+    CREATE TABLE IF NOT EXISTS day_df (day TEXT NOT NULL, term TEXT NOT NULL, count INTEGER NOT NULL,
+                                       PRIMARY KEY (day, term));
+    CREATE TABLE IF NOT EXISTS seen (hash INTEGER PRIMARY KEY, day TEXT NOT NULL);
+    CREATE INDEX IF NOT EXISTS seen_day ON seen (day);
+    """
+
+    def __init__(self, path: Path, window_days: int = 14):
+        self.path = Path(path)
+        self.window_days = window_days
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path))
+        self._db.executescript(self.SCHEMA)
+        self._import_json(self.path.with_suffix('.json'))
+
+    def _import_json(self, legacy: Path) -> None:
+        """导入旧版 keyword_df.json（整表 JSON），导入后删除
+
+        旧版的去重哈希 (crc32) 不导入，窗口内已计数的文档再次出现时会多计一次
+        """
+        if not legacy.exists():
+            return
+        try:
+            data = json.loads(legacy.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"[Keywords] 读取旧版文档频率表失败，忽略: {e}")
+            return
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('docs', ?)", (data.get('docs', 0),))
+            self._db.executemany("INSERT OR REPLACE INTO df VALUES (?, ?)", data.get('df', {}).items())
+            for day, bucket in data.get('days', {}).items():
+                self._db.execute("INSERT OR REPLACE INTO day_docs VALUES (?, ?)", (day, bucket.get('docs', 0)))
+                self._db.executemany("INSERT OR REPLACE INTO day_df VALUES (?, ?, ?)",
+                                     [(day, term, count) for term, count in bucket.get('df', {}).items()])
+        legacy.unlink()
+        print(f"[Keywords] 已导入旧版文档频率表 {legacy.name}")
+
+    @property
+    def docs(self) -> int:
+        """窗口内文档总数"""
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'docs'").fetchone()
+        return row[0] if row else 0
+
+    def lookup(self, terms: List[str]) -> Dict[str, int]:
+        """查询词的文档频率（只读取本次出现的词）"""
+        result: Dict[str, int] = {}
+        for i in range(0, len(terms), 500):
+            chunk = terms[i:i + 500]
+            rows = self._db.execute(f"SELECT term, count FROM df WHERE term IN ({','.join('?' * len(chunk))})", chunk)
+            result.update(rows)
+        return result
+
+    def save(self) -> None:
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def expire(self, today: date) -> None:
+        """减去窗口外的分桶"""
+        cutoff = (today - timedelta(days=self.window_days - 1)).isoformat()
+        expired = [row[0] for row in self._db.execute("SELECT day FROM day_docs WHERE day < ?", (cutoff,))]
+        with self._db:
+            for day in expired:
+                self._db.execute(
+                    "UPDATE df SET count = count - (SELECT count FROM day_df WHERE day = ? AND term = df.term) "
+                    "WHERE term IN (SELECT term FROM day_df WHERE day = ?)", (day, day))
+                self._db.execute("UPDATE meta SET value = value - (SELECT docs FROM day_docs WHERE day = ?) "
+                                 "WHERE key = 'docs'", (day,))
+                for table in ("day_df", "day_docs", "seen"):
+                    self._db.execute(f"DELETE FROM {table} WHERE day = ?", (day,))
+            if expired:
+                self._db.execute("DELETE FROM df WHERE count <= 0")
+
+    def add(self, today: date, doc_keys: List[str], doc_terms: List[List[str]]) -> None:
+        """累加新文档（窗口内已计数的文档按 key 去重）"""
+        day = today.isoformat()
+        counts: Dict[str, int] = {}
+        docs = 0
+        with self._db:
+            for key, terms in zip(doc_keys, doc_terms):
+                key_hash = int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=7).digest(), 'big')
+                if self._db.execute("INSERT OR IGNORE INTO seen VALUES (?, ?)", (key_hash, day)).rowcount == 0:
+                    continue
+                docs += 1
+                for term in set(terms):
+                    counts[term] = counts.get(term, 0) + 1
+            if not docs:
+                return
+            self._db.execute("INSERT INTO meta VALUES ('docs', ?) "
+                             "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value", (docs,))
+            self._db.execute("INSERT INTO day_docs VALUES (?, ?) "
+                             "ON CONFLICT (day) DO UPDATE SET docs = docs + excluded.docs", (day, docs))
+            self._db.executemany("INSERT INTO df VALUES (?, ?) "
+                                 "ON CONFLICT (term) DO UPDATE SET count = count + excluded.count", counts.items())
+            self._db.executemany("INSERT INTO day_df VALUES (?, ?, ?) "
+                                 "ON CONFLICT (day, term) DO UPDATE SET count = count + excluded.count",
+                                 [(day, term, count) for term, count in counts.items()])
+
+
+class KeywordExtractor:
+    """基于本次运行全部标题和历史文档频率的关键词提取器（替代 extract_keywords LLM 任务）"""
+
+    def __init__(self, config: Dict[str, Any], state_dir: Path):
+        self.config = config
+        self.enabled = config.get('enabled', True)
+        self.per_item = config.get('per_item', 5)  # 每条最多关键词数
+        self.top_k = config.get('top_k', 20)  # 本次运行热门关键词数
+        self.table = DocumentFrequencyTable(
+            Path(state_dir) / "keyword_df.db",
+            window_days=config.get('window_days', 14)
+        )
+
+    def is_enabled(self) -> bool:
+        return self.enabled
+
+    def close(self) -> None:
+        self.table.close()
+
+    def extract(self, items: List[HotspotItem], today: Optional[date] = None) -> List[Tuple[str, float]]:
+        """提取关键词：写入 item.extra['keywords'] / ['keyword_score']，返回本次运行热门关键词"""
+        if not items:
+            return []
+
+        today = today or date.today()
+        doc_terms = [[t for t in tokenize(item.title, stemmed=False) if not t.isdigit()] for item in items]
+        self.table.expire(today)
+        self.table.add(today, [item.url or item.title for item in items], doc_terms)
+        self.table.save()
+
+        # 稀疏表示：每个 (文档, 词) 一条记录
+        vocab: Dict[str, int] = {}
+        doc_idx, term_idx = [], []
+        for i, terms in enumerate(doc_terms):
+            for term in terms:
+                doc_idx.append(i)
+                term_idx.append(vocab.setdefault(term, len(vocab)))
+        if not vocab:
+            return []
+
+        n_terms = len(vocab)
+        keys, tf = np.unique(np.asarray(doc_idx, dtype=np.int64) * n_terms + np.asarray(term_idx, dtype=np.int64),
+                             return_counts=True)
+        docs, terms = keys // n_terms, keys % n_terms
+        doc_len = np.bincount(docs, weights=tf, minlength=len(items))
+
+        known = self.table.lookup(list(vocab))
+        df = np.array([known.get(term, 0) for term in vocab], dtype=np.float64)
+        idf = np.log((1 + self.table.docs) / (1 + df)) + 1
+        scores = tf / doc_len[docs] * idf[terms]
+
+        # 本次运行热门关键词：各文档 TF-IDF 求和
+        run_scores = np.bincount(terms, weights=scores, minlength=n_terms)
+        words = list(vocab)
+        top = np.argsort(-run_scores, kind='stable')[:self.top_k]
+        run_weight = run_scores / run_scores.max() if run_scores.max() > 0 else run_scores
+
+        # 每条文档按分数降序取前 per_item 个
+        for item in items:
+            item.extra['keywords'] = []
+        order = np.lexsort((-scores, docs))
+        starts = np.searchsorted(docs[order], docs[order], side='left')
+        ranks = np.arange(len(order)) - starts
+        for pos in np.flatnonzero(ranks < self.per_item):
+            entry = order[pos]
+            item = items[docs[entry]]
+            item.extra['keywords'].append(words[terms[entry]])
+
+        # 关键词热度分数：该条关键词在本次运行中的平均热度，供排序使用
+        item_weight = np.bincount(docs, weights=run_weight[terms], minlength=len(items))
+        term_count = np.bincount(docs, minlength=len(items))
+        for i, item in enumerate(items):
+            item.extra['keyword_score'] = round(float(item_weight[i] / term_count[i]), 4) if term_count[i] else 0.0
+
+        return [(words[i], round(float(run_scores[i]), 4)) for i in top if run_scores[i] > 0]
@@ -0,0 +1,125 @@
+"""
+热度排序器 - 基于互动数据和时间衰减的本地排序（NumPy 向量化）
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.collectors.base import HotspotItem
+
+
+class HotspotRanker:
+    """本地热度排序器，在 AI 处理前按分类截取 Top N"""
+
+    # extra 中的互动字段及其权重（Twitter: likes/retweets/views,
+    # YouTube: views/likes, Reddit: score/comments）
+    DEFAULT_SIGNALS = {
+        'likes': 1.0,
+        'retweets': 2.0,
+        'views': 0.05,
+        'score': 1.0,
+        'comments': 2.0,
+    }
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.enabled = config.get('enabled', True)
+        self.top_n = config.get('top_n_per_category', 30)
+        self.half_life_hours = config.get('half_life_hours', 24)
+        self.engagement_weight = config.get('engagement_weight', 0.6)
+        self.keyword_weight = config.get('keyword_weight', 0.0)  # 关键词热度权重（需先执行关键词提取）
+        self.trend_weight = config.get('trend_weight', 0.0)  # 互动增长率权重（需先更新上升趋势）
+        self.signals = {**self.DEFAULT_SIGNALS, **config.get('signals', {})}
+
+    def is_enabled(self) -> bool:
+        return self.enabled
+
+    def score(self, items: List[HotspotItem], now: Optional[float] = None) -> np.ndarray:
+        """计算热度分数 (0-1)，同时写入 item.extra['hotness']"""
+        if not items:
+            return np.zeros(0)
+
+        now = now if now is not None else time.time()
+        engagement = self._engagement_scores(items)
+        recency = self._recency_scores(items, now)
+
+        keyword = np.array([item.extra.get('keyword_score', 0.0) for item in items], dtype=np.float64)
+        trend = np.array([item.extra.get('trend_score', 0.0) for item in items], dtype=np.float64)
+        if trend.max() > 0:
+            trend /= trend.max()
+
+        w_e, w_k, w_t = self.engagement_weight, self.keyword_weight, self.trend_weight
+        scores = w_e * engagement + w_k * keyword + w_t * trend + (1 - w_e - w_k - w_t) * recency
+        for item, value in zip(items, scores):
+            item.extra['hotness'] = round(float(value), 4)
+        return scores
+
+    def rank(self, items: List[HotspotItem], now: Optional[float] = None) -> List[HotspotItem]:
+        """按热度排序，每个分类只保留 Top N"""
+        if not items:
+            return []
+
+        scores = self.score(items, now)
+        _, cat_idx = np.unique([item.category for item in items], return_inverse=True)
+
+        # 按 (分类, 分数降序) 排序后计算类内名次
+        order = np.lexsort((-scores, cat_idx))
+        sorted_cats = cat_idx[order]
+        starts = np.searchsorted(sorted_cats, sorted_cats, side='left')
+        ranks = np.empty(len(items), dtype=np.int64)
+        ranks[order] = np.arange(len(items)) - starts
+
+        keep = np.ones(len(items), dtype=bool)
+        if self.top_n and self.top_n > 0:
+            keep = ranks < self.top_n
+
+        kept = np.flatnonzero(keep)
+        kept = kept[np.argsort(-scores[kept], kind='stable')]
+        return [items[i] for i in kept]
+
+    def _engagement_scores(self, items: List[HotspotItem]) -> np.ndarray:
+        """互动分数：加权求和取对数后，在同一来源内按百分位归一化"""
+        keys = list(self.signals.keys())
+        weights = np.array([self.signals[k] for k in keys], dtype=np.float64)
+        values = np.array(
+            [[self._to_number(item.extra.get(k)) for k in keys] for item in items],
+            dtype=np.float64
+        ).reshape(len(items), len(keys))
+        raw = np.log1p(np.clip(values, 0, None) @ weights)
+
+        # 来源分组（Twitter / YouTube / r/xxx / RSS 源名称）
+        _, group_idx = np.unique([item.source for item in items], return_inverse=True)
+        counts = np.bincount(group_idx)
+        totals = np.bincount(group_idx, weights=raw)
+
+        order = np.lexsort((raw, group_idx))
+        sorted_groups = group_idx[order]
+        starts = np.searchsorted(sorted_groups, sorted_groups, side='left')
+        pct = np.empty(len(items), dtype=np.float64)
+        denom = np.maximum(counts[sorted_groups] - 1, 1)
+        pct[order] = (np.arange(len(items)) - starts) / denom
+
+        # 没有互动数据的来源（如 RSS）或只有一条数据时取中位
+        neutral = (totals[group_idx] == 0) | (counts[group_idx] == 1)
+        pct[neutral] = 0.5
+        return pct
+
+    def _recency_scores(self, items: List[HotspotItem], now: float) -> np.ndarray:
+        """时间衰减分数：按半衰期指数衰减，无发布时间时取 0.5"""
+        published = np.array(
+            [item.published_at.timestamp() if item.published_at else np.nan for item in items],
+            dtype=np.float64
+        )
+        age_hours = np.clip((now - published) / 3600.0, 0, None)
+        half_life = max(float(self.half_life_hours), 1e-6)
+        decay = np.exp(-np.log(2) * age_hours / half_life)
+        return np.where(np.isnan(published), 0.5, decay)
+
+    @staticmethod
+    def _to_number(value: Any) -> float:
+        """互动字段转数值（YouTube 统计接口返回字符串）"""
+        try:
+            return float(value or 0)
+        except (TypeError, ValueError):
+            return 0.0
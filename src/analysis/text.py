@@ -0,0 +1,57 @@
+"""
+文本切词 - 中日韩文字按二元组切分，英文按单词切分
+"""
+import re
+import zlib
+from typing import Dict, List
+
+# 中日韩文字连续片段 或 英文/数字单词
+_TOKEN_RE = re.compile(
+    r'([\u3400-\u4dbf\u4e00-\u9fff\u3040-\u30ff\uac00-\ud7af]+)|([a-z0-9]+(?:[\'.][a-z0-9]+)*)'
+)
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have how i in into is it its of on or our
+that the their this to was we what when where which who why will with you your
+new about after over just more can not all now out up vs via
+""".split())
+
+
+def stem(word: str) -> str:
+    """轻量英文词干：去掉常见屈折后缀，使 launch/launches/launched 归为同一词"""
+    if len(word) <= 4 or not word.isalpha():
+        return word
+    for suffix in ('ing', 'ed', 'es', 's'):
+        if word.endswith(suffix) and not word.endswith('ss') and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    if word.endswith('e') and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str, stemmed: bool = True) -> List[str]:
+    """切词：CJK 连续片段生成二元组（单字片段保留单字），英文单词转小写、去停用词并取词干
+
+    需要展示给用户的场景（如关键词）传 stemmed=False 保留原词形
+    """
+    tokens = []
+    for cjk, word in _TOKEN_RE.findall((text or '').lower()):
+        if cjk:
+            if len(cjk) == 1:
+                tokens.append(cjk)
+            else:
+                tokens.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+        elif len(word) > 1 and word not in STOPWORDS:
+            tokens.append(stem(word) if stemmed else word)
+    return tokens
+
+
+def hash_token(token: str, cache: Dict[str, int] = None) -> int:
+    """稳定的 32 位哈希（内置 hash() 每个进程加盐，不能跨运行复用）"""
+    if cache is not None:
+        value = cache.get(token)
+        if value is None:
+            value = cache[token] = zlib.crc32(token.encode('utf-8'))
+        return value
+    return zlib.crc32(token.encode('utf-8'))
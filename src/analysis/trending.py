@@ -0,0 +1,132 @@
+"""
+上升趋势 - 跨运行记录条目互动数据快照，增量维护速度/加速度，找出互动增长最快的条目
+"""
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.collectors.base import HotspotItem
+from src.generators.serialize import atomic_write_bytes, dumps
+from .ranking import HotspotRanker
+
+
+class TrendTracker:
+    """互动增长速度跟踪
+
+    每个条目（按 URL）只保存最近一次快照 (互动量, 时间) 和指数滑动窗口聚合值:
+        velocity      互动量每小时增量的指数加权平均，窗口 window_hours
+        acceleration  velocity 每小时变化量的指数加权平均
+    新快照到来时按与上次快照的间隔计算衰减系数并更新聚合值，不保留也不重扫历史快照；
+    记录按最近更新时间排列，过期记录从头部删除，每次运行的开销只与本次快照数和过期条目数有关
+
+    结果写入 item.extra: velocity / acceleration / trend_score (每小时增长率) / rising
+    """
+
+    def __init__(self, config: Dict[str, Any], state_dir: Path, signals: Optional[Dict[str, float]] = None):
+        self.config = config
+        self.enabled = config.get('enabled', True)
+        self.window_hours = config.get('window_hours', 6)
+        self.min_interval = config.get('min_interval_minutes', 10) / 60  # 小时
+        self.min_snapshots = config.get('min_snapshots', 2)
+        self.min_engagement = config.get('min_engagement', 50)  # 增长率的分母下限，避免小基数放大
+        self.rising_growth = config.get('rising_growth', 0.1)
+        self.report_top = config.get('report_top', 10)
+        self.forget_hours = config.get('forget_hours', 72)
+        self.signals = {**HotspotRanker.DEFAULT_SIGNALS, **(signals or {})}
+        self.path = Path(state_dir) / "trending.json"
+        # URL -> {"e": 互动量, "t": 快照时间, "v": 速度, "a": 加速度, "n": 快照数}，按 t 升序
+        self.records: Dict[str, Dict[str, float]] = self._load()
+
+    def is_enabled(self) -> bool:
+        return self.enabled
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if not self.enabled or not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"[Trending] 读取趋势记录失败，重新开始: {e}")
+            return {}
+
+    def save(self) -> None:
+        try:
+            atomic_write_bytes(self.path, dumps(self.records))
+        except OSError as e:
+            print(f"[Trending] 保存趋势记录失败: {e}")
+
+    def engagement(self, item: HotspotItem) -> Optional[float]:
+        """加权互动量；条目没有任何互动字段（如 RSS）时返回 None"""
+        if not any(key in item.extra for key in self.signals):
+            return None
+        return sum(HotspotRanker._to_number(item.extra.get(key)) * weight
+                   for key, weight in self.signals.items())
+
+    def update(self, items: List[HotspotItem], now: Optional[float] = None) -> int:
+        """记录本次快照并更新聚合值，返回上升条目数
+
+        已记录过快照的条目对象（常驻模式下未刷新的数据源）不重复记录
+        """
+        now = now if now is not None else time.time()
+        self._expire(now)
+        rising = 0
+        for item in items:
+            if 'trend_at' in item.extra or not item.url:
+                continue
+            value = self.engagement(item)
+            if value is None:
+                continue
+            record = self._observe(item.url, value, now)
+            item.extra['trend_at'] = now
+            self._annotate(item, record)
+            rising += bool(item.extra['rising'])
+        return rising
+
+    def _observe(self, key: str, value: float, now: float) -> Dict[str, float]:
+        record = self.records.get(key)
+        if record is not None and (now - record["t"]) / 3600 < self.min_interval:
+            return record  # 间隔过短，保留上次快照；t 未变，位置也不变，记录仍按 t 升序
+        record = self.records.pop(key, None)
+        if record is None:
+            record = {"e": value, "t": now, "v": 0.0, "a": 0.0, "n": 1}
+        else:
+            hours = (now - record["t"]) / 3600
+            instant = (value - record["e"]) / hours
+            alpha = 1 - math.exp(-hours / self.window_hours)
+            if record["n"] == 1:
+                velocity, acceleration = instant, 0.0
+            else:
+                velocity = record["v"] + alpha * (instant - record["v"])
+                acceleration = record["a"] + alpha * ((velocity - record["v"]) / hours - record["a"])
+            record = {"e": value, "t": now, "v": round(velocity, 4), "a": round(acceleration, 4),
+                      "n": record["n"] + 1}
+        self.records[key] = record
+        return record
+
+    def _annotate(self, item: HotspotItem, record: Dict[str, float]):
+        growth = max(0.0, record["v"]) / max(record["e"], self.min_engagement)
+        ready = record["n"] >= self.min_snapshots
+        item.extra['velocity'] = record["v"]
+        item.extra['acceleration'] = record["a"]
+        item.extra['trend_score'] = round(growth, 4) if ready else 0.0
+        item.extra['rising'] = ready and growth >= self.rising_growth and record["a"] >= 0
+
+    def _expire(self, now: float):
+        """删除超过 forget_hours 未更新的记录（记录按更新时间排列，只检查头部）"""
+        cutoff = now - self.forget_hours * 3600
+        expired = []
+        for key, record in self.records.items():
+            if record["t"] >= cutoff:
+                break
+            expired.append(key)
+        for key in expired:
+            del self.records[key]
+
+    def rising(self, items: List[HotspotItem]) -> List[Dict[str, Any]]:
+        """报告顶部的上升榜：按每小时增长率降序，最多 report_top 条"""
+        ranked = sorted((item for item in items if item.extra.get('rising')),
+                        key=lambda item: -item.extra['trend_score'])
+        return [{"title": item.translated_title or item.title, "url": item.url, "source": item.source,
+                 "growth": round(item.extra['trend_score'] * 100)} for item in ranked[:self.report_top]]
@@ -0,0 +1,118 @@
+"""
+阶段断点 - 每个阶段完成后把结果写入 <state_dir>/checkpoint/，--resume 从最后完成的阶段继续
+
+目录结构:
+    run.json                 运行信息: 开始时间、已完成的阶段
+    collected.json.gz        采集结果
+    analyzed.json.gz         关键词/排序/聚类之后的条目和热门关键词
+    processed.json.gz        AI 处理之后的条目
+    ai_batches.jsonl         AI 阶段逐批追加的结果（url -> 翻译/摘要），中断后已完成的批次不再重复请求
+
+运行成功生成报告后清空；不带 --resume 的运行开始时也会清空
+"""
+import gzip
+import json
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.collectors.base import HotspotItem
+from src.generators.serialize import atomic_write_bytes, dumps
+
+# 阶段顺序
+STAGES = ["collected", "analyzed", "processed"]
+
+
+class CheckpointStore:
+    """阶段断点存储"""
+
+    def __init__(self, state_dir: Path, max_age_hours: float = 6):
+        self.dir = Path(state_dir) / "checkpoint"
+        self.run_path = self.dir / "run.json"
+        self.batches_path = self.dir / "ai_batches.jsonl"
+        self.max_age_hours = max_age_hours  # 超过该时长的断点视为过期，不再恢复
+
+    def reset(self):
+        """清空断点，开始新的运行"""
+        if self.dir.exists():
+            shutil.rmtree(self.dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._write_run({"started": datetime.now().isoformat(timespec="seconds"), "stages": []})
+
+    def resumable(self) -> bool:
+        """是否存在未过期、可恢复的断点"""
+        run = self._read_run()
+        if not run:
+            return False
+        started = datetime.fromisoformat(run["started"])
+        if datetime.now() - started > timedelta(hours=self.max_age_hours):
+            print(f"[Checkpoint] 断点已过期 (开始于 {run['started']})，重新运行")
+            return False
+        return True
+
+    def completed(self, stage: str) -> bool:
+        return stage in self._read_run().get("stages", [])
+
+    def last_stage(self) -> Optional[str]:
+        stages = self._read_run().get("stages", [])
+        return stages[-1] if stages else None
+
+    def save(self, stage: str, items: List[HotspotItem], **data: Any):
+        """保存阶段结果并标记完成"""
+        payload = {"items": [item.to_dict() for item in items], **data}
+        atomic_write_bytes(self.dir / f"{stage}.json.gz", gzip.compress(dumps(payload), compresslevel=6))
+        run = self._read_run()
+        if stage not in run["stages"]:
+            run["stages"].append(stage)
+        self._write_run(run)
+
+    def load(self, stage: str) -> Dict[str, Any]:
+        """读取阶段结果，items 还原为 HotspotItem"""
+        payload = json.loads(gzip.decompress((self.dir / f"{stage}.json.gz").read_bytes()))
+        payload["items"] = [HotspotItem.from_dict(item) for item in payload["items"]]
+        return payload
+
+    def save_batch(self, batch: List[HotspotItem]):
+        """追加一批 AI 处理结果"""
+        if not batch:
+            return
+        with open(self.batches_path, "a", encoding="utf-8") as f:
+            for item in batch:
+                f.write(json.dumps({"url": item.url, "t": item.translated_title, "s": item.summary},
+                                   ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def apply_batches(self, items: List[HotspotItem]) -> int:
+        """把已完成批次的结果写回条目，返回恢复的条数"""
+        if not self.batches_path.exists():
+            return 0
+        results = {}
+        with open(self.batches_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 中断时写了一半的行
+                results[record["url"]] = record
+        restored = 0
+        for item in items:
+            record = results.get(item.url)
+            if record and not item.translated_title:
+                item.translated_title = record["t"]
+                item.summary = record["s"]
+                restored += 1
+        return restored
+
+    def clear(self):
+        """运行成功后删除断点"""
+        if self.dir.exists():
+            shutil.rmtree(self.dir)
+
+    def _read_run(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.run_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _write_run(self, run: Dict[str, Any]):
+        atomic_write_bytes(self.run_path, dumps(run))
@@ -1,13 +1,17 @@
 """
 数据采集器基类
 """
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+import requests
 from dateutil import parser as date_parser
 
+from .health import CircuitOpenError, SourceHealth
+
 
 @dataclass
 class HotspotItem:
@@ -33,6 +37,21 @@ class HotspotItem:
             "extra": self.extra
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HotspotItem":
+        """从 to_dict() 的结果还原"""
+        published = data.get("published_at")
+        return cls(
+            title=data.get("title", ""),
+            url=data.get("url", ""),
+            source=data.get("source", ""),
+            category=data.get("category", ""),
+            published_at=datetime.fromisoformat(published) if published else None,
+            summary=data.get("summary", ""),
+            translated_title=data.get("translated_title", ""),
+            extra=dict(data.get("extra") or {})
+        )
+
 
 class BaseCollector(ABC):
     """采集器基类"""
@@ -40,6 +59,49 @@ class BaseCollector(ABC):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.enabled = config.get('enabled', False)
+        self._session: Optional[requests.Session] = None
+        # 数据源健康记录（由流水线注入，未设置时不做熔断和自适应超时）
+        self.health: Optional[SourceHealth] = None
+        # 请求失败的数据源 -> 错误信息（不含熔断跳过），分布式 worker 据此重试工作单元
+        self.failures: Dict[str, str] = {}
+
+    @property
+    def session(self) -> requests.Session:
+        """共享 HTTP 会话，复用连接池（常驻模式下跨轮次保持连接）"""
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
+
+    def _get(self, key: str, url: str, timeout: float, **kwargs) -> requests.Response:
+        """发送 GET 请求并更新 key 对应数据源的健康记录
+
+        熔断中时抛出 CircuitOpenError；超时按历史延迟自适应；HTTP 错误状态码抛出 HTTPError；
+        实际发出的请求失败时记入 self.failures（熔断跳过不计入，重试单元也不会放行）
+        """
+        try:
+            return self._request(key, url, timeout, **kwargs)
+        except CircuitOpenError:
+            raise
+        except requests.RequestException as e:
+            self.failures[key] = f"{type(e).__name__}: {e}"
+            raise
+
+    def _request(self, key: str, url: str, timeout: float, **kwargs) -> requests.Response:
+        if self.health is None:
+            response = self.session.get(url, timeout=timeout, **kwargs)
+            response.raise_for_status()
+            return response
+        if not self.health.allow(key):
+            raise CircuitOpenError(f"{key} 熔断中，跳过")
+        start = time.monotonic()
+        try:
+            response = self.session.get(url, timeout=self.health.timeout(key, timeout), **kwargs)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self.health.record_failure(key, f"{type(e).__name__}: {e}")
+            raise
+        self.health.record_success(key, time.monotonic() - start)
+        return response
 
     @property
     @abstractmethod
@@ -55,11 +117,24 @@ class BaseCollector(ABC):
     def is_enabled(self) -> bool:
         return self.enabled
 
-    def _parse_date(self, date_str: Optional[str]) -> datetime:
-        """解析日期字符串"""
+    def close(self) -> None:
+        """释放采集器持有的资源（HTTP 连接池等），常驻模式重建流水线前调用"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def work_units(self) -> List[Dict[str, Any]]:
+        """拆分为可独立执行的工作单元（分布式采集），每个单元是覆盖到采集器配置上的字典
+
+        默认整个数据源为一个单元；按订阅源/查询拆分的采集器重写该方法
+        """
+        return [{}]
+
+    def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
+        """解析日期字符串，缺失或无法解析时返回 None（不用当前时间代替，避免报告内容每次运行都变化）"""
         if date_str:
             try:
                 return date_parser.parse(date_str)
-            except (ValueError, TypeError):
+            except (ValueError, TypeError, OverflowError):
                 pass
-        return datetime.now()
+        return None
@@ -0,0 +1,209 @@
+"""
+RSS/Atom 解析 - 在子进程中运行，只返回构建 HotspotItem 所需的轻量字段
+
+模块只依赖 feedparser 和标准库，子进程启动（spawn）时无需导入项目其他模块。
+
+快速路径用 XMLPullParser 分块增量解析，只提取标题/链接/时间/作者/标签，
+正文元素解析完立即丢弃；取满 max_entries 条或连续遇到超过时限的条目后
+停止读取剩余内容。文档不是合法 XML（如 HTML 实体、截断）或格式无法识别时
+回退到 feedparser
+
+两条路径的标题/作者/标签都经过 clean_text()（去标签、还原实体、合并空白），
+同一文档得到相同的结果
+"""
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+
+import feedparser
+
+CHUNK_SIZE = 64 * 1024  # 每次送入解析器的字节数
+STOP_AFTER_OLD = 3  # 连续多少条超过时限后停止（订阅源一般按时间倒序）
+
+# 元素本地名 -> 字段
+_DATE_TAGS = {"pubDate", "published", "date", "issued"}
+_UPDATED_TAGS = {"updated", "modified"}
+_BODY_TAGS = {"description", "content", "summary", "encoded"}
+
+
+class UnsupportedFeed(Exception):
+    """快速路径无法处理的文档"""
+
+
+class _TextExtractor(HTMLParser):
+    """只保留文本节点，字符引用在解析时还原"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+
+    def handle_data(self, data: str):
+        self.parts.append(data)
+
+
+def clean_text(value: str) -> str:
+    """标题等短文本: 去掉 HTML 标签、还原实体（只还原一层，&amp;amp; -> &amp; -> &）、合并空白"""
+    if not value:
+        return ""
+    if "<" in value or "&" in value:
+        extractor = _TextExtractor()
+        extractor.feed(value)
+        extractor.close()
+        value = "".join(extractor.parts)
+    return " ".join(value.split())
+
+
+def parse_feed(content: bytes, max_entries: int, fast: bool = True,
+               max_age_hours: float = 0) -> List[Dict[str, Any]]:
+    """解析订阅源内容，返回前 max_entries 条的 {title, link, date, author, tags}
+
+    max_age_hours > 0 时跳过早于该时限的条目
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours) if max_age_hours > 0 else None
+    if fast:
+        try:
+            return fast_parse_feed(content, max_entries, cutoff)
+        except (ET.ParseError, UnsupportedFeed):
+            pass
+    return _feedparser_parse(content, max_entries, cutoff)
+
+
+def fast_parse_feed(content: bytes, max_entries: int,
+                    cutoff: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """增量解析 RSS 2.0 / RSS 1.0 (RDF) / Atom，提前结束"""
+    parser = ET.XMLPullParser(events=("start", "end"))
+    entries: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    root_seen = False
+    old_streak = 0
+
+    for offset in range(0, len(content), CHUNK_SIZE):
+        parser.feed(content[offset:offset + CHUNK_SIZE])
+        for event, elem in parser.read_events():
+            name = _local_name(elem.tag)
+            if event == "start":
+                if not root_seen:
+                    root_seen = True
+                    if name not in ("rss", "feed", "RDF"):
+                        raise UnsupportedFeed(name)
+                elif name in ("item", "entry") and current is None:
+                    current = {"title": "", "link": "", "guid": "", "date": None, "updated": None,
+                               "author": "", "tags": []}
+                continue
+
+            if current is None:
+                continue
+            if name in ("item", "entry"):
+                entry = _finish_entry(current)
+                current = None
+                elem.clear()
+                if cutoff is not None and _is_older(entry["date"], cutoff):
+                    old_streak += 1
+                    if old_streak >= STOP_AFTER_OLD:
+                        return entries
+                    continue
+                old_streak = 0
+                entries.append(entry)
+                if len(entries) >= max_entries:
+                    return entries
+            else:
+                _read_field(current, name, elem)
+
+    parser.close()  # 文档不完整时抛出 ParseError
+    if not root_seen:
+        raise UnsupportedFeed("empty")
+    return entries
+
+
+def _local_name(tag: str) -> str:
+    """去掉命名空间: {http://www.w3.org/2005/Atom}entry -> entry"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(elem: ET.Element) -> str:
+    return "".join(elem.itertext()).strip()
+
+
+def _read_field(entry: Dict[str, Any], name: str, elem: ET.Element):
+    """元素结束时提取字段（只取每个字段第一次出现的值，忽略 Atom <source> 中的同名元素）"""
+    if name == "title":
+        if not entry["title"]:
+            entry["title"] = _text(elem)
+    elif name == "link":
+        href = elem.get("href")
+        if href is not None:
+            if elem.get("rel", "alternate") == "alternate" and not entry["link"]:
+                entry["link"] = href.strip()
+        elif not entry["link"]:
+            entry["link"] = _text(elem)
+    elif name == "guid":
+        if elem.get("isPermaLink", "true") != "false":
+            entry["guid"] = _text(elem)
+    elif name in _DATE_TAGS:
+        entry["date"] = entry["date"] or _text(elem)
+    elif name in _UPDATED_TAGS:
+        entry["updated"] = entry["updated"] or _text(elem)
+    elif name in ("author", "creator"):
+        if not entry["author"]:
+            author_name = elem.find("{*}name")
+            entry["author"] = _text(author_name) if author_name is not None else _text(elem)
+    elif name == "category":
+        term = elem.get("term") or _text(elem)
+        if term:
+            entry["tags"].append(term)
+    elif name in _BODY_TAGS:
+        elem.clear()  # 正文不需要，立即释放
+
+
+def _finish_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": clean_text(entry["title"]),
+        "link": entry["link"] or entry["guid"],
+        "date": entry["date"] or entry["updated"],
+        "author": clean_text(entry["author"]),
+        "tags": [tag for tag in map(clean_text, entry["tags"]) if tag],
+    }
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """解析 RFC 822 / ISO 8601 时间，无时区的按 UTC 处理；无法解析返回 None"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _is_older(value: Optional[str], cutoff: datetime) -> bool:
+    parsed = _parse_datetime(value)
+    return parsed is not None and parsed < cutoff
+
+
+def _feedparser_parse(content: bytes, max_entries: int,
+                      cutoff: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """完整解析（容错性好，速度慢）"""
+    feed = feedparser.parse(content)
+    entries = []
+    for entry in feed.entries:
+        date = entry.get('published') or entry.get('updated')
+        if cutoff is not None and _is_older(date, cutoff):
+            continue
+        entries.append({
+            "title": clean_text(entry.get('title', '')),
+            "link": entry.get('link', ''),
+            "date": date,
+            "author": clean_text(entry.get('author', '')),
+            "tags": [tag for tag in (clean_text(t.term) for t in entry.get('tags', []) if t.get('term')) if tag],
+        })
+        if len(entries) >= max_entries:
+            break
+    return entries
@@ -0,0 +1,224 @@
+"""
+数据源健康记录 - 延迟历史、连续失败、最近成功时间，自适应超时与熔断
+
+每个请求目标（RSS 订阅源、Twitter/YouTube 查询、subreddit）一条记录，跨运行
+保存在 <state_dir>/source_health.json：
+    - 超时: 有足够成功样本时取 p95 × timeout_multiplier（不超过配置的超时，
+      不低于 min_timeout）；上次失败后恢复为配置的超时
+    - 熔断: 连续失败 failure_threshold 次后跳过该数据源，每隔
+      probe_interval_minutes 放行一次探测请求（半开），探测失败则间隔翻倍，
+      探测成功则恢复
+"""
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import requests
+
+from src.generators.serialize import atomic_write_bytes, dumps
+
+try:
+    import fcntl
+except ImportError:  # Windows: 不加文件锁
+    fcntl = None
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.RequestException):
+    """数据源熔断中，本次跳过（继承 RequestException，采集器现有的异常处理无需修改）"""
+
+
+class SourceHealth:
+    """数据源健康记录，可在多个采集线程中共享"""
+
+    def __init__(self, config: Dict[str, Any], state_dir: Path):
+        self.enabled = config.get('enabled', True)
+        self.history = config.get('history', 20)  # 每个数据源保留的成功延迟样本数
+        self.min_samples = config.get('min_samples', 5)  # 样本数达到后才启用自适应超时
+        self.timeout_multiplier = config.get('timeout_multiplier', 3.0)
+        self.min_timeout = config.get('min_timeout', 3.0)
+        self.failure_threshold = config.get('failure_threshold', 3)
+        self.probe_interval = config.get('probe_interval_minutes', 60) * 60
+        self.max_probe_interval = config.get('max_probe_interval_hours', 24) * 3600
+        self.forget_days = config.get('forget_days', 30)  # 超过该天数未出现的数据源从记录中删除
+        self.path = Path(state_dir) / "source_health.json"
+        self._lock = threading.Lock()
+        self.sources: Dict[str, Dict[str, Any]] = self._load()
+        self.seen: Set[str] = set()  # 本进程请求过（或因熔断跳过）的数据源
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.enabled or not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def save(self) -> None:
+        """保存记录，删除长期未出现的数据源
+
+        分布式采集时多个 worker 进程共用同一文件：在文件锁内重新读取，只写入本进程
+        请求过的数据源，其余数据源保留文件中的最新记录
+        """
+        if not self.enabled:
+            return
+        cutoff = time.time() - self.forget_days * 86400
+        try:
+            with _file_lock(self.path.with_suffix(".lock")):
+                merged = self._load()
+                with self._lock:
+                    merged.update({key: self.sources[key] for key in self.seen if key in self.sources})
+                    self.sources = {key: record for key, record in merged.items()
+                                    if record.get("last_seen", 0) >= cutoff}
+                    data = dumps(self.sources)
+                atomic_write_bytes(self.path, data)
+        except OSError as e:
+            print(f"[Health] 保存数据源健康记录失败: {e}")
+
+    def merge(self, keys: List[str]) -> None:
+        """重新读取记录，并把其他进程请求过的 keys 计入本进程的汇总（分布式采集的协调者使用）"""
+        if not self.enabled:
+            return
+        with _file_lock(self.path.with_suffix(".lock")):
+            sources = self._load()
+        with self._lock:
+            self.sources = sources
+            self.seen.update(keys)
+
+    def _record(self, key: str) -> Dict[str, Any]:
+        return self.sources.setdefault(key, {
+            "state": CLOSED, "latencies": [], "error_streak": 0, "trips": 0,
+            "last_success": None, "last_error": None, "last_error_at": None, "opened_at": None,
+        })
+
+    # ---------------------------------------------------------------- 请求前
+
+    def allow(self, key: str, now: Optional[float] = None) -> bool:
+        """是否发送请求；熔断中且未到探测时间时返回 False"""
+        if not self.enabled:
+            return True
+        now = now or time.time()
+        with self._lock:
+            record = self._record(key)
+            record["last_seen"] = now
+            self.seen.add(key)
+            if record["state"] == OPEN:
+                if now - (record["opened_at"] or 0) < self._probe_interval(record):
+                    return False
+                record["state"] = HALF_OPEN  # 放行一次探测
+        return True
+
+    def _probe_interval(self, record: Dict[str, Any]) -> float:
+        """熔断后的探测间隔，每次探测失败翻倍"""
+        return min(self.max_probe_interval, self.probe_interval * 2 ** max(0, record["trips"] - 1))
+
+    def timeout(self, key: str, default: float) -> float:
+        """按历史 p95 延迟计算的超时，不超过 default"""
+        if not self.enabled:
+            return default
+        with self._lock:
+            record = self.sources.get(key)
+            if not record or record["error_streak"] or len(record["latencies"]) < self.min_samples:
+                return default
+            p95 = percentile(record["latencies"], 95)
+        return max(self.min_timeout, min(default, p95 * self.timeout_multiplier))
+
+    # ---------------------------------------------------------------- 请求后
+
+    def record_success(self, key: str, seconds: float, now: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            record = self._record(key)
+            if record["state"] != CLOSED:
+                print(f"[Health] {key} 已恢复")
+            record["latencies"] = (record["latencies"] + [round(seconds, 3)])[-self.history:]
+            record.update(state=CLOSED, error_streak=0, trips=0, opened_at=None,
+                          last_success=now or time.time())
+
+    def record_failure(self, key: str, error: str, now: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        now = now or time.time()
+        with self._lock:
+            record = self._record(key)
+            record["error_streak"] += 1
+            record.update(last_error=error[:200], last_error_at=now)
+            if record["state"] == HALF_OPEN or record["error_streak"] >= self.failure_threshold:
+                if record["state"] != OPEN:
+                    record["trips"] += 1
+                record.update(state=OPEN, opened_at=now)
+                print(f"[Health] {key} 连续失败 {record['error_streak']} 次，熔断 "
+                      f"{self._probe_interval(record) / 60:.0f} 分钟后探测")
+
+    # ---------------------------------------------------------------- 汇总
+
+    def status(self, key: str) -> str:
+        """healthy / degraded (有连续失败) / open (熔断中)"""
+        record = self.sources.get(key, {})
+        if record.get("state", CLOSED) != CLOSED:
+            return "open"
+        return "degraded" if record.get("error_streak") else "healthy"
+
+    def summary(self, keys: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """各数据源状态，异常的排在前面；keys 为空时取本进程请求过的数据源"""
+        rows = []
+        with self._lock:
+            for key in sorted(keys if keys is not None else self.seen):
+                record = self.sources.get(key)
+                if record is None:
+                    continue
+                rows.append({
+                    "source": key,
+                    "status": self.status(key),
+                    "error_streak": record["error_streak"],
+                    "p95_ms": round(percentile(record["latencies"], 95) * 1000) if record["latencies"] else None,
+                    "last_success": record["last_success"],
+                    "last_error": record["last_error"],
+                })
+        order = {"open": 0, "degraded": 1, "healthy": 2}
+        return sorted(rows, key=lambda row: order[row["status"]])
+
+    def print_summary(self, keys: Optional[List[str]] = None) -> None:
+        rows = self.summary(keys)
+        if not rows:
+            return
+        counts = {status: sum(1 for row in rows if row["status"] == status)
+                  for status in ("healthy", "degraded", "open")}
+        print(f"[Health] {len(rows)} 个数据源: {counts['healthy']} 正常, "
+              f"{counts['degraded']} 异常, {counts['open']} 熔断")
+        for row in rows:
+            if row["status"] == "healthy":
+                continue
+            last_success = (time.strftime("%m-%d %H:%M", time.localtime(row["last_success"]))
+                            if row["last_success"] else "从未")
+            print(f"[Health]   {row['source']}: {row['status']}, 连续失败 {row['error_streak']} 次, "
+                  f"最近成功 {last_success}, 错误: {row['last_error']}")
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """跨进程排他锁"""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """最近秩百分位数"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
@@ -18,7 +18,8 @@ class RedditCollector(BaseCollector):
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.base_url = "https://www.reddit.com"
+        # API 地址可配置（压测时指向本地模拟服务）
+        self.base_url = config.get('base_url', 'https://www.reddit.com').rstrip('/')
 
     def collect(self) -> List[HotspotItem]:
         if not self.is_enabled():
@@ -35,14 +36,17 @@ class RedditCollector(BaseCollector):
 
         return items
 
+    def work_units(self) -> List[Dict[str, Any]]:
+        """每个 subreddit 一个单元"""
+        return [{'subreddits': [subreddit]} for subreddit in self.config.get('subreddits', ['artificial'])]
+
     def _fetch_subreddit(self, subreddit: str, min_score: int, hours: int) -> List[HotspotItem]:
         """获取单个 subreddit 的热门帖子"""
         try:
             url = f"{self.base_url}/r/{subreddit}/hot.json"
             headers = {"User-Agent": "HotspotAggregator/1.0"}
 
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
+            response = self._get(f"reddit:r/{subreddit}", url, timeout=30, headers=headers)
             data = response.json()
 
             items = []
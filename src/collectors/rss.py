@@ -1,20 +1,35 @@
 """
 RSS 采集器
 """
-import socket
-from typing import Any, Dict, List
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
 import feedparser
 
+from src.tracing import span
 from .base import BaseCollector, HotspotItem
+from .feed_parse import parse_feed
 
 
 class RSSCollector(BaseCollector):
-    """RSS 源采集器"""
+    """RSS 源采集器
+
+    两阶段：先用线程池并发下载全部订阅源的原始字节，再在进程池中并行解析
+    （feedparser 是纯 Python 实现，解析受 GIL 限制）；子进程只返回轻量字段
+    """
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        # 设置默认超时
+        # 单个源的请求超时
         self.timeout = config.get('timeout', 15)
+        self.fetch_workers = config.get('fetch_workers', 8)  # 并发下载数
+        # 解析进程数，0 表示在当前进程解析；订阅源少于 parse_pool_min 时也在当前进程解析
+        self.parse_workers = config.get('parse_workers', os.cpu_count() or 1)
+        self.parse_pool_min = config.get('parse_pool_min', 8)
+        self.fast_parse = config.get('fast_parse', True)  # 增量解析快速路径，失败时回退 feedparser
+        self.max_age_hours = config.get('max_age_hours', 0)  # 跳过早于该时限的条目，0 表示不限
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
 
     @property
     def name(self) -> str:
@@ -24,50 +39,102 @@ class RSSCollector(BaseCollector):
         if not self.is_enabled():
             return []
 
-        # 设置全局超时
-        old_timeout = socket.getdefaulttimeout()
-        socket.setdefaulttimeout(self.timeout)
-
-        try:
-            items = []
-            feeds = self.config.get('feeds', [])
+        feeds = self.config.get('feeds', [])
+        with span("rss:fetch", category="collect", feeds=len(feeds)):
+            fetched = self._fetch_all(feeds)
+        with span("rss:parse", category="collect", feeds=len(fetched)) as s:
+            items = self._parse_all(fetched)
+            s.set(items=len(items))
+        return items
 
-            for feed_config in feeds:
-                feed_items = self._collect_feed(feed_config)
-                items.extend(feed_items)
+    def work_units(self) -> List[Dict[str, Any]]:
+        """每 feeds_per_unit 个订阅源一个单元，单元内在当前进程解析（并行由多个 worker 提供）"""
+        feeds = self.config.get('feeds', [])
+        size = max(1, self.config.get('feeds_per_unit', 10))
+        return [{'feeds': feeds[i:i + size], 'parse_workers': 0} for i in range(0, len(feeds), size)]
 
-            return items
-        finally:
-            socket.setdefaulttimeout(old_timeout)
+    def _fetch_all(self, feeds: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], bytes]]:
+        """并发下载，返回 [(订阅源配置, 内容)]（保持配置顺序，失败的源跳过）"""
+        if not feeds:
+            return []
+        workers = max(1, min(self.fetch_workers, len(feeds)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rss-fetch") as pool:
+            contents = list(pool.map(self._fetch_feed, feeds))
+        return [(feed, content) for feed, content in zip(feeds, contents) if content is not None]
 
-    def _collect_feed(self, feed_config: Dict[str, Any]) -> List[HotspotItem]:
-        """采集单个 RSS 源"""
+    def _fetch_feed(self, feed_config: Dict[str, Any]) -> Optional[bytes]:
+        """下载单个订阅源"""
         url = feed_config.get('url', '')
         name = feed_config.get('name', 'Unknown')
-        category = feed_config.get('category', 'RSS')
+        with span(f"fetch:{name}", category="collect") as s:
+            try:
+                response = self._get(f"rss:{name}", url, self.timeout,
+                                     headers={"User-Agent": feedparser.USER_AGENT})
+                s.set(bytes=len(response.content))
+                return response.content
+            except Exception as e:
+                print(f"[RSS] 采集 {name} 失败: {e}")
+                return None
 
-        try:
-            feed = feedparser.parse(url)
-            items = []
-
-            max_per_feed = self.config.get('max_per_feed', 20)
-            for entry in feed.entries[:max_per_feed]:
-                date_str = entry.get('published') or entry.get('updated')
-                published = self._parse_date(date_str)
-                item = HotspotItem(
-                    title=entry.get('title', ''),
-                    url=entry.get('link', ''),
-                    source=name,
-                    category=category,
-                    published_at=published,
-                    extra={
-                        'author': entry.get('author', ''),
-                        'tags': [t.term for t in entry.get('tags', [])]
-                    }
-                )
-                items.append(item)
-
-            return items
-        except Exception as e:
-            print(f"[RSS] 采集 {name} 失败: {e}")
-            return []
+    def _parse_all(self, fetched: List[Tuple[Dict[str, Any], bytes]]) -> List[HotspotItem]:
+        """解析全部订阅源，订阅源足够多时使用进程池"""
+        max_per_feed = self.config.get('max_per_feed', 20)
+        pool = self._get_parse_pool() if len(fetched) >= self.parse_pool_min else None
+        if pool is not None:
+            futures = [pool.submit(parse_feed, content, max_per_feed, self.fast_parse, self.max_age_hours)
+                       for _, content in fetched]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(e)
+        else:
+            results = []
+            for _, content in fetched:
+                try:
+                    results.append(parse_feed(content, max_per_feed, self.fast_parse, self.max_age_hours))
+                except Exception as e:
+                    results.append(e)
+
+        items = []
+        for (feed_config, _), entries in zip(fetched, results):
+            if isinstance(entries, Exception):
+                print(f"[RSS] 解析 {feed_config.get('name', 'Unknown')} 失败: {entries}")
+                continue
+            items.extend(self._build_items(feed_config, entries))
+        return items
+
+    def close(self) -> None:
+        """关闭解析进程池和 HTTP 会话"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True, cancel_futures=True)
+            self._parse_pool = None
+        super().close()
+
+    def _get_parse_pool(self) -> Optional[Executor]:
+        """解析进程池（首次使用时创建，常驻模式下复用）"""
+        if self.parse_workers <= 0:
+            return None
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self._parse_pool
+
+    def _build_items(self, feed_config: Dict[str, Any], entries: List[Dict[str, Any]]) -> List[HotspotItem]:
+        """解析结果转为 HotspotItem"""
+        name = feed_config.get('name', 'Unknown')
+        category = feed_config.get('category', 'RSS')
+        return [
+            HotspotItem(
+                title=entry['title'],
+                url=entry['link'],
+                source=name,
+                category=category,
+                published_at=self._parse_date(entry['date']),
+                extra={
+                    'author': entry['author'],
+                    'tags': entry['tags']
+                }
+            )
+            for entry in entries
+        ]
@@ -19,7 +19,9 @@ class TwitterCollector(BaseCollector):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.api_key = os.environ.get('TWITTER_API_KEY', '')
-        self.base_url = "https://api.twitterapi.io/twitter/tweet/advanced_search"
+        # API 地址可配置（压测时指向本地模拟服务）
+        base_url = config.get('base_url', 'https://api.twitterapi.io').rstrip('/')
+        self.base_url = f"{base_url}/twitter/tweet/advanced_search"
 
     def collect(self) -> List[HotspotItem]:
         if not self.is_enabled():
@@ -42,6 +44,10 @@ class TwitterCollector(BaseCollector):
 
         return items
 
+    def work_units(self) -> List[Dict[str, Any]]:
+        """每个查询一个单元"""
+        return [{'queries': [query]} for query in self.config.get('queries', ['AI'])]
+
     def _search(self, query: str, max_results: int) -> List[HotspotItem]:
         """搜索推文"""
         try:
@@ -51,13 +57,13 @@ class TwitterCollector(BaseCollector):
                 "queryType": "Top"
             }
 
-            response = requests.get(
+            response = self._get(
+                f"twitter:{query}",
                 self.base_url,
+                timeout=30,
                 headers=headers,
-                params=params,
-                timeout=30
+                params=params
             )
-            response.raise_for_status()
             data = response.json()
 
             items = []
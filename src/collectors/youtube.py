@@ -20,8 +20,10 @@ class YouTubeCollector(BaseCollector):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.api_key = os.environ.get('YOUTUBE_API_KEY', '')
-        self.search_url = "https://www.googleapis.com/youtube/v3/search"
-        self.videos_url = "https://www.googleapis.com/youtube/v3/videos"
+        # API 地址可配置（压测时指向本地模拟服务）
+        base_url = config.get('base_url', 'https://www.googleapis.com/youtube/v3').rstrip('/')
+        self.search_url = f"{base_url}/search"
+        self.videos_url = f"{base_url}/videos"
 
     def collect(self) -> List[HotspotItem]:
         if not self.is_enabled():
@@ -44,6 +46,10 @@ class YouTubeCollector(BaseCollector):
 
         return items
 
+    def work_units(self) -> List[Dict[str, Any]]:
+        """每个查询一个单元"""
+        return [{'queries': [query]} for query in self.config.get('queries', ['AI'])]
+
     def _search(self, query: str, max_results: int) -> List[HotspotItem]:
         """搜索视频"""
         try:
@@ -61,8 +67,7 @@ class YouTubeCollector(BaseCollector):
                 "key": self.api_key
             }
 
-            response = requests.get(self.search_url, params=params, timeout=30)
-            response.raise_for_status()
+            response = self._get(f"youtube:{query}", self.search_url, timeout=30, params=params)
             data = response.json()
 
             # 获取视频ID列表
@@ -106,8 +111,7 @@ class YouTubeCollector(BaseCollector):
                 "id": ",".join(video_ids),
                 "key": self.api_key
             }
-            response = requests.get(self.videos_url, params=params, timeout=30)
-            response.raise_for_status()
+            response = self._get("youtube:videos", self.videos_url, timeout=30, params=params)
             data = response.json()
 
             stats = {}
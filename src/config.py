@@ -40,11 +40,54 @@ class Config:
         """获取 AI 配置"""
         return self._config.get('ai', {})
 
+    @property
+    def ranking(self) -> Dict[str, Any]:
+        """获取本地热度排序配置"""
+        return self._config.get('ranking', {})
+
+    @property
+    def trending(self) -> Dict[str, Any]:
+        """获取上升趋势（跨运行互动增长速度）配置"""
+        return self._config.get('trending', {})
+
+    @property
+    def clustering(self) -> Dict[str, Any]:
+        """获取话题聚类配置"""
+        return self._config.get('clustering', {})
+
+    @property
+    def keywords(self) -> Dict[str, Any]:
+        """获取关键词提取配置"""
+        return self._config.get('keywords', {})
+
     @property
     def output(self) -> Dict[str, Any]:
         """获取输出配置"""
         return self._config.get('output', {})
 
+    @property
+    def health(self) -> Dict[str, Any]:
+        """获取数据源健康记录（自适应超时、熔断）配置"""
+        return self._config.get('health', {})
+
+    @property
+    def distributed(self) -> Dict[str, Any]:
+        """获取分布式采集（任务队列、租约、worker）配置"""
+        return self._config.get('distributed', {})
+
+    @property
+    def daemon(self) -> Dict[str, Any]:
+        """获取常驻模式配置"""
+        return self._config.get('daemon', {})
+
+    @property
+    def state_dir(self) -> Path:
+        """获取运行状态目录（跨运行持久化的数据），相对路径基于项目根目录"""
+        path = Path(self._config.get('state_dir', 'data'))
+        if not path.is_absolute():
+            path = Path(__file__).parent.parent / path
+        return path
+
     def is_source_enabled(self, source_name: str) -> bool:
         """检查数据源是否启用"""
         source = self.sources.get(source_name, {})
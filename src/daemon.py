@@ -0,0 +1,183 @@
+"""
+常驻模式 - 各数据源按自己的间隔刷新，有新条目时才重新生成报告
+
+进程常驻期间复用流水线组件（HTTP 连接池、文档频率表、模板缓存）和已翻译的
+条目；配置文件修改后自动重新加载
+"""
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.config import Config
+from src.collectors.base import BaseCollector, HotspotItem
+from src.pipeline import Pipeline
+from src.tracing import span, tracer
+
+
+class Daemon:
+    """常驻调度器
+
+    配置:
+        sources.<名称>.interval_minutes   该数据源的刷新间隔，缺省取 daemon.default_interval_minutes
+        daemon.poll_seconds               检查配置变更和到期数据源的最长间隔
+        daemon.stale_hours                数据源刷新失败或返回空时保留上一轮条目的时限（从最近一次
+                                          成功刷新算起）
+    """
+
+    def __init__(self, config_path: Optional[str] = None, mode: Optional[str] = None, force: bool = False):
+        self.mode_override = mode
+        self.force = force
+        self.config = Config(config_path)
+        self.config_mtime = self._config_mtime()
+        self.pipeline = Pipeline(self.config, self.mode)
+        self.pool: Dict[str, List[HotspotItem]] = {}  # 数据源名称 -> 最近一次采集结果
+        self.next_due: Dict[str, float] = {}  # 数据源名称 -> 下次刷新时间 (monotonic)
+        self.refreshed_at: Dict[str, float] = {}  # 数据源名称 -> 最近一次成功刷新时间 (monotonic)
+        self.dirty = False  # 是否有新条目待生成
+        self._stop = threading.Event()
+
+    @property
+    def mode(self) -> str:
+        return self.mode_override or self.config.mode
+
+    def run(self) -> int:
+        """主循环，收到 SIGINT/SIGTERM 后在当前轮次结束时退出"""
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        print(f"[Daemon] 启动，运行模式: {self.mode}")
+        for collector in self._enabled_collectors():
+            print(f"[Daemon] {collector.name}: 每 {self._interval(collector) / 60:g} 分钟刷新")
+
+        while not self._stop.is_set():
+            try:
+                self._reload_if_changed()
+                self.tick()
+            except Exception as e:  # 任何未预料的错误都不终止常驻进程，下一轮重试
+                print(f"[Daemon] 本轮出错，{self._sleep_seconds():.0f} 秒后继续: {type(e).__name__}: {e}")
+            tracer.flush(self.config.state_dir / "profile")  # --profile 时写出本轮时间线，缓冲不随运行时长增长
+            self._stop.wait(self._sleep_seconds())
+        self.pipeline.close()
+        print("[Daemon] 已停止")
+        return 0
+
+    def stop(self, signum=None, frame=None):
+        self._stop.set()
+
+    def tick(self, now: Optional[float] = None):
+        """刷新所有到期的数据源，有新条目时重新生成报告
+
+        单个数据源采集出错时跳过该数据源（保留上一轮条目，按间隔下次再刷新）；生成出错时
+        保留待生成标记，下一轮重试
+        """
+        now = time.monotonic() if now is None else now
+        refreshed = False
+        for collector in self._enabled_collectors():
+            if self.next_due.get(collector.name, 0.0) > now:
+                continue
+            self.next_due[collector.name] = now + self._interval(collector)
+            try:
+                self._refresh(collector, now)
+            except Exception as e:
+                print(f"[Daemon] {collector.name} 采集出错，保留上一轮条目: {type(e).__name__}: {e}")
+            refreshed = True
+            if self._stop.is_set():
+                return
+        if refreshed:
+            self.pipeline.health.print_summary()
+
+        if self.dirty:
+            all_items = [item for items in self.pool.values() for item in items]
+            try:
+                with span("daemon:generate", category="main", items=len(all_items)):
+                    output_path, changed = self.pipeline.run(all_items, force=self.force)
+            except Exception as e:
+                print(f"[Daemon] 生成报告出错，下一轮重试: {type(e).__name__}: {e}")
+                return
+            self.dirty = False
+            print(f"[Daemon] 报告{'已更新' if changed else '内容未变化'}: {output_path}")
+
+    def _refresh(self, collector: BaseCollector, now: float):
+        """采集一个数据源并并入条目池；沿用上一轮的翻译和摘要
+
+        有请求失败或结果为空（超时、熔断）时保留上一轮未再出现的条目，超过 stale_hours
+        未成功刷新后才丢弃
+        """
+        items = self.pipeline.collect_from(collector)
+        if collector.failures or not items:
+            items = self._keep_previous(collector.name, items, now)
+        if items and (not collector.failures or collector.name not in self.refreshed_at):
+            self.refreshed_at[collector.name] = now
+        previous = {item.url: item for item in self.pool.get(collector.name, [])}
+        new_count = 0
+        for item in items:
+            old = previous.get(item.url)
+            if old is None:
+                new_count += 1
+            elif old.translated_title:
+                item.translated_title = old.translated_title
+                item.summary = old.summary
+        self.pool[collector.name] = items
+        if new_count:
+            self.dirty = True
+            print(f"[Daemon] {collector.name} 新增 {new_count} 条")
+
+    def _keep_previous(self, name: str, items: List[HotspotItem], now: float) -> List[HotspotItem]:
+        """刷新失败时并入上一轮的条目（已过期则丢弃）"""
+        previous = self.pool.get(name, [])
+        if not previous:
+            return items
+        stale_seconds = float(self.config.daemon.get('stale_hours', 24)) * 3600
+        if now - self.refreshed_at[name] > stale_seconds:
+            print(f"[Daemon] {name} 超过 {stale_seconds / 3600:g} 小时未成功刷新，丢弃上一轮的 {len(previous)} 条")
+            self.dirty = True
+            return items
+        urls = {item.url for item in items}
+        kept = [item for item in previous if item.url not in urls]
+        if kept:
+            print(f"[Daemon] {name} 刷新失败或无结果，保留上一轮的 {len(kept)} 条")
+        return items + kept
+
+    def _reload_if_changed(self):
+        """配置文件修改后重新加载并重建流水线（条目池保留）"""
+        mtime = self._config_mtime()
+        if mtime == self.config_mtime:
+            return
+        self.config_mtime = mtime
+        try:
+            config = Config(self.config.config_path)
+        except Exception as e:
+            print(f"[Daemon] 配置重新加载失败，继续使用旧配置: {e}")
+            return
+        self.config = config
+        previous, self.pipeline = self.pipeline, Pipeline(config, self.mode)
+        previous.close()  # 关闭旧采集器的解析进程池和连接池
+        enabled = {collector.name for collector in self._enabled_collectors()}
+        for name in list(self.pool):
+            if name not in enabled:
+                del self.pool[name]
+                self.refreshed_at.pop(name, None)
+        # 间隔可能已修改，全部数据源在下一轮重新采集；输出配置也可能变化
+        self.next_due.clear()
+        self.dirty = True
+        print(f"[Daemon] 配置已重新加载: {config.config_path}")
+
+    def _enabled_collectors(self) -> List[BaseCollector]:
+        return [collector for collector in self.pipeline.collectors if collector.is_enabled()]
+
+    def _interval(self, collector: BaseCollector) -> float:
+        minutes = collector.config.get('interval_minutes', self.config.daemon.get('default_interval_minutes', 60))
+        return max(float(minutes), 0.1) * 60
+
+    def _sleep_seconds(self) -> float:
+        poll = float(self.config.daemon.get('poll_seconds', 30))
+        if not self.next_due:
+            return poll
+        return max(0.0, min(poll, min(self.next_due.values()) - time.monotonic()))
+
+    def _config_mtime(self) -> float:
+        try:
+            return Path(self.config.config_path).stat().st_mtime
+        except OSError:
+            return 0.0
@@ -0,0 +1,356 @@
+"""
+分布式采集 - 协调者把数据源拆分为工作单元写入任务队列，多个 worker 进程按租约领取执行
+
+    python src/main.py --workers 4      协调者：拆分数据源，启动 4 个本地 worker，等待全部单元完成后
+                                        合并结果，继续分析、AI 处理和生成
+    python src/main.py --workers 0      协调者：不启动本地 worker，只等待其他主机的 worker
+    python src/main.py --worker         worker：领取任意运行的单元，空闲 worker_idle_seconds 后退出
+
+任务队列是 SQLite 数据库 (distributed.queue_path，缺省 <state_dir>/queue.db)。多台主机
+共用时放在支持文件锁的共享存储上，并关闭 WAL (distributed.wal: false)。
+
+工作单元由采集器的 work_units() 给出（RSS 每 feeds_per_unit 个订阅源、Twitter/YouTube
+每个查询、Reddit 每个 subreddit），单元中保存采集器类路径和完整配置，worker 不依赖本机
+的数据源配置。worker 领取单元时获得 lease_seconds 的租约，进程崩溃或超时未完成的单元在
+租约过期后由其他 worker 重新领取；执行失败的单元重新排队，最多尝试 max_attempts 次。
+"""
+import gzip
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.config import Config
+from src.collectors.base import BaseCollector, HotspotItem
+from src.collectors.health import SourceHealth
+from src.generators.serialize import dumps
+from src.registry import load_class
+from src.tracing import span
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    label TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result BLOB,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS units_status ON units (status, run_id);
+"""
+
+
+class WorkQueue:
+    """基于 SQLite 的持久化任务队列，领取和提交都在 IMMEDIATE 事务中完成，可供多个进程并发访问"""
+
+    def __init__(self, path: Path, lease_seconds: float = 300, max_attempts: int = 3, wal: bool = True):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        if wal:
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    @classmethod
+    def from_config(cls, config: Config) -> "WorkQueue":
+        settings = config.distributed
+        path = Path(settings.get('queue_path') or config.state_dir / "queue.db")
+        if not path.is_absolute():
+            path = PROJECT_ROOT / path
+        return cls(path, settings.get('lease_seconds', 300), settings.get('max_attempts', 3),
+                   settings.get('wal', True))
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """写事务（开始时即获取写锁，避免两个 worker 读到同一个待领取单元）"""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._db
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def close(self):
+        self._db.close()
+
+    # ---------------------------------------------------------------- 协调者
+
+    def create_run(self, units: List[Tuple[str, Dict[str, Any]]], purge_days: float = 7) -> str:
+        """写入一次运行的全部单元 [(标签, 内容)]，返回运行 ID；同时删除 purge_days 天前的运行"""
+        now = time.time()
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        with self._transaction() as db:
+            db.execute("DELETE FROM units WHERE created < ?", (now - purge_days * 86400,))
+            db.executemany(
+                "INSERT INTO units (run_id, label, payload, created, updated) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, label, json.dumps(payload, ensure_ascii=False), now, now) for label, payload in units])
+        return run_id
+
+    def progress(self, run_id: str) -> Dict[str, int]:
+        """各状态的单元数"""
+        rows = self._db.execute("SELECT status, COUNT(*) FROM units WHERE run_id = ? GROUP BY status", (run_id,))
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def active(self, run_id: str) -> bool:
+        """是否还有未结束（待领取或执行中）的单元"""
+        progress = self.progress(run_id)
+        return progress[PENDING] + progress[LEASED] > 0
+
+    def cancel(self, run_id: str, reason: str) -> int:
+        """把未结束的单元标记为失败（协调者超时），返回取消的单元数"""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE units SET status = ?, error = ?, lease_owner = NULL, updated = ? "
+                "WHERE run_id = ? AND status IN (?, ?)", (FAILED, reason, time.time(), run_id, PENDING, LEASED))
+        return cursor.rowcount
+
+    def results(self, run_id: str) -> Tuple[List[HotspotItem], List[str], List[Dict[str, Any]]]:
+        """按单元顺序合并结果，返回 (条目, 各单元请求过的数据源健康记录 key, 失败单元)"""
+        items, keys, failed = [], [], []
+        rows = self._db.execute("SELECT id, label, status, attempts, result, error FROM units "
+                                "WHERE run_id = ? ORDER BY id", (run_id,))
+        for row in rows:
+            if row["status"] != DONE:
+                failed.append({"id": row["id"], "label": row["label"], "attempts": row["attempts"],
+                               "error": row["error"]})
+                continue
+            result = json.loads(gzip.decompress(row["result"]))
+            items.extend(HotspotItem.from_dict(item) for item in result["items"])
+            keys.extend(result["sources"])
+        return items, keys, failed
+
+    # ---------------------------------------------------------------- worker
+
+    def claim(self, worker_id: str, run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """领取一个待执行或租约已过期的单元，没有可领取的单元时返回 None"""
+        now = time.time()
+        with self._transaction() as db:
+            while True:
+                row = db.execute(
+                    "SELECT id, run_id, label, payload, attempts FROM units "
+                    "WHERE (status = ? OR (status = ? AND lease_expires < ?)) AND (? IS NULL OR run_id = ?) "
+                    "ORDER BY id LIMIT 1", (PENDING, LEASED, now, run_id, run_id)).fetchone()
+                if row is None:
+                    return None
+                if row["attempts"] >= self.max_attempts:
+                    # 最后一次尝试的租约过期（worker 崩溃或卡住）
+                    db.execute("UPDATE units SET status = ?, error = ?, lease_owner = NULL, updated = ? "
+                               "WHERE id = ?", (FAILED, "租约过期", now, row["id"]))
+                    continue
+                db.execute("UPDATE units SET status = ?, lease_owner = ?, lease_expires = ?, "
+                           "attempts = attempts + 1, updated = ? WHERE id = ?",
+                           (LEASED, worker_id, now + self.lease_seconds, now, row["id"]))
+                return {"id": row["id"], "run_id": row["run_id"], "label": row["label"],
+                        "payload": json.loads(row["payload"]), "attempt": row["attempts"] + 1}
+
+    def complete(self, unit_id: int, worker_id: str, items: List[HotspotItem], keys: List[str],
+                 error: Optional[str] = None) -> bool:
+        """提交结果（error 记录部分数据源的失败）；租约已被其他 worker 接管时返回 False"""
+        result = gzip.compress(dumps({"items": [item.to_dict() for item in items], "sources": keys}),
+                               compresslevel=6)
+        with self._transaction() as db:
+            cursor = db.execute("UPDATE units SET status = ?, result = ?, error = ?, lease_owner = NULL, updated = ? "
+                                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                                (DONE, result, error and error[:500], time.time(), unit_id, LEASED, worker_id))
+        return cursor.rowcount == 1
+
+    def fail(self, unit_id: int, worker_id: str, error: str) -> str:
+        """执行失败: 未达到最大尝试次数时重新排队，返回单元的新状态"""
+        with self._transaction() as db:
+            row = db.execute("SELECT attempts FROM units WHERE id = ? AND status = ? AND lease_owner = ?",
+                             (unit_id, LEASED, worker_id)).fetchone()
+            if row is None:
+                return ""  # 租约已被其他 worker 接管
+            status = PENDING if row["attempts"] < self.max_attempts else FAILED
+            db.execute("UPDATE units SET status = ?, error = ?, lease_owner = NULL, updated = ? WHERE id = ?",
+                       (status, error[:500], time.time(), unit_id))
+        return status
+
+
+class Coordinator:
+    """拆分数据源、启动本地 worker、等待并合并结果
+
+    配置 (distributed):
+        timeout_minutes       等待全部单元完成的最长时间，超时后取消剩余单元，只合并已完成的结果
+        poll_seconds          检查进度的间隔
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.settings = config.distributed
+        self.queue = WorkQueue.from_config(config)
+        self.poll_seconds = self.settings.get('poll_seconds', 1)
+        self.timeout = self.settings.get('timeout_minutes', 30) * 60
+
+    def plan(self, collectors: List[BaseCollector]) -> List[Tuple[str, Dict[str, Any]]]:
+        """各采集器的工作单元 [(标签, {"class": 类路径, "config": 单元配置})]"""
+        units = []
+        for collector in collectors:
+            if not collector.is_enabled():
+                continue
+            cls = type(collector)
+            for unit in collector.work_units():
+                units.append((collector.name, {"class": f"{cls.__module__}:{cls.__name__}",
+                                               "config": {**collector.config, **unit}}))
+        return units
+
+    def collect(self, collectors: List[BaseCollector], workers: int,
+                health: Optional[SourceHealth] = None) -> List[HotspotItem]:
+        """分发采集并等待完成，返回合并后的条目（顺序与单进程采集一致）"""
+        units = self.plan(collectors)
+        run_id = self.queue.create_run(units)
+        print(f"[Distributed] 运行 {run_id}: {len(units)} 个工作单元，队列 {self.queue.path}")
+        if workers:
+            print(f"[Distributed] 启动 {workers} 个本地 worker")
+        else:
+            print(f"[Distributed] 等待其他主机的 worker (python src/main.py --worker)")
+
+        with span("collect:distributed", category="collect", units=len(units), workers=workers) as s:
+            processes = [self._spawn(run_id) for _ in range(workers)]
+            respawns = workers * self.queue.max_attempts  # 本地 worker 全部退出但仍有单元时的补充上限
+            deadline = time.monotonic() + self.timeout
+            last_report = 0.0
+            try:
+                while self.queue.active(run_id):
+                    if time.monotonic() > deadline:
+                        cancelled = self.queue.cancel(run_id, "协调者等待超时")
+                        print(f"[Distributed] 等待超时，取消 {cancelled} 个未完成的单元")
+                        break
+                    if processes and all(p.poll() is not None for p in processes) and respawns > 0:
+                        # worker 空闲退出后才有单元因租约过期重新排队
+                        processes = [p for p in processes if p.poll() is None] + [self._spawn(run_id)]
+                        respawns -= 1
+                    if time.monotonic() - last_report >= 10:
+                        self._report(run_id)
+                        last_report = time.monotonic()
+                    time.sleep(self.poll_seconds)
+            finally:
+                for process in processes:
+                    try:
+                        process.wait(timeout=self.poll_seconds * 5 + 5)
+                    except subprocess.TimeoutExpired:
+                        process.terminate()
+
+            items, keys, failed = self.queue.results(run_id)
+            s.set(items=len(items), failed=len(failed))
+
+        self._report(run_id)
+        for unit in failed:
+            print(f"[Distributed]   失败: #{unit['id']} {unit['label']} (尝试 {unit['attempts']} 次): {unit['error']}")
+        if health is not None:
+            health.merge(keys)
+            health.print_summary()
+        print(f"[Main] 共采集 {len(items)} 条数据")
+        return items
+
+    def _spawn(self, run_id: str) -> subprocess.Popen:
+        """启动只处理 run_id 的本地 worker 进程"""
+        command = [sys.executable, "-m", "src.main", "--worker", "--run-id", run_id,
+                   "--config", str(self.config.config_path)]
+        return subprocess.Popen(command, cwd=str(PROJECT_ROOT))
+
+    def _report(self, run_id: str):
+        progress = self.queue.progress(run_id)
+        total = sum(progress.values())
+        print(f"[Distributed] 进度 {progress[DONE]}/{total}: 执行中 {progress[LEASED]}, "
+              f"待领取 {progress[PENDING]}, 失败 {progress[FAILED]}")
+
+
+class Worker:
+    """领取并执行工作单元，结果写回队列
+
+    配置 (distributed):
+        worker_idle_seconds   连续该时长没有可领取的单元后退出；0 表示一直运行（独立部署的 worker）
+        poll_seconds          没有可领取单元时的检查间隔
+    """
+
+    def __init__(self, config: Config, run_id: Optional[str] = None):
+        self.config = config
+        self.run_id = run_id  # 只处理该运行的单元（协调者启动的本地 worker），运行结束后立即退出
+        settings = config.distributed
+        self.queue = WorkQueue.from_config(config)
+        self.idle_seconds = settings.get('worker_idle_seconds', 60)
+        self.poll_seconds = settings.get('poll_seconds', 1)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.health = SourceHealth(config.health, config.state_dir)
+
+    def run(self) -> int:
+        """处理单元直到空闲超时（或指定的运行结束），返回进程退出码"""
+        print(f"[Worker] {self.worker_id} 启动，队列 {self.queue.path}")
+        processed = 0
+        idle_since = time.monotonic()
+        while True:
+            unit = self.queue.claim(self.worker_id, self.run_id)
+            if unit is None:
+                if self.run_id and not self.queue.active(self.run_id):
+                    break
+                if self.idle_seconds and time.monotonic() - idle_since > self.idle_seconds:
+                    break
+                time.sleep(self.poll_seconds)
+                continue
+            self.execute(unit)
+            processed += 1
+            idle_since = time.monotonic()
+        print(f"[Worker] {self.worker_id} 退出，共处理 {processed} 个单元")
+        self.queue.close()
+        return 0
+
+    def execute(self, unit: Dict[str, Any]):
+        """运行单元对应的采集器并提交结果
+
+        采集器抛出异常或有数据源请求失败（采集器内部吞掉 RequestException，见 BaseCollector.failures；
+        熔断跳过的数据源不计入）时按尝试次数重新排队；最后一次尝试仍有失败时，已采集到条目则提交
+        部分结果，否则标记失败
+        """
+        payload = unit["payload"]
+        label = f"#{unit['id']} {unit['label']}"
+        self.health.seen.clear()
+        try:
+            collector = load_class(payload["class"])(payload["config"])
+            collector.health = self.health
+            with span(f"unit:{unit['label']}", category="collect") as s:
+                items = collector.collect()
+                s.set(items=len(items))
+            keys = sorted(self.health.seen)
+            self.health.save()
+        except Exception as e:
+            status = self.queue.fail(unit["id"], self.worker_id, f"{type(e).__name__}: {e}")
+            print(f"[Worker] {label} 失败 (第 {unit['attempt']} 次): {e}"
+                  + ("，重新排队" if status == PENDING else ""))
+            return
+        error = "; ".join(f"{key}: {message}" for key, message in sorted(collector.failures.items())) or None
+        if error and (unit["attempt"] < self.queue.max_attempts or not items):
+            status = self.queue.fail(unit["id"], self.worker_id, error)
+            print(f"[Worker] {label} {len(collector.failures)} 个数据源请求失败 (第 {unit['attempt']} 次)"
+                  + ("，重新排队" if status == PENDING else ""))
+            return
+        if self.queue.complete(unit["id"], self.worker_id, items, keys, error):
+            print(f"[Worker] {label} 完成: {len(items)} 条"
+                  + (f"（{len(collector.failures)} 个数据源失败）" if error else ""))
+        else:
+            print(f"[Worker] {label} 已由其他 worker 完成，丢弃结果")
@@ -0,0 +1,168 @@
+"""
+报告归档 - 每次运行写入不可变快照，增量追加索引，定期把旧快照合并为周/月包
+"""
+import json
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from .search_index import SearchIndexBuilder
+from .serialize import write_json
+
+
+class ReportArchive:
+    """docs/archive/ 归档
+
+    目录结构:
+        index.jsonl                     每行一条运行或合并包记录（新运行只追加一行）
+        runs/<日期>/<时分秒>.json        单次运行快照（写入后不再修改）
+        runs/<日期>/<时分秒>.idx.json    该快照的搜索索引分段
+        bundles/<周期>.json              合并后的周/月包，及对应的 .idx.json
+
+    每次运行只写入本次快照和一行索引；合并只在某个完整周期全部超过
+    compact_after_days 后执行一次，生成开销与历史总量无关
+    """
+
+    def __init__(self, config: Dict[str, Any], output_dir: Path):
+        self.config = config
+        self.enabled = config.get('enabled', False)
+        self.compact_after_days = config.get('compact_after_days', 14)
+        self.bundle = config.get('bundle', 'weekly')  # weekly 或 monthly
+        self.archive_dir = Path(output_dir) / "archive"
+        self.index_path = self.archive_dir / "index.jsonl"
+        self.search_builder = SearchIndexBuilder(config)
+
+    def is_enabled(self) -> bool:
+        return self.enabled
+
+    def append(self, cards: List[Dict[str, Any]], now: datetime) -> Dict[str, Any]:
+        """写入本次运行快照并追加索引，返回索引记录"""
+        day = now.strftime("%Y-%m-%d")
+        run_id = now.strftime("%Y%m%d-%H%M%S")
+        rel_path = f"runs/{day}/{now.strftime('%H%M%S')}.json"
+        rel_search = rel_path.replace(".json", ".idx.json")
+
+        snapshot_path = self.archive_dir / rel_path
+        if snapshot_path.exists():
+            raise FileExistsError(f"归档快照已存在: {snapshot_path}")
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_json(snapshot_path, {"run": run_id, "date": now.strftime("%Y-%m-%d %H:%M"), "cards": cards})
+        self.search_builder.write(cards, self.archive_dir / rel_search)
+
+        entry = {
+            "type": "run",
+            "run": run_id,
+            "date": now.strftime("%Y-%m-%d %H:%M"),
+            "day": day,
+            "total": len(cards),
+            "path": rel_path,
+            "search": rel_search,
+        }
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        return entry
+
+    def compact(self, today: date) -> int:
+        """把已完整超过保留期的周期合并为包，返回合并的快照数"""
+        if not self.index_path.exists():
+            return 0
+        cutoff = today - timedelta(days=self.compact_after_days)
+        entries = self._read_index()
+
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            if entry.get("type") != "run":
+                continue
+            period, period_end = self._period(date.fromisoformat(entry["day"]))
+            if period_end < cutoff:
+                groups.setdefault(period, []).append(entry)
+        if not groups:
+            return 0
+
+        compacted = set()
+        bundle_entries = {}
+        for period, runs in groups.items():
+            bundle_entries[period] = self._write_bundle(period, runs)
+            compacted.update(run["run"] for run in runs)
+
+        # 重写索引：去掉已合并的运行记录，合并包记录放在其周期原来的位置
+        new_entries = []
+        for entry in entries:
+            if entry.get("type") == "bundle" and entry["period"] in bundle_entries:
+                continue
+            if entry.get("type") == "run" and entry["run"] in compacted:
+                period = self._period(date.fromisoformat(entry["day"]))[0]
+                if period in bundle_entries:
+                    new_entries.append(bundle_entries.pop(period))
+                continue
+            new_entries.append(entry)
+        new_entries.extend(bundle_entries.values())
+        self._write_index(new_entries)
+
+        for period, runs in groups.items():
+            for run in runs:
+                for rel in (run["path"], run["search"]):
+                    path = self.archive_dir / rel
+                    if path.exists():
+                        path.unlink()
+        print(f"[Archive] 合并 {len(compacted)} 个快照为 {len(groups)} 个{'周' if self.bundle == 'weekly' else '月'}包")
+        return len(compacted)
+
+    def _write_bundle(self, period: str, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """写入合并包（同一周期已有包时合并进去）"""
+        rel_path = f"bundles/{period}.json"
+        rel_search = f"bundles/{period}.idx.json"
+        bundle_path = self.archive_dir / rel_path
+
+        bundle = {"period": period, "runs": []}
+        if bundle_path.exists():
+            bundle = json.loads(bundle_path.read_text(encoding="utf-8"))
+        for run in runs:
+            snapshot = json.loads((self.archive_dir / run["path"]).read_text(encoding="utf-8"))
+            bundle["runs"].append(snapshot)
+        bundle["runs"].sort(key=lambda r: r["run"])
+
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_json(bundle_path, bundle)
+        cards = [card for run in reversed(bundle["runs"]) for card in run["cards"]]
+        self.search_builder.write(cards, self.archive_dir / rel_search)
+
+        return {
+            "type": "bundle",
+            "period": period,
+            "day": min(run["date"][:10] for run in bundle["runs"]),
+            "total": sum(len(run["cards"]) for run in bundle["runs"]),
+            "path": rel_path,
+            "search": rel_search,
+            "runs": [{"run": run["run"], "date": run["date"], "total": len(run["cards"])}
+                     for run in bundle["runs"]],
+        }
+
+    def _period(self, day: date) -> Tuple[str, date]:
+        """返回 (周期名, 周期最后一天)"""
+        if self.bundle == "monthly":
+            next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+            return day.strftime("%Y-%m"), next_month - timedelta(days=1)
+        year, week, weekday = day.isocalendar()
+        return f"{year}-W{week:02d}", day + timedelta(days=7 - weekday)
+
+    def _read_index(self) -> List[Dict[str, Any]]:
+        entries = []
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+        return entries
+
+    def _write_index(self, entries: List[Dict[str, Any]]):
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def _write_json(path: Path, data: Any):
+        write_json(path, data)
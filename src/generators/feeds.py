@@ -0,0 +1,230 @@
+"""
+订阅源生成器 - 输出 RSS 2.0 / Atom / JSON Feed（全部条目 + 按分类）
+"""
+import xml.etree.ElementTree as ET
+import zlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.collectors.base import HotspotItem
+from .serialize import atomic_write_bytes, dumps
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+JSON_FEED_VERSION = "https://jsonfeed.org/version/1.1"
+
+# 格式 -> (文件后缀, MIME 类型)
+FEED_FORMATS = {
+    "rss": (".rss.xml", "application/rss+xml"),
+    "atom": (".atom.xml", "application/atom+xml"),
+    "json": (".json", "application/feed+json"),
+}
+
+
+class FeedGenerator:
+    """docs/feeds/ 订阅源
+
+    目录结构:
+        all.rss.xml / all.atom.xml / all.json           全部分类
+        <分类 slug>.rss.xml / .atom.xml / .json         单个分类
+
+    每个订阅源只保留最新 max_entries 条；更新时间取条目中最新的发布时间
+    而非生成时间，内容不变时输出字节不变且不重写文件，静态托管的
+    ETag / Last-Modified 保持不变，订阅端条件请求直接得到 304
+
+    RSS / Atom / JSON Feed 的频道链接、self 链接和 feed_url 都要求绝对地址，
+    未配置 site_url 时不生成订阅源（进程内只提示一次）
+
+    没有发布时间的条目不输出 pubDate / date_published；Atom 要求每个条目都有
+    updated，取订阅源的更新时间
+    """
+
+    _warned_site_url = False  # 常驻模式每轮都会创建生成器，缺少 site_url 的提示只打印一次
+
+    def __init__(self, config: Dict[str, Any], output_dir: Path):
+        self.config = config
+        self.enabled = config.get('enabled', True)
+        self.formats = [fmt for fmt in config.get('formats', ["rss", "atom", "json"]) if fmt in FEED_FORMATS]
+        self.max_entries = config.get('max_entries', 50)
+        self.per_category = config.get('per_category', True)
+        self.title = config.get('title', "热点信息聚合")
+        self.site_url = config.get('site_url', "").rstrip("/")  # 站点绝对地址，订阅源中的链接基于它
+        self.feed_dir = Path(output_dir) / "feeds"
+        if self.enabled and self.formats and not self.site_url and not FeedGenerator._warned_site_url:
+            FeedGenerator._warned_site_url = True
+            print("[Feeds] 未配置 output.feeds.site_url（订阅源链接必须是绝对地址），跳过订阅源生成")
+
+    def is_enabled(self) -> bool:
+        return self.enabled and bool(self.formats) and bool(self.site_url)
+
+    def links(self, categories: List[str]) -> List[Dict[str, str]]:
+        """页面 <link rel="alternate"> 用的订阅源列表"""
+        links = []
+        for name, slug in self._feeds(categories):
+            for fmt in self.formats:
+                suffix, mime = FEED_FORMATS[fmt]
+                links.append({"title": f"{self.title} - {name} ({fmt})", "path": f"feeds/{slug}{suffix}", "type": mime})
+        return links
+
+    def write(self, items: List[HotspotItem]) -> List[Path]:
+        """写入全部订阅源，返回内容有变化的文件"""
+        self.feed_dir.mkdir(parents=True, exist_ok=True)
+        # 聚类成员已作为相关报道合并到代表条目，不单独输出
+        entries = [item for item in items if 'cluster_of' not in item.extra]
+        entries.sort(key=lambda item: self._timestamp(item) or EPOCH, reverse=True)
+
+        groups: Dict[str, List[HotspotItem]] = {"all": entries[:self.max_entries]}
+        if self.per_category:
+            for item in entries:
+                group = groups.setdefault(self.category_slug(item.category), [])
+                if len(group) < self.max_entries:
+                    group.append(item)
+
+        names = {self.category_slug(item.category): item.category for item in entries}
+        written = []
+        for slug, group in groups.items():
+            name = names.get(slug, "全部")
+            for fmt in self.formats:
+                suffix, _ = FEED_FORMATS[fmt]
+                path = self.feed_dir / f"{slug}{suffix}"
+                data = getattr(self, f"_build_{fmt}")(group, name, f"feeds/{slug}{suffix}")
+                if self._write_if_changed(path, data):
+                    written.append(path)
+
+        # 清理已不存在的分类的订阅源
+        expected = {f"{slug}{FEED_FORMATS[fmt][0]}" for slug in groups for fmt in self.formats}
+        for path in self.feed_dir.iterdir():
+            base = path.name[:-3] if path.name.endswith((".gz", ".br")) else path.name
+            if path.is_file() and base not in expected:
+                path.unlink()
+
+        print(f"[Feeds] {len(groups)} 个订阅源 x {len(self.formats)} 种格式，更新 {len(written)} 个文件")
+        return written
+
+    @staticmethod
+    def category_slug(category: str) -> str:
+        """分类名转为 URL 安全的文件名（与分片目录规则一致）"""
+        return f"c{zlib.crc32(category.encode('utf-8')):08x}"
+
+    def _feeds(self, categories: List[str]):
+        feeds = [("全部", "all")]
+        if self.per_category:
+            feeds.extend((name, self.category_slug(name)) for name in sorted(categories))
+        return feeds
+
+    def _build_rss(self, items: List[HotspotItem], name: str, rel_path: str) -> bytes:
+        rss = ET.Element("rss", {"version": "2.0", "xmlns:atom": ATOM_NS})
+        channel = ET.SubElement(rss, "channel")
+        ET.SubElement(channel, "title").text = self._feed_title(name)
+        ET.SubElement(channel, "link").text = self._url("index.html")
+        ET.SubElement(channel, "description").text = self._feed_title(name)
+        ET.SubElement(channel, "language").text = "zh-CN"
+        updated = self._updated(items)
+        if updated is not None:
+            ET.SubElement(channel, "lastBuildDate").text = format_datetime(updated)
+        ET.SubElement(channel, "atom:link", {"href": self._url(rel_path), "rel": "self",
+                                             "type": FEED_FORMATS["rss"][1]})
+        for item in items:
+            entry = ET.SubElement(channel, "item")
+            ET.SubElement(entry, "title").text = item.translated_title or item.title
+            ET.SubElement(entry, "link").text = item.url
+            ET.SubElement(entry, "guid", {"isPermaLink": "true"}).text = item.url
+            ET.SubElement(entry, "description").text = self._content(item)
+            ET.SubElement(entry, "category").text = item.category
+            published = self._timestamp(item)
+            if published is not None:
+                ET.SubElement(entry, "pubDate").text = format_datetime(published)
+        return self._xml_bytes(rss)
+
+    def _build_atom(self, items: List[HotspotItem], name: str, rel_path: str) -> bytes:
+        feed = ET.Element("feed", {"xmlns": ATOM_NS, "xml:lang": "zh-CN"})
+        ET.SubElement(feed, "title").text = self._feed_title(name)
+        ET.SubElement(feed, "id").text = self._feed_id(rel_path)
+        # Atom 的 updated 为必填项：全部条目都没有时间时取当前时间
+        updated = self._updated(items) or datetime.now(timezone.utc).replace(microsecond=0)
+        ET.SubElement(feed, "updated").text = updated.isoformat()
+        ET.SubElement(feed, "link", {"href": self._url(rel_path), "rel": "self"})
+        ET.SubElement(feed, "link", {"href": self._url("index.html"), "rel": "alternate"})
+        ET.SubElement(ET.SubElement(feed, "author"), "name").text = self.title
+        for item in items:
+            entry = ET.SubElement(feed, "entry")
+            ET.SubElement(entry, "title").text = item.translated_title or item.title
+            ET.SubElement(entry, "id").text = item.url
+            ET.SubElement(entry, "link", {"href": item.url, "rel": "alternate"})
+            ET.SubElement(entry, "updated").text = (self._timestamp(item) or updated).isoformat()
+            ET.SubElement(entry, "category", {"term": item.category})
+            ET.SubElement(entry, "summary").text = self._content(item)
+        return self._xml_bytes(feed)
+
+    def _build_json(self, items: List[HotspotItem], name: str, rel_path: str) -> bytes:
+        entries = []
+        for item in items:
+            entry = {
+                "id": item.url,
+                "url": item.url,
+                "title": item.translated_title or item.title,
+                "content_text": self._content(item),
+            }
+            published = self._timestamp(item)
+            if published is not None:
+                entry["date_published"] = published.isoformat()
+            entry["tags"] = [item.category]
+            entry["_hotspot"] = {"source": item.source, "original_title": item.title}
+            entries.append(entry)
+        feed = {
+            "version": JSON_FEED_VERSION,
+            "title": self._feed_title(name),
+            "home_page_url": self._url("index.html"),
+            "feed_url": self._url(rel_path),
+            "language": "zh-CN",
+            "items": entries,
+        }
+        return dumps(feed)
+
+    def _feed_title(self, name: str) -> str:
+        return self.title if name == "全部" else f"{self.title} - {name}"
+
+    def _feed_id(self, rel_path: str) -> str:
+        return self._url(rel_path)
+
+    def _url(self, rel_path: str) -> str:
+        return f"{self.site_url}/{rel_path}"
+
+    @staticmethod
+    def _content(item: HotspotItem) -> str:
+        """条目正文：摘要，翻译过的条目附原标题"""
+        parts = []
+        if item.translated_title and item.translated_title != item.title:
+            parts.append(f"原标题: {item.title}")
+        if item.summary:
+            parts.append(item.summary)
+        parts.append(f"来源: {item.source}")
+        return "\n".join(parts)
+
+    @staticmethod
+    def _timestamp(item: HotspotItem) -> Optional[datetime]:
+        """条目时间统一为 UTC（无时区的时间按本地时间处理），没有发布时间时返回 None"""
+        if item.published_at is None:
+            return None
+        return item.published_at.astimezone(timezone.utc)
+
+    def _updated(self, items: List[HotspotItem]) -> Optional[datetime]:
+        """订阅源更新时间取最新条目时间，内容不变时保持不变；没有带时间的条目时返回 None"""
+        return max((stamp for stamp in map(self._timestamp, items) if stamp is not None), default=None)
+
+    @staticmethod
+    def _xml_bytes(root: ET.Element) -> bytes:
+        return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+    @staticmethod
+    def _write_if_changed(path: Path, data: bytes) -> bool:
+        """字节相同时不重写，保留文件修改时间"""
+        try:
+            if path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+        atomic_write_bytes(path, data)
+        return True
@@ -1,57 +1,342 @@
 """
 HTML 报告生成器
 """
-import json
+import hashlib
+import os
+import shutil
+import tempfile
+import zlib
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
 from src.collectors.base import HotspotItem
+from src.tracing import span
+from .archive import ReportArchive
+from .feeds import FeedGenerator
+from .search_index import SearchIndexBuilder
+from .serialize import atomic_write_bytes, available_encodings, dumps, write_compressed, write_json
+
+TEMPLATE_DIR = Path(__file__).parent.parent.parent / "templates"
+
+# 模块级共享的 Jinja 环境，避免每次生成都重新编译模板
+_environment: Optional[Environment] = None
+
+
+def get_environment() -> Environment:
+    """获取共享 Jinja 环境：模板按修改时间自动重新加载，编译结果缓存到磁盘供下次进程复用"""
+    global _environment
+    if _environment is None:
+        cache_dir = Path(tempfile.gettempdir()) / "hotspot-jinja-cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _environment = Environment(
+            loader=FileSystemLoader(str(TEMPLATE_DIR)),
+            bytecode_cache=FileSystemBytecodeCache(str(cache_dir)),
+            auto_reload=True
+        )
+    return _environment
 
 
 class HTMLGenerator:
     """HTML 报告生成器"""
 
-    def __init__(self, config: Dict[str, Any]):
+    # 计算内容哈希时忽略的卡片字段（未发布时间的条目 day 取当前日期）
+    VOLATILE_FIELDS = ("day",)
+
+    def __init__(self, config: Dict[str, Any], state_dir: Optional[Path] = None):
         self.config = config
-        self.template_dir = Path(__file__).parent.parent.parent / "templates"
-        self.output_dir = Path(__file__).parent.parent.parent / "docs"
+        self.template_dir = TEMPLATE_DIR
+        # 输出目录，相对路径基于项目根目录
+        self.output_dir = Path(config.get("dir", "docs"))
+        if not self.output_dir.is_absolute():
+            self.output_dir = Path(__file__).parent.parent.parent / self.output_dir
+        self.pretty_json = config.get("pretty_json", False)  # 默认紧凑 JSON
+        self.compress = available_encodings(config.get("compress", ["gz", "br"]))
+        self._outputs: List[Path] = []  # 本次生成的文件，用于预压缩和大小统计
+        self._sizes: Dict[Path, Dict[str, int]] = {}  # 写入时已预压缩的文件（分片）的大小
+        # 上次输出的内容哈希；未指定状态目录时保存在输出目录中
+        self.hash_path = Path(state_dir) / "content_hash.txt" if state_dir else self.output_dir / ".content-hash"
+        self.changed = False  # 本次 generate 是否写入了新内容
+
+    def generate(self, items: List[HotspotItem],
+                 keywords: Optional[List[Tuple[str, float]]] = None,
+                 force: bool = False,
+                 health: Optional[List[Dict[str, Any]]] = None,
+                 rising: Optional[List[Dict[str, Any]]] = None) -> str:
+        """生成 HTML 报告，返回文件路径
 
-    def generate(self, items: List[HotspotItem]) -> str:
-        """生成 HTML 报告，返回文件路径"""
+        health 为数据源健康汇总（SourceHealth.summary()），异常的数据源显示在报告顶部；
+        rising 为上升榜（TrendTracker.rising()），显示在关键词之前
+
+        内容哈希与上次相同时跳过全部写入（force=True 时强制生成），结果见 self.changed
+        """
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._outputs = []
+        self._sizes = {}
+        output_path = self.output_dir / "index.html"
 
         # 准备模板数据
+        now = datetime.now()
         categories = list(set(item.category for item in items))
+        with span("build_cards", category="render", items=len(items)):
+            cards = self._build_cards(items, now)
+
+        unhealthy = [
+            {**row, "last_success": (datetime.fromtimestamp(row["last_success"]).strftime("%m-%d %H:%M")
+                                     if row["last_success"] else "从未")}
+            for row in health or [] if row["status"] != "healthy"
+        ]
+        with span("content_hash", category="render"):
+            content_hash = self.content_hash(cards, keywords, unhealthy, rising)
+        if not force and output_path.exists() and self._load_hash() == content_hash:
+            self.changed = False
+            print(f"[HTML] 内容未变化 ({content_hash[:12]})，跳过写入")
+            return str(output_path)
+        sharded = self.config.get("sharded", False)
+        search = self.config.get("search", True)
+        archive = ReportArchive(self.config.get("archive", {}), self.output_dir)
+        feeds = FeedGenerator(self.config.get("feeds", {}), self.output_dir)
         template_data = {
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "date": now.strftime("%Y-%m-%d %H:%M"),
             "total": len(items),
             "categories": sorted(categories),
-            "items": [self._format_item(item) for item in items]
+            "keywords": [word for word, _ in keywords or []],
+            "sharded": sharded,
+            "search": search,
+            "archive": archive.is_enabled(),
+            "manifest": None,
+            "feeds": feeds.links(categories) if feeds.is_enabled() else [],
+            "health": {"total": len(health or []), "unhealthy": unhealthy},
+            "rising": rising or [],
+            "items": cards
         }
 
-        # 渲染模板
-        env = Environment(loader=FileSystemLoader(str(self.template_dir)))
-        template = env.get_template("report.html")
-        html_content = template.render(**template_data)
+        if sharded:
+            # 分片模式：页面只渲染外壳，条目按分类/日期写入分片按需加载
+            with span("write:shards", category="write", items=len(cards)):
+                template_data["manifest"] = self._write_shards(cards, template_data["date"], len(items))
+            template_data["items"] = []
 
-        # 写入文件
-        output_path = self.output_dir / "index.html"
-        output_path.write_text(html_content, encoding="utf-8")
+        if search:
+            # 预构建倒排索引，页面搜索直接查索引
+            with span("write:search_index", category="write", items=len(cards)):
+                self._outputs.append(
+                    SearchIndexBuilder(self.config).write(cards, self.output_dir / "search" / "index.json")
+                )
+
+        if feeds.is_enabled():
+            # RSS / Atom / JSON Feed，只重写内容变化的文件
+            with span("write:feeds", category="write", items=len(items)):
+                self._outputs.extend(feeds.write(items))
+
+        if archive.is_enabled():
+            # 归档：只追加本次快照，旧快照定期合并
+            with span("write:archive", category="write", items=len(cards)):
+                archive.append(cards, now)
+                archive.compact(now.date())
+            self._render_to_file("archive.html", {"date": template_data["date"]},
+                                 self.output_dir / "archive.html")
+
+        # 流式渲染到临时文件，完成后替换，峰值内存不随条目数增长
+        self._render_to_file("report.html", template_data, output_path)
 
-        # 同时保存 JSON 数据
-        if self.config.get("json", True):
-            self._save_json(items)
+        # 同时保存 JSON 数据（分片模式下由分片替代）
+        if self.config.get("json", True) and not sharded:
+            with span("write:data.json", category="write", items=len(items)):
+                self._save_json(items)
 
+        # 页面已替换，清理另一种模式（及已关闭的 JSON 输出）遗留的文件
+        if sharded or not self.config.get("json", True):
+            self._remove_output(self.output_dir / "data.json")
+        if not sharded:
+            self._remove_output(self.output_dir / "manifest.json")
+            shutil.rmtree(self.output_dir / "shards", ignore_errors=True)
+
+        with span("compress", category="write", files=len(self._outputs)):
+            self._compress_outputs()
+        self._save_hash(content_hash)
+        self.changed = True
         return str(output_path)
 
-    def _format_item(self, item: HotspotItem) -> Dict[str, Any]:
+    def content_hash(self, cards: List[Dict[str, Any]],
+                     keywords: Optional[List[Tuple[str, float]]] = None,
+                     unhealthy: Optional[List[Dict[str, Any]]] = None,
+                     rising: Optional[List[Dict[str, Any]]] = None) -> str:
+        """计算报告内容哈希
+
+        只包含页面展示的内容：卡片（去掉易变字段，按 URL 排序，热度微小变化
+        引起的顺序变动不算变化）、关键词、异常数据源的状态、上升榜条目、模板源文件
+        和输出配置；生成时间、延迟数值和增长率不参与
+        """
+        stable_cards = sorted(
+            ({k: v for k, v in card.items() if k not in self.VOLATILE_FIELDS} for card in cards),
+            key=lambda card: (card["url"], card["title"])
+        )
+        digest = hashlib.sha256()
+        digest.update(dumps({
+            "cards": stable_cards,
+            "keywords": [word for word, _ in keywords or []],
+            "unhealthy": [(row["source"], row["status"]) for row in unhealthy or []],
+            "rising": [row["url"] for row in rising or []],
+            "config": self.config,
+        }, sort_keys=True))
+        for path in sorted(self.template_dir.rglob("*")):
+            if path.is_file():
+                digest.update(path.relative_to(self.template_dir).as_posix().encode("utf-8"))
+                digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    def _load_hash(self) -> str:
+        try:
+            return self.hash_path.read_text(encoding="utf-8").strip()
+        except OSError:
+            return ""
+
+    def _save_hash(self, content_hash: str):
+        self.hash_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.hash_path, content_hash.encode("utf-8"))
+
+    def _compress_outputs(self):
+        """为本次输出生成 .gz/.br 副本并打印大小；删除已关闭的压缩格式的旧副本（避免服务器返回过期内容）"""
+        totals: Dict[str, int] = {}
+        for path in self._outputs:
+            for encoding in ("gz", "br"):
+                if encoding not in self.compress:
+                    path.with_name(f"{path.name}.{encoding}").unlink(missing_ok=True)
+            sizes = self._sizes.get(path)
+            if sizes is None:
+                sizes = write_compressed(path, self.compress) if self.compress else {"raw": path.stat().st_size}
+            for encoding, size in sizes.items():
+                totals[encoding] = totals.get(encoding, 0) + size
+            if path.parent == self.output_dir:
+                print(f"[HTML] {path.name}: {self._format_sizes(sizes)}")
+        if totals:
+            print(f"[HTML] 共 {len(self._outputs)} 个文件: {self._format_sizes(totals)}")
+
+    @staticmethod
+    def _format_sizes(sizes: Dict[str, int]) -> str:
+        return ", ".join(f"{encoding} {size / 1024:.1f}KB" for encoding, size in sizes.items())
+
+    def _render_to_file(self, template_name: str, data: Dict[str, Any], output_path: Path):
+        """流式渲染模板到文件（先写临时文件再原子替换）"""
+        with span(f"render:{output_path.name}", category="render"):
+            template = get_environment().get_template(template_name)
+            fd, tmp_path = tempfile.mkstemp(dir=str(output_path.parent), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    template.stream(**data).dump(f)
+                os.chmod(tmp_path, 0o644)  # mkstemp 默认 0600
+                os.replace(tmp_path, output_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        self._outputs.append(output_path)
+
+    def _write_shards(self, cards: List[Dict[str, Any]], date: str, total: int) -> Dict[str, Any]:
+        """按 分类/日期 写入 JSON 分片和清单 manifest.json，返回清单
+
+        分片（含预压缩副本）先写入同目录下的临时目录，完成后整体替换 shards/，
+        读者和中途崩溃都不会留下缺失或写了一半的分片
+        """
+        shard_dir = self.output_dir / "shards"
+        for stale in self.output_dir.glob(".shards-*"):  # 上次中途崩溃遗留的临时目录
+            shutil.rmtree(stale, ignore_errors=True)
+
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for card in cards:
+            groups.setdefault((card["category"], card["day"]), []).append(card)
+
+        tmp_dir = Path(tempfile.mkdtemp(dir=str(self.output_dir), prefix=".shards-"))
+        categories: Dict[str, Dict[str, Any]] = {}
+        try:
+            os.chmod(tmp_dir, 0o755)  # mkdtemp 默认 0700
+            for (category, day), shard_cards in groups.items():
+                slug = self._category_slug(category)
+                rel_path = f"shards/{slug}/{day}.json"
+                tmp_path = tmp_dir / slug / f"{day}.json"
+                tmp_path.parent.mkdir(exist_ok=True)
+                write_json(tmp_path, shard_cards, self.pretty_json)
+                shard_path = self.output_dir / rel_path
+                self._outputs.append(shard_path)
+                self._sizes[shard_path] = (write_compressed(tmp_path, self.compress) if self.compress
+                                           else {"raw": tmp_path.stat().st_size})
+                entry = categories.setdefault(category, {"name": category, "slug": slug, "total": 0, "shards": []})
+                entry["total"] += len(shard_cards)
+                entry["shards"].append({"day": day, "path": rel_path, "count": len(shard_cards)})
+            self._replace_dir(tmp_dir, shard_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        for entry in categories.values():
+            entry["shards"].sort(key=lambda s: s["day"], reverse=True)
+        manifest = {
+            "date": date,
+            "total": total,
+            "categories": [categories[name] for name in sorted(categories)]
+        }
+        self._outputs.append(write_json(self.output_dir / "manifest.json", manifest, self.pretty_json))
+        return manifest
+
+    @staticmethod
+    def _replace_dir(src: Path, dst: Path):
+        """用 src 替换目录 dst：旧目录先移开再换入新目录（两次 rename），随后删除旧目录"""
+        old = None
+        if dst.exists():
+            old = dst.with_name(f".shards-old-{os.getpid()}")
+            shutil.rmtree(old, ignore_errors=True)
+            os.replace(dst, old)
+        os.replace(src, dst)
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+
+    @staticmethod
+    def _remove_output(path: Path):
+        """删除输出文件及其 .gz/.br 副本"""
+        for suffix in ("", ".gz", ".br"):
+            path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+    @staticmethod
+    def _category_slug(category: str) -> str:
+        """分类名转为 URL 安全的目录名"""
+        return f"c{zlib.crc32(category.encode('utf-8')):08x}"
+
+    def _build_cards(self, items: List[HotspotItem], now: datetime) -> List[Dict[str, Any]]:
+        """构建卡片数据：同一话题的聚类成员合并到代表条目的卡片中"""
+        cards = []
+        cluster_cards = {}
+        members = []
+        for item in items:
+            if 'cluster_of' in item.extra:
+                members.append(item)
+                continue
+            card = self._format_item(item, now)
+            cards.append(card)
+            if 'cluster_id' in item.extra:
+                cluster_cards[item.extra['cluster_id']] = card
+
+        for item in members:
+            card = cluster_cards.get(item.extra.get('cluster_id'))
+            if card is None:
+                # 代表条目不在本次列表中时单独展示
+                cards.append(self._format_item(item, now))
+                continue
+            card["related"].append({
+                "title": item.translated_title or item.title,
+                "url": item.url,
+                "source": item.source
+            })
+        return cards
+
+    def _format_item(self, item: HotspotItem, now: datetime) -> Dict[str, Any]:
         """格式化单条数据"""
         published = ""
+        day = now.strftime("%Y-%m-%d")
         if item.published_at:
             published = item.published_at.strftime("%m-%d %H:%M")
+            day = item.published_at.strftime("%Y-%m-%d")
         return {
             "title": item.title,
             "translated_title": item.translated_title,
@@ -59,14 +344,13 @@ class HTMLGenerator:
             "source": item.source,
             "category": item.category,
             "published_at": published,
-            "summary": item.summary
+            "day": day,
+            "summary": item.summary,
+            "rising": bool(item.extra.get('rising')),
+            "related": []
         }
 
     def _save_json(self, items: List[HotspotItem]):
         """保存 JSON 数据"""
         data = [item.to_dict() for item in items]
-        json_path = self.output_dir / "data.json"
-        json_path.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2),
-            encoding="utf-8"
-        )
+        self._outputs.append(write_json(self.output_dir / "data.json", data, self.pretty_json))
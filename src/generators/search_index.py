@@ -0,0 +1,65 @@
+"""
+搜索索引生成器 - 生成时构建倒排索引，页面端直接查询，无需遍历 DOM
+"""
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.analysis.text import STOPWORDS, tokenize
+from .serialize import write_json
+
+# 索引格式版本，页面端据此判断是否兼容
+INDEX_VERSION = 1
+
+# docs 中每条文档的字段顺序（数组存储，省去重复的键名）
+DOC_FIELDS = ["title", "translated_title", "url", "source", "category", "published_at", "summary"]
+
+
+class SearchIndexBuilder:
+    """倒排索引：词 -> 文档编号列表（升序，差分编码）
+
+    切词规则与 src.analysis.text.tokenize 一致（CJK 二元组 + 英文单词词干），
+    页面端 JS 使用相同规则切分查询
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.summary_chars = config.get("search_summary_chars", 80)  # 结果中保存的摘要长度
+
+    def build(self, cards: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """从卡片数据构建索引"""
+        docs = []
+        postings: Dict[str, List[int]] = {}
+        for doc_id, card in enumerate(cards):
+            doc = [card.get(field) or "" for field in DOC_FIELDS]
+            doc[-1] = doc[-1][:self.summary_chars]
+            docs.append(doc)
+
+            text = " ".join([card.get("title", ""), card.get("translated_title", ""), card.get("summary", "")]
+                            + [rel.get("title", "") for rel in card.get("related", [])])
+            for term in set(tokenize(text)):
+                postings.setdefault(term, []).append(doc_id)
+
+        return {
+            "version": INDEX_VERSION,
+            "fields": DOC_FIELDS,
+            "stopwords": sorted(STOPWORDS),
+            "docs": docs,
+            "terms": {term: self._delta_encode(ids) for term, ids in sorted(postings.items())},
+        }
+
+    def write(self, cards: List[Dict[str, Any]], path: Path) -> Path:
+        """构建并写入索引文件"""
+        index = self.build(cards)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return write_json(path, index)
+
+    @staticmethod
+    def _delta_encode(ids: List[int]) -> List[int]:
+        """升序编号转差分：[3, 5, 9] -> [3, 2, 4]"""
+        deltas = []
+        prev = 0
+        for doc_id in ids:
+            deltas.append(doc_id - prev)
+            prev = doc_id
+        return deltas
@@ -0,0 +1,84 @@
+"""
+输出序列化与预压缩 - 优先使用 orjson，缺失时回退标准库 json
+"""
+import gzip
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Union
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # 可选依赖
+    brotli = None
+
+
+def dumps(data: Any, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    """序列化为 UTF-8 JSON 字节，默认紧凑格式"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2, sort_keys=sort_keys).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys).encode("utf-8")
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> Path:
+    """原子写入：先写同目录临时文件再替换，读者不会看到写了一半的文件"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)  # mkstemp 默认 0600
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def write_json(path: Path, data: Any, pretty: bool = False) -> Path:
+    """原子写入 JSON 文件"""
+    return atomic_write_bytes(path, dumps(data, pretty))
+
+
+def available_encodings(requested: Union[Iterable[str], str, None]) -> list:
+    """过滤出当前环境可用的压缩格式 (gz / br)；false / null / 空列表表示不压缩，也接受单个格式名"""
+    if not requested:
+        return []
+    if isinstance(requested, str):
+        requested = [requested]
+    encodings = []
+    for encoding in requested:
+        if encoding == "gz" or (encoding == "br" and brotli is not None):
+            encodings.append(encoding)
+    return encodings
+
+
+def write_compressed(path: Path, encodings: Iterable[str]) -> Dict[str, int]:
+    """为文件生成 .gz / .br 压缩副本，返回 {"raw": 原始大小, "gz": ..., "br": ...}"""
+    path = Path(path)
+    data = path.read_bytes()
+    sizes = {"raw": len(data)}
+    for encoding in encodings:
+        if encoding == "gz":
+            # mtime=0 保证相同内容输出相同字节
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        elif encoding == "br" and brotli is not None:
+            compressed = brotli.compress(data, quality=11)
+        else:
+            continue
+        atomic_write_bytes(Path(f"{path}.{encoding}"), compressed)
+        sizes[encoding] = len(compressed)
+    return sizes
@@ -8,65 +8,91 @@ from pathlib import Path
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.checkpoint import CheckpointStore
 from src.config import Config
-from src.collectors.rss import RSSCollector
-from src.collectors.twitter import TwitterCollector
-from src.collectors.youtube import YouTubeCollector
-from src.collectors.reddit import RedditCollector
-from src.processors.api_mode import APIProcessor
-from src.processors.cli_mode import CLIProcessor
-from src.generators.html import HTMLGenerator
+from src.daemon import Daemon
+from src.distributed import Coordinator, Worker
+from src.pipeline import Pipeline
+from src.tracing import span, tracer
 
 
-def main():
+def main() -> int:
+    """运行一次采集和生成，返回进程退出码"""
     parser = argparse.ArgumentParser(description="热点信息聚合系统")
     parser.add_argument("--config", default=None, help="配置文件路径")
     parser.add_argument("--mode", choices=["api", "cli"], help="运行模式")
+    parser.add_argument("--force", action="store_true", help="内容未变化时也重新生成报告")
+    parser.add_argument("--resume", action="store_true",
+                        help="从上次中断运行的最后完成阶段继续（断点保存在 <state_dir>/checkpoint/）")
+    parser.add_argument("--daemon", action="store_true",
+                        help="常驻模式：各数据源按 interval_minutes 刷新，有新条目时重新生成")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="分布式采集：数据源拆分为工作单元写入任务队列，启动 N 个本地 worker 进程"
+                             "（0 表示只等待其他主机的 worker）")
+    parser.add_argument("--worker", action="store_true",
+                        help="作为 worker 领取任务队列中的工作单元（多主机时 distributed.queue_path 指向共享存储）")
+    parser.add_argument("--run-id", help=argparse.SUPPRESS)  # 协调者启动的本地 worker 只处理该运行
+    parser.add_argument("--unchanged-exit-code", type=int, default=0,
+                        help="报告内容未变化时的退出码（CI 据此跳过部署，默认 0）")
+    parser.add_argument("--profile", action="store_true",
+                        help="记录各阶段耗时，输出 Chrome Trace 时间线到 <state_dir>/profile/")
+    parser.add_argument("--cprofile", action="store_true", help="在 --profile 基础上同时输出 cProfile 数据")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="在 --profile 基础上采样进程内存，记录各阶段峰值 RSS")
     args = parser.parse_args()
 
     # 加载配置
     config = Config(args.config)
     mode = args.mode or config.mode
 
+    if args.profile or args.cprofile or args.profile_memory:
+        tracer.start(cprofile=args.cprofile, memory=args.profile_memory)
+    try:
+        if args.daemon:
+            return Daemon(args.config, args.mode, force=args.force).run()
+        if args.worker:
+            return Worker(config, args.run_id).run()
+        with span("run", category="main"):
+            return run(config, mode, args)
+    finally:
+        tracer.stop(config.state_dir / "profile")
+
+
+def run(config: Config, mode: str, args: argparse.Namespace) -> int:
+    """执行采集 -> 分析 -> AI 处理 -> 生成，返回进程退出码"""
     print(f"[Main] 运行模式: {mode}")
     print(f"[Main] 开始采集数据...")
 
-    # 采集数据
-    all_items = []
-    collectors = [
-        RSSCollector(config.get_source_config("rss")),
-        TwitterCollector(config.get_source_config("twitter")),
-        YouTubeCollector(config.get_source_config("youtube")),
-        RedditCollector(config.get_source_config("reddit")),
-    ]
-
-    for collector in collectors:
-        if collector.is_enabled():
-            print(f"[Main] 采集 {collector.name}...")
-            items = collector.collect()
-            print(f"[Main] {collector.name} 采集到 {len(items)} 条")
-            all_items.extend(items)
+    pipeline = Pipeline(config, mode)
+    try:
+        return _run(pipeline, config, args)
+    finally:
+        pipeline.close()
 
-    print(f"[Main] 共采集 {len(all_items)} 条数据")
 
-    # AI 处理
-    ai_enabled = config.ai.get('enabled', True)
-    if all_items and ai_enabled:
-        print(f"[Main] 开始 AI 处理...")
-        if mode == "cli":
-            processor = CLIProcessor(config.ai)
+def _run(pipeline: Pipeline, config: Config, args: argparse.Namespace) -> int:
+    checkpoint = CheckpointStore(config.state_dir)
+    resume = args.resume and checkpoint.resumable()
+    if resume and checkpoint.completed("collected"):
+        all_items = checkpoint.load("collected")["items"]
+        print(f"[Main] 从断点恢复: 已采集 {len(all_items)} 条，上次完成阶段 {checkpoint.last_stage()}")
+    else:
+        if not resume:
+            checkpoint.reset()
+        if args.workers is not None:
+            all_items = Coordinator(config).collect(pipeline.collectors, args.workers, pipeline.health)
         else:
-            processor = APIProcessor(config.ai)
-        all_items = processor.process(all_items)
-    elif not ai_enabled:
-        print(f"[Main] AI 处理已禁用，跳过")
+            all_items = pipeline.collect()
+        checkpoint.save("collected", all_items)
 
-    # 生成报告
-    print(f"[Main] 生成 HTML 报告...")
-    generator = HTMLGenerator(config.output)
-    output_path = generator.generate(all_items)
+    output_path, changed = pipeline.run(all_items, force=args.force, checkpoint=checkpoint, resume=resume)
+    checkpoint.clear()
+    if not changed:
+        print(f"[Main] 报告内容未变化: {output_path}")
+        return args.unchanged_exit_code
     print(f"[Main] 报告已生成: {output_path}")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
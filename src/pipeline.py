@@ -0,0 +1,178 @@
+"""
+处理流水线 - 采集 -> 关键词 -> 排序 -> 聚类 -> AI 处理 -> 生成
+
+单次运行 (main.py) 和常驻模式 (daemon.py) 共用；组件在构造时创建一次，
+常驻模式下跨轮次复用（HTTP 连接池、关键词文档频率表、Jinja 环境等保持热状态）
+"""
+from typing import Callable, List, Optional, Tuple
+
+from src.checkpoint import CheckpointStore
+from src.config import Config
+from src.collectors.base import BaseCollector, HotspotItem
+from src.collectors.health import SourceHealth
+from src.analysis.clustering import TopicClusterer
+from src.analysis.keywords import KeywordExtractor
+from src.analysis.ranking import HotspotRanker
+from src.analysis.trending import TrendTracker
+from src.processors.base import BaseProcessor
+from src.processors.cache import TranslationCache
+from src.generators.html import HTMLGenerator
+from src.registry import build_collectors, create_processor
+from src.tracing import span
+
+
+class Pipeline:
+    """一次配置对应的处理流水线"""
+
+    def __init__(self, config: Config, mode: str):
+        self.config = config
+        self.mode = mode
+        self.collectors = build_collectors(config)  # 只包含启用的数据源
+        self.health = SourceHealth(config.health, config.state_dir)
+        for collector in self.collectors:
+            collector.health = self.health
+        self.extractor = KeywordExtractor(config.keywords, config.state_dir)
+        self.ranker = HotspotRanker(config.ranking)
+        self.trends = TrendTracker(config.trending, config.state_dir, config.ranking.get('signals'))
+        self.clusterer = TopicClusterer(config.clustering)
+        self.generator = HTMLGenerator(config.output, state_dir=config.state_dir)
+        self.translations = TranslationCache(config.state_dir, config.ai.get('cache_days', 7))
+        self._processor: Optional[BaseProcessor] = None
+
+    @property
+    def processor(self) -> BaseProcessor:
+        """AI 处理器（首次使用时创建）"""
+        if self._processor is None:
+            self._processor = create_processor(self.config, self.mode)
+        return self._processor
+
+    def close(self):
+        """释放采集器的进程池和连接池、本地数据库连接（常驻模式重新加载配置时旧流水线需关闭）"""
+        for collector in self.collectors:
+            collector.close()
+        self.extractor.close()
+        self.translations.close()
+
+    def collect_from(self, collector: BaseCollector) -> List[HotspotItem]:
+        """运行单个采集器（collector.failures 只保留本次采集的请求失败）"""
+        print(f"[Main] 采集 {collector.name}...")
+        collector.failures.clear()
+        with span(f"collect:{collector.name}", category="collect") as s:
+            items = collector.collect()
+            s.set(items=len(items))
+        self.health.save()
+        print(f"[Main] {collector.name} 采集到 {len(items)} 条")
+        return items
+
+    def collect(self) -> List[HotspotItem]:
+        """运行全部启用的采集器"""
+        all_items = []
+        for collector in self.collectors:
+            if collector.is_enabled():
+                all_items.extend(self.collect_from(collector))
+        print(f"[Main] 共采集 {len(all_items)} 条数据")
+        self.health.print_summary()
+        return all_items
+
+    def run(self, all_items: List[HotspotItem], force: bool = False,
+            checkpoint: Optional[CheckpointStore] = None, resume: bool = False) -> Tuple[str, bool]:
+        """分析、AI 处理并生成报告，返回 (报告路径, 内容是否变化)
+
+        传入 checkpoint 时每个阶段完成后保存结果；resume=True 时跳过已完成的阶段，
+        AI 阶段已完成的批次直接复用
+        """
+        if resume and checkpoint.completed("processed"):
+            saved = checkpoint.load("processed")
+            print(f"[Main] 从断点恢复: AI 处理已完成")
+            all_items, keywords = saved["items"], [tuple(kw) for kw in saved["keywords"]]
+            return self.render(all_items, keywords, force)
+
+        if resume and checkpoint.completed("analyzed"):
+            saved = checkpoint.load("analyzed")
+            print(f"[Main] 从断点恢复: 分析已完成")
+            all_items, keywords = saved["items"], [tuple(kw) for kw in saved["keywords"]]
+            ai_items = [item for item in all_items if 'cluster_of' not in item.extra]
+        else:
+            all_items, ai_items, keywords = self.analyze(all_items)
+            if checkpoint is not None:
+                checkpoint.save("analyzed", all_items, keywords=keywords)
+
+        on_batch = None
+        if checkpoint is not None:
+            if resume:
+                restored = checkpoint.apply_batches(all_items)
+                if restored:
+                    print(f"[Main] 从断点恢复 {restored} 条 AI 处理结果")
+            on_batch = checkpoint.save_batch
+        self.process(ai_items, on_batch=on_batch)
+        if checkpoint is not None:
+            checkpoint.save("processed", all_items, keywords=keywords)
+
+        return self.render(all_items, keywords, force)
+
+    def analyze(self, all_items: List[HotspotItem]) -> Tuple[List[HotspotItem], List[HotspotItem], List[Tuple[str, float]]]:
+        """关键词、排序、聚类，返回 (保留的条目, 送入 LLM 的代表条目, 热门关键词)"""
+        # 本地关键词提取，结果供排序和报告使用
+        keywords = []
+        if all_items and self.extractor.is_enabled():
+            with span("keywords", category="analysis", items=len(all_items)):
+                keywords = self.extractor.extract(all_items)
+            print(f"[Main] 热门关键词: {', '.join(word for word, _ in keywords[:10])}")
+
+        # 互动增长速度（排序前对全部采集条目记录快照）
+        if all_items and self.trends.is_enabled():
+            with span("trending", category="analysis", items=len(all_items)) as s:
+                rising = self.trends.update(all_items)
+                self.trends.save()
+                s.set(rising=rising, tracked=len(self.trends.records))
+            print(f"[Main] 互动快速上升 {rising} 条（跟踪 {len(self.trends.records)} 条）")
+
+        # 本地热度排序，按分类截取 Top N
+        if all_items and self.ranker.is_enabled():
+            collected = len(all_items)
+            with span("rank", category="analysis", items=collected) as s:
+                all_items = self.ranker.rank(all_items)
+                s.set(kept=len(all_items))
+            print(f"[Main] 热度排序后保留 {len(all_items)}/{collected} 条")
+
+        # 话题聚类，每组只把代表条目送入 LLM
+        ai_items = all_items
+        if all_items and self.clusterer.is_enabled():
+            with span("cluster", category="analysis", items=len(all_items)) as s:
+                ai_items = self.clusterer.apply(all_items)
+                s.set(topics=len(ai_items))
+            print(f"[Main] 聚类为 {len(ai_items)} 个话题")
+        return all_items, ai_items, keywords
+
+    def process(self, ai_items: List[HotspotItem],
+                on_batch: Optional[Callable[[List[HotspotItem]], None]] = None):
+        """AI 处理（处理器原地更新条目）；已有翻译或翻译缓存命中的条目不再送入 LLM，on_batch 在每批完成后调用"""
+        ai_enabled = self.config.ai.get('enabled', True)
+        if ai_enabled:
+            reused = self.translations.apply(ai_items)
+            if reused:
+                print(f"[Main] 复用 {reused} 条已缓存的翻译")
+        ai_items = [item for item in ai_items if not item.translated_title]
+        if ai_items and ai_enabled:
+            print(f"[Main] 开始 AI 处理...")
+            processor = self.processor
+            processor.on_batch = on_batch
+            try:
+                with span(f"ai:{processor.name}", category="ai", items=len(ai_items)):
+                    processor.process(ai_items)
+            finally:
+                processor.on_batch = None
+                self.translations.store(ai_items)
+        elif not ai_enabled:
+            print(f"[Main] AI 处理已禁用，跳过")
+
+    def render(self, all_items: List[HotspotItem], keywords: List[Tuple[str, float]],
+               force: bool = False) -> Tuple[str, bool]:
+        """生成报告，返回 (报告路径, 内容是否变化)"""
+        print(f"[Main] 生成 HTML 报告...")
+        with span("generate", category="render", items=len(all_items)) as s:
+            rising = self.trends.rising(all_items) if self.trends.is_enabled() else []
+            output_path = self.generator.generate(all_items, keywords=keywords, force=force,
+                                                  health=self.health.summary(), rising=rising)
+            s.set(changed=self.generator.changed)
+        return output_path, self.generator.changed
@@ -2,14 +2,22 @@
 LiteLLM 统一 AI 处理器 - 支持多种模型提供商
 """
 import os
-import json
-from typing import Any, Dict, List
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 import litellm
 
 from .base import BaseProcessor
+from .parsers import parse_results
+from .profiles import load_profile
+from .scheduler import BudgetScheduler
 from src.collectors.base import HotspotItem
 from src.prompts import PromptManager
+from src.tracing import span
 
 
 class APIProcessor(BaseProcessor):
@@ -19,22 +27,62 @@ class APIProcessor(BaseProcessor):
     def name(self) -> str:
         return "api"
 
-    def __init__(self, config: Dict[str, Any]):
+    # response_format -> prompts.yaml 任务名
+    TASKS = {
+        'json': 'translate_summarize',
+        'compact': 'translate_summarize_compact',
+    }
+
+    # max_tokens 的固定开销（格式符号等）
+    BASE_TOKENS = 64
+
+    # 推理模型（思考内容计入 max_tokens）的默认思考预算；ai.reasoning_tokens 可覆盖
+    REASONING_MODELS = re.compile(r'qwen3|qwq|deepseek-r1|reasoner|glm-z1|(^|/)o[134]\b', re.IGNORECASE)
+    REASONING_TOKENS = 1536
+
+    @classmethod
+    def reasoning_tokens(cls, model: str, configured: Optional[int] = None) -> int:
+        """单次请求预留给 <think> 思考内容的 token 数，非推理模型为 0"""
+        if configured is not None:
+            return configured
+        return cls.REASONING_TOKENS if cls.REASONING_MODELS.search(model or '') else 0
+
+    def __init__(self, config: Dict[str, Any], state_dir: Optional[Path] = None):
         super().__init__(config)
         # 从环境变量获取 API Key
         api_key_env = config.get('api_key_env', 'AI_API_KEY')
         self.api_key = os.environ.get(api_key_env, '')
         self.api_base = config.get('api_base')
         self.model = config.get('model', 'openai/Qwen/Qwen3-8B')
-        self.batch_size = config.get('batch_size', 5)
         self.timeout = config.get('timeout', 120)
 
         # 初始化 Prompt 管理器
         self.prompt_manager = PromptManager()
 
-        # 批处理配置
-        self.max_batch_size = config.get('batch_size', 5)
-        self.max_title_chars = config.get('max_title_chars', 500)  # 每批最大字符数
+        # 批处理配置：模型配置档（scripts/model_tuner.py 调优结果）优先于 ai 配置，
+        # model_profiles 设为空字符串可禁用
+        profile_path = config.get('model_profiles')
+        self.profile = load_profile(self.model, profile_path) if profile_path != "" else {}
+        settings = {**config, **self.profile}
+        self.batch_size = settings.get('batch_size', 5)
+        self.max_batch_size = settings.get('batch_size', 5)
+        self.max_title_chars = settings.get('max_title_chars', 500)  # 每批最大字符数
+        self.concurrency = max(1, settings.get('concurrency', 1))  # 同时进行的批次请求数
+        self._lock = threading.Lock()
+
+        # 输出格式: json (默认) 或 compact (紧凑行格式，输出 token 更少)
+        self.response_format = config.get('response_format', 'json')
+        self.task_name = self.TASKS.get(self.response_format, 'translate_summarize')
+        task_info = self.prompt_manager.get_task_info(self.task_name) or {}
+        self.output_format = task_info.get('output_format', 'json')
+        # max_tokens 按批次条数计算，不超过 max_tokens 上限
+        self.tokens_per_item = config.get('tokens_per_item', task_info.get('tokens_per_item', 100))
+        self.max_tokens = config.get('max_tokens', 2000)
+        self.reasoning_allowance = self.reasoning_tokens(self.model, config.get('reasoning_tokens'))
+
+        # 预算调度：按优先级处理，预算用尽时停止
+        state_dir = state_dir or Path(__file__).parent.parent.parent / "data"
+        self.scheduler = BudgetScheduler(config, state_dir)
 
         # 禁用 LiteLLM 的日志输出
         litellm.suppress_debug_info = True
@@ -44,7 +92,7 @@ class APIProcessor(BaseProcessor):
         total_chars = 0
         count = 0
         for i in range(start_idx, len(items)):
-            title_len = len(items[i].title)
+            title_len = len(self._item_text(items[i]))
             if total_chars + title_len > self.max_title_chars and count > 0:
                 break
             total_chars += title_len
@@ -53,6 +101,17 @@ class APIProcessor(BaseProcessor):
                 break
         return max(1, count)
 
+    def _item_text(self, item: HotspotItem) -> str:
+        """送入 LLM 的条目文本，聚类代表条目附带相关报道标题作为摘要参考"""
+        related = item.extra.get('related_titles')
+        if not related:
+            return item.title
+        return f"{item.title}\n   [相关报道] {' | '.join(related)}"
+
+    def _calculate_max_tokens(self, batch_size: int) -> int:
+        """根据批次条数计算 max_tokens（推理模型另加思考预算）"""
+        return min(self.max_tokens, self.BASE_TOKENS + self.reasoning_allowance + self.tokens_per_item * batch_size)
+
     def process(self, items: List[HotspotItem]) -> List[HotspotItem]:
         if not items:
             return []
@@ -65,6 +124,8 @@ class APIProcessor(BaseProcessor):
         print(f"[API] 使用模型: {self.model}")
         if self.api_base:
             print(f"[API] API 地址: {self.api_base}")
+        if self.profile:
+            print(f"[API] 使用模型配置档: " + ", ".join(f"{k}={v}" for k, v in self.profile.items()))
 
         try:
             return self._batch_process(items)
@@ -73,38 +134,90 @@ class APIProcessor(BaseProcessor):
             return items
 
     def _batch_process(self, items: List[HotspotItem]) -> List[HotspotItem]:
-        """批量处理热点，支持动态批次大小和失败重试"""
+        """按优先级批量处理热点，支持动态批次大小、并发请求、失败重试和预算截止"""
         tasks = self.config.get('tasks', {})
         do_translate = tasks.get('translate', True)
         do_summarize = tasks.get('summarize', True)
 
+        ordered = self.scheduler.prioritize(items)
+        self.scheduler.start()
+        pending = []
+
+        # 动态计算批次大小
+        batches = []
         i = 0
-        total = len(items)
+        total = len(ordered)
         while i < total:
-            # 动态计算批次大小
-            batch_size = self._calculate_batch_size(items, i)
-            batch = items[i:i + batch_size]
+            batch_size = self._calculate_batch_size(ordered, i)
+            batches.append(ordered[i:i + batch_size])
+            i += batch_size
 
-            print(f"[API] 处理 {i+1}-{i+len(batch)}/{total} 条...")
-            success = self._process_batch(batch, do_translate, do_summarize)
+        next_batch = 0
+        wave: List[List[HotspotItem]] = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="llm") as pool:
+                done = 0
+                while next_batch < len(batches):
+                    # 每轮同时发出最多 concurrency 个批次
+                    wave = []
+                    while (next_batch < len(batches) and len(wave) < self.concurrency
+                           and self.scheduler.can_start_batch(in_flight=len(wave))):
+                        wave.append(batches[next_batch])
+                        next_batch += 1
+                    if not wave:
+                        break
 
-            # 如果批处理失败且批次大于1，降级为逐条处理
-            if not success and len(batch) > 1:
-                print(f"[API] 批处理失败，降级为逐条处理...")
-                for item in batch:
-                    self._process_batch([item], do_translate, do_summarize)
+                    count = sum(len(batch) for batch in wave)
+                    print(f"[API] 处理 {done+1}-{done+count}/{total} 条...")
+                    results = list(pool.map(lambda b: self._process_batch(b, do_translate, do_summarize), wave))
+                    done += count
 
-            i += batch_size
+                    # 如果批处理失败且批次大于1，降级为逐条处理；单条批次失败直接计入待处理
+                    retry = [item for batch, success in zip(wave, results) if not success and len(batch) > 1
+                             for item in batch]
+                    pending.extend(batch[0] for batch, success in zip(wave, results)
+                                   if not success and len(batch) == 1)
+                    if retry:
+                        print(f"[API] 批处理失败，降级为逐条处理...")
+                        pending.extend(self._process_singles(pool, retry, do_translate, do_summarize))
+                    wave = []
+        except BaseException:
+            # 异常中断时正在处理的批次中未完成的条目也计入待处理
+            pending.extend(item for batch in wave for item in batch if not item.translated_title)
+            raise
+        finally:
+            pending.extend(item for batch in batches[next_batch:] for item in batch)
+            pending = list({id(item): item for item in pending}.values())  # 中断时同一条目可能计入两次
+            if pending:
+                print(f"[API] 预算用尽、处理失败或中断 ({self.scheduler.usage()})，{len(pending)} 条标记为待处理")
+            self.scheduler.finish(pending)
 
         return items
 
+    def _process_singles(self, pool: ThreadPoolExecutor, items: List[HotspotItem],
+                         translate: bool, summarize: bool) -> List[HotspotItem]:
+        """逐条处理（每轮最多 concurrency 条），返回处理失败和预算用尽未处理的条目"""
+        failed = []
+        i = 0
+        while i < len(items):
+            wave = []
+            while (i < len(items) and len(wave) < self.concurrency
+                   and self.scheduler.can_start_batch(in_flight=len(wave))):
+                wave.append([items[i]])
+                i += 1
+            if not wave:
+                return failed + items[i:]
+            results = pool.map(lambda b: self._process_batch(b, translate, summarize), wave)
+            failed.extend(batch[0] for batch, success in zip(wave, results) if not success)
+        return failed
+
     def _process_batch(self, batch: List[HotspotItem], translate: bool, summarize: bool) -> bool:
         """处理单批数据，返回是否成功"""
-        titles = [item.title for item in batch]
+        titles = [self._item_text(item) for item in batch]
         content = self.prompt_manager.format_content_list(titles)
 
         prompts = self.prompt_manager.get_prompt(
-            task_name='translate_summarize',
+            task_name=self.task_name,
             model=self.model,
             variables={'content': content}
         )
@@ -114,38 +227,52 @@ class APIProcessor(BaseProcessor):
             messages.append({"role": "system", "content": prompts['system']})
         messages.append({"role": "user", "content": prompts['user']})
 
-        try:
-            response = litellm.completion(
-                model=self.model,
-                messages=messages,
-                api_key=self.api_key,
-                api_base=self.api_base,
-                max_tokens=2000
-            )
-            result_text = response.choices[0].message.content
-            return self._parse_results(batch, result_text)
-        except Exception as e:
-            print(f"[API] 批处理失败: {e}")
-            return False
+        start = time.monotonic()
+        tokens = 0
+        with span("llm_batch", category="ai", items=len(batch), model=self.model) as s:
+            try:
+                max_tokens = self._calculate_max_tokens(len(batch))
+                response = litellm.completion(
+                    model=self.model,
+                    messages=messages,
+                    api_key=self.api_key,
+                    api_base=self.api_base,
+                    max_tokens=max_tokens,
+                    timeout=self.scheduler.call_timeout(self.timeout)
+                )
+                usage = getattr(response, 'usage', None)
+                tokens = getattr(usage, 'total_tokens', 0) or 0
+                result_text = response.choices[0].message.content
+                if getattr(response.choices[0], 'finish_reason', None) == 'length':
+                    print(f"[API] 输出达到 max_tokens={max_tokens} 被截断"
+                          f"（推理模型可调大 ai.reasoning_tokens / ai.max_tokens）")
+                success = self._parse_results(batch, result_text)
+                with self._lock:
+                    self._batch_done(batch)
+                s.set(tokens=tokens, success=success)
+                return success
+            except Exception as e:
+                s.set(error=type(e).__name__)
+                print(f"[API] 批处理失败: {e}")
+                return False
+            finally:
+                # 每次调用只记录一次用量（解析失败时也计入已返回的 token）
+                self.scheduler.record(time.monotonic() - start, tokens)
 
     def _parse_results(self, batch: List[HotspotItem], result_text: str) -> bool:
         """解析AI返回结果，返回是否成功"""
         try:
-            start = result_text.find('[')
-            end = result_text.rfind(']') + 1
-            if start >= 0 and end > start:
-                json_str = result_text[start:end]
-                results = json.loads(json_str)
-                parsed_count = 0
-                for r in results:
-                    idx = r.get('index', 1) - 1
-                    if 0 <= idx < len(batch):
-                        batch[idx].translated_title = r.get('translated', '')
-                        batch[idx].summary = r.get('summary', '')
-                        parsed_count += 1
-                # 检查是否所有条目都被处理
-                return parsed_count == len(batch)
-            return False
+            results = parse_results(result_text, self.output_format)
         except Exception as e:
             print(f"[API] 解析结果失败: {e}")
             return False
+
+        parsed_count = 0
+        for index, r in results.items():
+            idx = index - 1
+            if 0 <= idx < len(batch):
+                batch[idx].translated_title = r.get('translated', '')
+                batch[idx].summary = r.get('summary', '')
+                parsed_count += 1
+        # 检查是否所有条目都被处理
+        return parsed_count == len(batch)
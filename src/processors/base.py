@@ -2,7 +2,7 @@
 AI 处理器基类
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 from src.collectors.base import HotspotItem
 
@@ -13,6 +13,8 @@ class BaseProcessor(ABC):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.model = config.get('model', 'openai/Qwen/Qwen3-8B')
+        # 每批处理完成后的回调（用于断点保存），参数为本批条目
+        self.on_batch: Optional[Callable[[List[HotspotItem]], None]] = None
 
     @property
     @abstractmethod
@@ -24,3 +26,8 @@ class BaseProcessor(ABC):
     def process(self, items: List[HotspotItem]) -> List[HotspotItem]:
         """处理热点数据，返回处理后的列表"""
         pass
+
+    def _batch_done(self, batch: List[HotspotItem]):
+        """通知一批条目已处理完成"""
+        if self.on_batch is not None:
+            self.on_batch([item for item in batch if item.translated_title or item.summary])
@@ -0,0 +1,73 @@
+"""
+翻译缓存 - 按 URL 跨运行保存 AI 翻译和摘要 (<state_dir>/translations.db)
+
+条目再次出现时直接复用，不重复请求 LLM；LLM 每次输出的措辞不同，复用也让条目
+未变化时报告内容哈希保持不变（--unchanged-exit-code 才能生效）
+"""
+import sqlite3
+import time
+from pathlib import Path
+from typing import List
+
+from src.collectors.base import HotspotItem
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    url TEXT PRIMARY KEY,
+    translated TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS translations_seen ON translations (last_seen);
+"""
+
+
+class TranslationCache:
+    """URL -> (翻译标题, 摘要)，超过 days 天未出现的条目删除；days 为 0 时禁用"""
+
+    def __init__(self, state_dir: Path, days: float = 7):
+        self.enabled = days > 0
+        self.days = days
+        self._db = None
+        if self.enabled:
+            path = Path(state_dir) / "translations.db"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path))
+            self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def apply(self, items: List[HotspotItem]) -> int:
+        """为未翻译的条目填入缓存结果，返回命中条数"""
+        if not self.enabled:
+            return 0
+        todo = {item.url: item for item in items if item.url and not item.translated_title}
+        urls = list(todo)
+        hits = []
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            hits.extend(self._db.execute(
+                f"SELECT url, translated, summary FROM translations WHERE url IN ({','.join('?' * len(chunk))})",
+                chunk))
+        for url, translated, summary in hits:
+            todo[url].translated_title = translated
+            todo[url].summary = summary
+        with self._db:
+            self._db.executemany("UPDATE translations SET last_seen = ? WHERE url = ?",
+                                 [(time.time(), url) for url, _, _ in hits])
+        return len(hits)
+
+    def store(self, items: List[HotspotItem]) -> None:
+        """保存已翻译条目的结果，并删除过期记录"""
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                [(item.url, item.translated_title, item.summary, now)
+                 for item in items if item.url and item.translated_title])
+            self._db.execute("DELETE FROM translations WHERE last_seen < ?", (now - self.days * 86400,))
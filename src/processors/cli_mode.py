@@ -7,6 +7,7 @@ from typing import Any, Dict, List
 
 from .base import BaseProcessor
 from src.collectors.base import HotspotItem
+from src.tracing import span
 
 
 class CLIProcessor(BaseProcessor):
@@ -39,15 +40,17 @@ class CLIProcessor(BaseProcessor):
         prompt = self._build_prompt(data)
 
         # 调用 Claude CLI
-        result = subprocess.run(
-            ["claude", "--print", "-p", prompt],
-            capture_output=True,
-            text=True,
-            timeout=self.timeout
-        )
+        with span("cli_call", category="ai", items=len(items)):
+            result = subprocess.run(
+                ["claude", "--print", "-p", prompt],
+                capture_output=True,
+                text=True,
+                timeout=self.timeout
+            )
 
         if result.returncode == 0:
             self._parse_results(items, result.stdout)
+            self._batch_done(items)
 
         return items
 
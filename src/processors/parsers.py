@@ -0,0 +1,79 @@
+"""
+AI 返回结果解析 - 支持 JSON 与紧凑行格式
+"""
+import json
+import re
+from typing import Callable, Dict
+
+# 解析结果: {index(从1开始): {"translated": ..., "summary": ...}}
+ParsedResults = Dict[int, Dict[str, str]]
+
+# 闭合的 <think> 块，或输出被截断时未闭合的 <think> 到结尾
+_THINK_RE = re.compile(r'<think>.*?(?:</think>|\Z)', re.DOTALL)
+_COMPACT_LINE_RE = re.compile(r'^\s*\[?(\d+)\]?[.、:)]?\s*(?:\t|\s*\|\s*|\s+)(.*)$')
+
+
+def _strip_reasoning(text: str) -> str:
+    """去掉推理模型的 <think> 块（截断在思考中的输出只剩空文本，不会把草稿当作结果）"""
+    return _THINK_RE.sub('', text or '')
+
+
+def parse_json_results(text: str) -> ParsedResults:
+    """解析 JSON 数组: [{"index": 1, "translated": "...", "summary": "..."}]
+
+    同时兼容短键 {"i": 1, "t": "...", "s": "..."}
+    """
+    text = _strip_reasoning(text)
+    start = text.find('[')
+    end = text.rfind(']') + 1
+    if start < 0 or end <= start:
+        raise ValueError("未找到 JSON 数组")
+
+    results = {}
+    for r in json.loads(text[start:end]):
+        if not isinstance(r, dict):
+            continue
+        index = int(r.get('index', r.get('i', 1)))
+        results[index] = {
+            'translated': r.get('translated', r.get('t', '')),
+            'summary': r.get('summary', r.get('s', '')),
+        }
+    return results
+
+
+def parse_compact_results(text: str) -> ParsedResults:
+    """解析紧凑行格式: 每行 `序号<TAB>翻译<TAB>摘要`
+
+    模型偶尔会把制表符替换为 ` | `，两种分隔符都接受；无法识别的行忽略
+    """
+    results = {}
+    for line in _strip_reasoning(text).splitlines():
+        match = _COMPACT_LINE_RE.match(line)
+        if not match:
+            continue
+        rest = match.group(2)
+        fields = rest.split('\t') if '\t' in rest else re.split(r'\s*\|\s*', rest)
+        fields = [f.strip() for f in fields]
+        if not fields or not fields[0]:
+            continue
+        results[int(match.group(1))] = {
+            'translated': fields[0],
+            'summary': fields[1] if len(fields) > 1 else '',
+        }
+    if not results:
+        raise ValueError("未找到有效结果行")
+    return results
+
+
+PARSERS: Dict[str, Callable[[str], ParsedResults]] = {
+    'json': parse_json_results,
+    'tsv': parse_compact_results,
+}
+
+
+def parse_results(text: str, output_format: str = 'json') -> ParsedResults:
+    """按 prompt 声明的 output_format 解析结果"""
+    parser = PARSERS.get(output_format)
+    if parser is None:
+        raise ValueError(f"未知输出格式: {output_format}")
+    return parser(text)
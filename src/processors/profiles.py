@@ -0,0 +1,56 @@
+"""
+模型配置档 - 按模型保存自动调优得到的批处理参数 (config/model_profiles.yaml)
+
+由 scripts/model_tuner.py 写入，APIProcessor 启动时按模型名加载
+"""
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import yaml
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_PATH = os.path.join(PROJECT_ROOT, 'config', 'model_profiles.yaml')
+
+# 配置档中会覆盖 ai 配置的参数
+TUNABLE_KEYS = ('batch_size', 'max_title_chars', 'concurrency')
+
+
+def _resolve(path: Optional[str]) -> str:
+    """相对路径基于项目根目录"""
+    return os.path.join(PROJECT_ROOT, path) if path else DEFAULT_PATH
+
+
+def load_profiles(path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """读取全部模型配置档 {模型名: 配置档}，文件不存在时返回空"""
+    path = _resolve(path)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return (yaml.safe_load(f) or {}).get('profiles', {}) or {}
+    except (OSError, yaml.YAMLError) as e:
+        print(f"[API] 读取模型配置档失败: {e}")
+        return {}
+
+
+def load_profile(model: str, path: Optional[str] = None) -> Dict[str, Any]:
+    """返回模型配置档中可覆盖 ai 配置的参数"""
+    profile = load_profiles(path).get(model) or {}
+    return {key: profile[key] for key in TUNABLE_KEYS if key in profile}
+
+
+def save_profile(model: str, settings: Dict[str, Any], metrics: Dict[str, Any],
+                 path: Optional[str] = None) -> None:
+    """写入（替换）一个模型的配置档，保留其他模型"""
+    path = _resolve(path)
+    profiles = load_profiles(path)
+    profiles[model] = {
+        **{key: settings[key] for key in TUNABLE_KEYS if key in settings},
+        'tuned_at': datetime.now().isoformat(timespec='seconds'),
+        'metrics': metrics,
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# 由 scripts/model_tuner.py 生成，APIProcessor 按模型名自动加载\n")
+        yaml.safe_dump({'profiles': profiles}, f, allow_unicode=True, sort_keys=False)
@@ -0,0 +1,118 @@
+"""
+AI 处理预算调度器 - 按优先级处理，时间/token 预算用尽时停止
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from src.collectors.base import HotspotItem
+
+
+class BudgetScheduler:
+    """按优先级排序待处理条目，并在预算内决定是否继续下一批"""
+
+    def __init__(self, config: Dict[str, Any], state_dir: Path):
+        budget = config.get('budget', {})
+        self.time_budget = budget.get('time_seconds', 0) or 0  # 0 表示不限制
+        self.token_budget = budget.get('tokens', 0) or 0
+        self.pending_boost = budget.get('pending_boost', 0.2)  # 上次未处理条目的优先级加成
+        self.source_weights = config.get('source_weights', {})
+        self.pending_path = Path(state_dir) / "ai_pending.json"
+
+        self.started_at: Optional[float] = None
+        self.tokens_used = 0
+        self.batch_count = 0
+        self.batch_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """开始计时"""
+        self.started_at = time.monotonic()
+        self.tokens_used = 0
+        self.batch_count = 0
+        self.batch_seconds = 0.0
+
+    def prioritize(self, items: List[HotspotItem]) -> List[HotspotItem]:
+        """按优先级（热度 × 来源权重 + 待处理加成）降序返回新列表"""
+        unscored = [item for item in items if 'hotness' not in item.extra]
+        if unscored:
+            # 只为未经过排序阶段的条目现场计算热度，排序阶段按配置权重算出的热度保持不变
+            from src.analysis.ranking import HotspotRanker
+            HotspotRanker({}).score(unscored)
+
+        pending = self.load_pending()
+        priorities = [self._priority(item, pending) for item in items]
+        order = sorted(range(len(items)), key=lambda i: priorities[i], reverse=True)
+        return [items[i] for i in order]
+
+    def _priority(self, item: HotspotItem, pending: Set[str]) -> float:
+        weight = self.source_weights.get(item.source, self.source_weights.get(item.category, 1.0))
+        priority = item.extra.get('hotness', 0.0) * weight
+        if item.url in pending:
+            priority += self.pending_boost
+        return priority
+
+    def remaining_time(self) -> Optional[float]:
+        """剩余时间(秒)，不限制时返回 None"""
+        if not self.time_budget or self.started_at is None:
+            return None
+        return self.time_budget - (time.monotonic() - self.started_at)
+
+    def call_timeout(self, default: float) -> float:
+        """单次调用超时：不超过剩余时间"""
+        remaining = self.remaining_time()
+        if remaining is None:
+            return default
+        return max(1.0, min(default, remaining))
+
+    def can_start_batch(self, in_flight: int = 0) -> bool:
+        """按已观测的平均批次耗时/token 估算，判断能否在预算内完成下一批
+
+        in_flight: 与该批同时进行、尚未记录用量的批次数（并发请求时计入 token 预估）
+        """
+        remaining = self.remaining_time()
+        if remaining is not None:
+            avg_seconds = self.batch_seconds / self.batch_count if self.batch_count else 0
+            if remaining <= avg_seconds or remaining <= 0:
+                return False
+        if self.token_budget:
+            avg_tokens = self.tokens_used / self.batch_count if self.batch_count else 0
+            if self.token_budget - self.tokens_used <= avg_tokens * (in_flight + 1):
+                return False
+        return True
+
+    def record(self, seconds: float, tokens: int) -> None:
+        """记录一次调用的耗时和 token 用量（可在多个线程中调用）"""
+        with self._lock:
+            self.batch_count += 1
+            self.batch_seconds += seconds
+            self.tokens_used += tokens or 0
+
+    def usage(self) -> str:
+        """预算使用情况描述"""
+        elapsed = time.monotonic() - self.started_at if self.started_at is not None else 0
+        parts = [f"{elapsed:.0f}s" + (f"/{self.time_budget}s" if self.time_budget else "")]
+        parts.append(f"{self.tokens_used}" + (f"/{self.token_budget}" if self.token_budget else "") + " tokens")
+        return ", ".join(parts)
+
+    def finish(self, pending_items: List[HotspotItem]) -> None:
+        """标记未处理条目为待处理，并保存供下次运行优先处理"""
+        for item in pending_items:
+            item.extra['ai_status'] = 'pending'
+        urls = [item.url for item in pending_items if item.url]
+        try:
+            self.pending_path.parent.mkdir(parents=True, exist_ok=True)
+            self.pending_path.write_text(json.dumps(urls, ensure_ascii=False), encoding="utf-8")
+        except OSError as e:
+            print(f"[API] 保存待处理列表失败: {e}")
+
+    def load_pending(self) -> Set[str]:
+        """读取上次运行遗留的待处理 URL"""
+        if not self.pending_path.exists():
+            return set()
+        try:
+            return set(json.loads(self.pending_path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            return set()
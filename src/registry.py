@@ -0,0 +1,88 @@
+"""
+组件注册表 - 数据源名称/处理器名称 -> 类，按需导入
+
+只有 config.yaml 中启用的数据源和实际使用的处理器才会被导入，
+例如关闭 AI 或使用 cli 模式时不会导入 litellm。
+
+扩展方式（优先级从高到低）:
+    1. 配置: sources.<名称>.class / ai.processor_class，值为 "模块路径:类名"
+    2. entry points: 分组 hotspot.collectors / hotspot.processors
+    3. 内置: 下方 COLLECTORS / PROCESSORS
+"""
+import importlib
+from importlib.metadata import entry_points
+from typing import Any, Dict, List, Optional
+
+from src.config import Config
+
+# 内置数据源
+COLLECTORS: Dict[str, str] = {
+    "rss": "src.collectors.rss:RSSCollector",
+    "twitter": "src.collectors.twitter:TwitterCollector",
+    "youtube": "src.collectors.youtube:YouTubeCollector",
+    "reddit": "src.collectors.reddit:RedditCollector",
+}
+
+# 内置 AI 处理器（对应运行模式）
+PROCESSORS: Dict[str, str] = {
+    "api": "src.processors.api_mode:APIProcessor",
+    "cli": "src.processors.cli_mode:CLIProcessor",
+}
+
+ENTRY_POINT_GROUPS = {"collector": "hotspot.collectors", "processor": "hotspot.processors"}
+
+_class_cache: Dict[str, type] = {}
+
+
+def load_class(spec: str) -> type:
+    """导入 "模块路径:类名" 指定的类（结果缓存）"""
+    if spec not in _class_cache:
+        module_name, _, class_name = spec.partition(":")
+        if not class_name:
+            raise ValueError(f"类路径格式应为 '模块:类名': {spec}")
+        _class_cache[spec] = getattr(importlib.import_module(module_name), class_name)
+    return _class_cache[spec]
+
+
+def _entry_point(kind: str, name: str) -> Optional[type]:
+    """查找已安装包通过 entry point 注册的组件"""
+    for ep in entry_points(group=ENTRY_POINT_GROUPS[kind]):
+        if ep.name == name:
+            return ep.load()
+    return None
+
+
+def resolve(kind: str, name: str, override: Optional[str] = None) -> type:
+    """按 配置 -> entry point -> 内置 的顺序解析组件类"""
+    if override:
+        return load_class(override)
+    builtin = (COLLECTORS if kind == "collector" else PROCESSORS).get(name)
+    if builtin is None:
+        cls = _entry_point(kind, name)
+        if cls is None:
+            raise KeyError(f"未知的{'数据源' if kind == 'collector' else '处理器'}: {name}")
+        return cls
+    return load_class(builtin)
+
+
+def build_collectors(config: Config) -> List[Any]:
+    """只导入并创建配置中启用的数据源采集器"""
+    collectors = []
+    for name, source_config in config.sources.items():
+        if not (source_config or {}).get('enabled', False):
+            continue
+        try:
+            cls = resolve("collector", name, source_config.get('class'))
+        except (KeyError, ImportError, AttributeError, ValueError) as e:
+            print(f"[Registry] 数据源 {name} 加载失败: {e}")
+            continue
+        collectors.append(cls(source_config))
+    return collectors
+
+
+def create_processor(config: Config, mode: str) -> Any:
+    """导入并创建运行模式对应的 AI 处理器"""
+    cls = resolve("processor", mode, config.ai.get('processor_class'))
+    if mode == "api":
+        return cls(config.ai, state_dir=config.state_dir)
+    return cls(config.ai)
@@ -0,0 +1,251 @@
+"""
+运行追踪 - 记录各阶段耗时，输出 Chrome Trace 格式时间线
+
+用法:
+    from src.tracing import span
+
+    with span("collect:rss", category="collect") as s:
+        items = collector.collect()
+        s.set(items=len(items))
+
+未启用时 span() 返回共享的空对象，开销只有一次属性判断；启用后每个 span
+记录两次墙钟时间和线程 CPU 时间，可以在生产环境常开。生成的 JSON 可在
+chrome://tracing 或 https://ui.perfetto.dev 中查看
+
+memory=True 时后台线程定期采样进程常驻内存 (RSS，读取 /proc/self/statm)，
+每个 span 记录区间内的峰值 rss_peak_mb，时间线中另有内存曲线
+
+常驻模式下每轮结束调用 flush() 写出该轮的时间线并清空缓冲，内存占用不随运行时长增长
+"""
+import bisect
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.generators.serialize import write_json
+
+
+class Span:
+    """一个追踪区间，set() 附加的参数会出现在时间线的 args 中"""
+
+    __slots__ = ("name", "category", "args")
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+class _NullSpan:
+    """未启用追踪时使用的空对象"""
+
+    __slots__ = ()
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss() -> Optional[int]:
+    """当前进程常驻内存（字节），平台不支持时返回 None"""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Tracer:
+    """收集 span 并输出 Chrome Trace Event JSON"""
+
+    def __init__(self):
+        self.enabled = False
+        self.events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._profiler: Optional[cProfile.Profile] = None
+        self._memory_samples: List[Tuple[float, int]] = []  # (相对时间 us, RSS 字节)
+        self._sampler: Optional[threading.Thread] = None
+        self._sampler_stop = threading.Event()
+
+    def start(self, cprofile: bool = False, memory: bool = False, memory_interval: float = 0.02):
+        """开始记录；cprofile=True 时同时运行 cProfile（开销较大，仅排查时使用），
+        memory=True 时每 memory_interval 秒采样一次 RSS
+        """
+        self.enabled = True
+        self.events = []
+        self._memory_samples = []
+        self._origin = time.perf_counter_ns()
+        if cprofile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if memory:
+            if current_rss() is None:
+                print("[Trace] 当前平台不支持读取进程内存，跳过内存采样")
+            else:
+                self._sampler_stop.clear()
+                self._sampler = threading.Thread(target=self._sample_memory, args=(memory_interval,),
+                                                 name="trace-memory", daemon=True)
+                self._sampler.start()
+
+    def _sample_memory(self, interval: float):
+        while not self._sampler_stop.is_set():
+            self._record_rss()
+            self._sampler_stop.wait(interval)
+
+    def _record_rss(self):
+        rss = current_rss()
+        if rss is not None:
+            with self._lock:
+                self._memory_samples.append(((time.perf_counter_ns() - self._origin) / 1000, rss))
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage", **args):
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+        current = Span(name, category, args)
+        sampling = self._sampler is not None
+        wall_start = time.perf_counter_ns()
+        cpu_start = time.thread_time_ns()
+        if sampling:
+            self._record_rss()  # 短于采样间隔的区间也至少有首尾两个样本
+        try:
+            yield current
+        finally:
+            if sampling:
+                self._record_rss()
+            cpu = time.thread_time_ns() - cpu_start
+            wall_end = time.perf_counter_ns()
+            current.args["cpu_ms"] = round(cpu / 1e6, 3)
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (wall_start - self._origin) / 1000,
+                "dur": (wall_end - wall_start) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": current.args,
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def stop(self, output_dir: Path, keep: int = 10) -> Optional[Path]:
+        """停止记录，写入 trace-<时间>.json（及 .prof），打印阶段汇总，返回 trace 文件路径
+
+        输出目录只保留最近 keep 次运行的文件
+        """
+        if not self.enabled:
+            return None
+        self.enabled = False
+        if self._sampler is not None:
+            self._sampler_stop.set()
+            self._sampler.join()
+            self._sampler = None
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if self._profiler is not None:
+            self._profiler.disable()
+            prof_path = self._output_path(output_dir, "profile", ".prof")
+            self._profiler.dump_stats(str(prof_path))
+            self._profiler = None
+            print(f"[Trace] cProfile: {prof_path}")
+        return self._write(output_dir, keep)
+
+    def flush(self, output_dir: Path, keep: int = 10) -> Optional[Path]:
+        """写出目前为止的 span 并清空缓冲，继续记录（常驻模式每轮调用）；没有 span 时只丢弃内存样本"""
+        if not self.enabled:
+            return None
+        if not self.events:
+            with self._lock:
+                self._memory_samples = []
+            return None
+        return self._write(Path(output_dir), keep)
+
+    def _write(self, output_dir: Path, keep: int) -> Optional[Path]:
+        with self._lock:
+            events, self.events = self.events, []
+            samples, self._memory_samples = self._memory_samples, []
+        memory_events = self._memory_events(events, samples)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        trace_path = self._output_path(output_dir, "trace", ".json")
+        write_json(trace_path, {"traceEvents": self._thread_names(events) + events + memory_events,
+                                "displayTimeUnit": "ms"})
+        self.print_summary(events=events)
+        print(f"[Trace] 时间线: {trace_path}")
+        for pattern in ("trace-*.json", "profile-*.prof"):
+            for old in sorted(output_dir.glob(pattern))[:-keep]:
+                old.unlink()
+        return trace_path
+
+    @staticmethod
+    def _output_path(output_dir: Path, prefix: str, suffix: str) -> Path:
+        """<prefix>-<时间(毫秒)><suffix>，常驻模式每轮写出一次，文件名按时间排序"""
+        now = time.time()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"-{int(now * 1000) % 1000:03d}"
+        return output_dir / f"{prefix}-{stamp}{suffix}"
+
+    @staticmethod
+    def _memory_events(events: List[Dict[str, Any]], samples: List[Tuple[float, int]]) -> List[Dict[str, Any]]:
+        """为每个 span 写入区间内峰值 rss_peak_mb，返回内存曲线事件"""
+        samples = sorted(samples)
+        times = [ts for ts, _ in samples]
+        for event in events:
+            lo = bisect.bisect_left(times, event["ts"])
+            hi = bisect.bisect_right(times, event["ts"] + event["dur"])
+            if lo < hi:
+                event["args"]["rss_peak_mb"] = round(max(rss for _, rss in samples[lo:hi]) / 1024 / 1024, 1)
+        return [{"name": "memory", "ph": "C", "ts": ts, "pid": os.getpid(),
+                 "args": {"rss_mb": round(rss / 1024 / 1024, 1)}} for ts, rss in samples]
+
+    def summary(self, events: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Dict[str, float]]:
+        """按名称汇总: {name: {count, wall_ms, cpu_ms[, rss_peak_mb]}}，缺省汇总尚未写出的 span"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for event in self.events if events is None else events:
+            entry = totals.setdefault(event["name"], {"count": 0, "wall_ms": 0.0, "cpu_ms": 0.0})
+            entry["count"] += 1
+            entry["wall_ms"] += event["dur"] / 1000
+            entry["cpu_ms"] += event["args"].get("cpu_ms", 0.0)
+            if "rss_peak_mb" in event["args"]:
+                entry["rss_peak_mb"] = max(entry.get("rss_peak_mb", 0.0), event["args"]["rss_peak_mb"])
+        return totals
+
+    def print_summary(self, limit: int = 20, events: Optional[List[Dict[str, Any]]] = None):
+        totals = sorted(self.summary(events).items(), key=lambda kv: kv[1]["wall_ms"], reverse=True)
+        memory = any("rss_peak_mb" in entry for _, entry in totals)
+        header = f"[Trace] {'阶段':<32} {'次数':>6} {'墙钟(ms)':>10} {'CPU(ms)':>10}"
+        print(header + (f" {'峰值内存(MB)':>12}" if memory else ""))
+        for name, entry in totals[:limit]:
+            line = f"[Trace] {name:<32} {entry['count']:>6} {entry['wall_ms']:>10.1f} {entry['cpu_ms']:>10.1f}"
+            if memory:
+                line += f" {entry.get('rss_peak_mb', 0.0):>12.1f}"
+            print(line)
+
+    @staticmethod
+    def _thread_names(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """线程名元数据事件，时间线中显示线程名称"""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        tids = {event["tid"] for event in events}
+        return [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                 "args": {"name": names.get(tid, f"thread-{tid}")}} for tid in sorted(tids)]
+
+
+# 进程内共享的追踪器
+tracer = Tracer()
+
+
+def span(name: str, category: str = "stage", **args):
+    """在全局追踪器上记录一个区间"""
+    return tracer.span(name, category, **args)
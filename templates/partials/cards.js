@@ -0,0 +1,47 @@
+// 卡片渲染（与 report.html 中服务端渲染的卡片结构一致）
+function createElement(tag, className, text) {
+    const el = document.createElement(tag);
+    if (className) el.className = className;
+    if (text) el.textContent = text;
+    return el;
+}
+
+function renderCard(item) {
+    const card = createElement('div', 'card');
+    card.dataset.category = item.category;
+    const header = createElement('div', 'card-header');
+    const source = createElement('span', 'card-source', item.source);
+    if (item.rising) {
+        source.appendChild(document.createTextNode(' '));
+        source.appendChild(createElement('span', 'card-rising', '↑ 上升'));
+    }
+    header.appendChild(source);
+    header.appendChild(createElement('span', 'card-date', item.published_at));
+    card.appendChild(header);
+    const title = createElement('h3', 'card-title');
+    const link = createElement('a', null, item.translated_title || item.title);
+    link.href = item.url;
+    link.target = '_blank';
+    title.appendChild(link);
+    card.appendChild(title);
+    if (item.summary) {
+        card.appendChild(createElement('p', 'card-summary', item.summary));
+    }
+    if (item.related && item.related.length) {
+        const details = createElement('details', 'card-related');
+        details.appendChild(createElement('summary', null, `另有 ${item.related.length} 条相关报道`));
+        const list = createElement('ul');
+        item.related.forEach(rel => {
+            const li = createElement('li');
+            const a = createElement('a', null, rel.title);
+            a.href = rel.url;
+            a.target = '_blank';
+            li.appendChild(a);
+            li.appendChild(createElement('span', 'related-source', rel.source));
+            list.appendChild(li);
+        });
+        details.appendChild(list);
+        card.appendChild(details);
+    }
+    return card;
+}
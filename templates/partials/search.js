@@ -0,0 +1,129 @@
+// 搜索: 首次使用时加载索引，按倒排索引求交集
+// 页面需定义 searchIndexUrls()，返回索引地址列表（或其 Promise），列表按从新到旧排列
+const CJK_RE = /^[\u3400-\u4dbf\u4e00-\u9fff\u3040-\u30ff\uac00-\ud7af]/;
+const TOKEN_RE = /[\u3400-\u4dbf\u4e00-\u9fff\u3040-\u30ff\uac00-\ud7af]+|[a-z0-9]+(?:['.][a-z0-9]+)*/g;
+const MAX_RESULTS = 50;
+const searchIndexCache = {};
+let searchSeq = 0;
+
+function loadSearchIndex(url) {
+    if (!searchIndexCache[url]) {
+        searchIndexCache[url] = fetch(url).then(r => r.json()).then(idx => {
+            idx.stopwords = new Set(idx.stopwords);
+            idx.sortedTerms = Object.keys(idx.terms).sort();
+            idx.decoded = {};
+            return idx;
+        });
+    }
+    return searchIndexCache[url];
+}
+
+function loadSearchIndexes() {
+    return Promise.resolve(searchIndexUrls()).then(urls => Promise.all(urls.map(loadSearchIndex)));
+}
+
+// 与 src/analysis/text.py 的 stem() 保持一致
+function stem(word) {
+    if (word.length <= 4 || !/^[a-z]+$/.test(word)) return word;
+    for (const suffix of ['ing', 'ed', 'es', 's']) {
+        if (word.endsWith(suffix) && !word.endsWith('ss') && word.length - suffix.length >= 3) {
+            word = word.slice(0, -suffix.length);
+            break;
+        }
+    }
+    if (word.endsWith('e') && word.length > 4) word = word.slice(0, -1);
+    return word;
+}
+
+// 与 src/analysis/text.py 的 tokenize() 保持一致
+function tokenize(text, stopwords) {
+    const tokens = [];
+    (text.toLowerCase().match(TOKEN_RE) || []).forEach(part => {
+        if (CJK_RE.test(part)) {
+            const chars = Array.from(part);
+            if (chars.length === 1) tokens.push(part);
+            for (let i = 0; i < chars.length - 1; i++) tokens.push(chars[i] + chars[i + 1]);
+        } else if (part.length > 1 && !stopwords.has(part)) {
+            tokens.push(stem(part));
+        }
+    });
+    return tokens;
+}
+
+function postings(idx, term) {
+    if (!idx.decoded[term]) {
+        let prev = 0;
+        idx.decoded[term] = (idx.terms[term] || []).map(delta => (prev += delta));
+    }
+    return idx.decoded[term];
+}
+
+// 前缀匹配（输入中的最后一个英文词），在有序词表上二分查找
+function prefixPostings(idx, prefix) {
+    const terms = idx.sortedTerms;
+    let lo = 0, hi = terms.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (terms[mid] < prefix) lo = mid + 1; else hi = mid;
+    }
+    const ids = new Set();
+    for (let i = lo; i < terms.length && terms[i].startsWith(prefix); i++) {
+        postings(idx, terms[i]).forEach(id => ids.add(id));
+    }
+    return Array.from(ids).sort((a, b) => a - b);
+}
+
+function intersect(a, b) {
+    const out = [];
+    let i = 0, j = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] === b[j]) { out.push(a[i]); i++; j++; }
+        else if (a[i] < b[j]) i++;
+        else j++;
+    }
+    return out;
+}
+
+// 在单个索引中查询，返回升序文档编号
+function queryIndex(idx, query) {
+    const tokens = tokenize(query, idx.stopwords);
+    const lastIsWord = tokens.length && !CJK_RE.test(tokens[tokens.length - 1]);
+    let ids = null;
+    tokens.forEach((token, i) => {
+        const list = (i === tokens.length - 1 && lastIsWord) ? prefixPostings(idx, token) : postings(idx, token);
+        ids = ids === null ? list : intersect(ids, list);
+    });
+    return ids || [];
+}
+
+async function runSearch(query) {
+    const seq = ++searchSeq;
+    const results = document.querySelector('.search-results');
+    const status = document.querySelector('.search-status');
+    const mainCards = document.querySelector('.main-cards');
+    if (!query.trim()) {
+        results.style.display = 'none';
+        mainCards.style.display = '';
+        status.textContent = '';
+        return;
+    }
+    const indexes = await loadSearchIndexes();
+    if (seq !== searchSeq) return;
+
+    results.innerHTML = '';
+    let total = 0;
+    let shown = 0;
+    indexes.forEach(idx => {
+        const ids = queryIndex(idx, query);
+        total += ids.length;
+        ids.slice(0, MAX_RESULTS - shown).forEach(id => {
+            const item = {related: []};
+            idx.fields.forEach((field, k) => { item[field] = idx.docs[id][k]; });
+            results.appendChild(renderCard(item));
+            shown++;
+        });
+    });
+    status.textContent = `找到 ${total} 条结果` + (total > shown ? `，显示前 ${shown} 条` : '');
+    results.style.display = 'grid';
+    mainCards.style.display = 'none';
+}
@@ -0,0 +1,12 @@
+"""
+pytest 公共设置 - 项目根目录加入导入路径，litellm 使用本地价格表（不联网）
+"""
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+FIXTURES = PROJECT_ROOT / "tests" / "fixtures"
+
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
@@ -0,0 +1,107 @@
+"""
+APIProcessor: 推理模型的 max_tokens 预算与截断输出的处理
+"""
+from types import SimpleNamespace
+
+from conftest import FIXTURES
+from src.collectors.base import HotspotItem
+from src.processors import api_mode
+from src.processors.api_mode import APIProcessor
+from src.processors.parsers import parse_results
+
+
+def make_processor(tmp_path, **config):
+    return APIProcessor({"model_profiles": "", **config}, state_dir=tmp_path)
+
+
+def test_reasoning_model_keeps_thinking_allowance(tmp_path):
+    processor = make_processor(tmp_path, model="openai/Qwen/Qwen3-8B")
+    # 5 条 JSON 批次：思考预算 + 每条输出，不低于改动前的 2000 上限
+    assert processor._calculate_max_tokens(5) == 2000
+    assert processor._calculate_max_tokens(1) >= APIProcessor.REASONING_TOKENS
+
+
+def test_non_reasoning_model_scales_with_batch(tmp_path):
+    processor = make_processor(tmp_path, model="deepseek/deepseek-chat")
+    assert processor._calculate_max_tokens(5) == APIProcessor.BASE_TOKENS + 5 * processor.tokens_per_item
+
+
+def test_reasoning_tokens_configurable(tmp_path):
+    processor = make_processor(tmp_path, model="openai/Qwen/Qwen3-8B", reasoning_tokens=0)
+    assert processor._calculate_max_tokens(5) == APIProcessor.BASE_TOKENS + 5 * processor.tokens_per_item
+
+
+def test_truncated_thinking_is_not_parsed_as_results():
+    """输出截断在 <think> 中时，思考里草拟的 JSON 不能当作结果"""
+    text = (FIXTURES / "llm" / "translate_json_truncated.txt").read_text(encoding="utf-8")
+    try:
+        results = parse_results(text, "json")
+    except ValueError:
+        results = {}
+    assert results == {}
+
+
+def test_truncated_batch_falls_back_to_singles(tmp_path, monkeypatch):
+    truncated = (FIXTURES / "llm" / "translate_json_truncated.txt").read_text(encoding="utf-8")
+    complete = (FIXTURES / "llm" / "translate_json.txt").read_text(encoding="utf-8")
+    calls = []
+
+    def completion(**kwargs):
+        calls.append(kwargs["max_tokens"])
+        text = truncated if len(calls) == 1 else complete
+        reason = "length" if len(calls) == 1 else "stop"
+        return SimpleNamespace(usage=SimpleNamespace(total_tokens=kwargs["max_tokens"]),
+                               choices=[SimpleNamespace(message=SimpleNamespace(content=text), finish_reason=reason)])
+
+    monkeypatch.setattr(api_mode.litellm, "completion", completion)
+    monkeypatch.setenv("AI_API_KEY", "test")
+    processor = make_processor(tmp_path, model="openai/Qwen/Qwen3-8B", budget={"time_seconds": 0})
+    items = [HotspotItem(title=f"title {i}", url=f"https://example.com/{i}", source="s", category="c")
+             for i in range(5)]
+    processor.process(items)
+
+    assert calls[0] == 2000
+    assert len(calls) == 6  # 整批截断后逐条重试
+    assert all(item.translated_title for item in items)
+
+
+def test_failed_singles_are_marked_pending(tmp_path, monkeypatch):
+    """整批失败、逐条重试也失败的条目计入待处理，下次运行优先处理"""
+    complete = (FIXTURES / "llm" / "translate_json.txt").read_text(encoding="utf-8")
+
+    def completion(**kwargs):
+        if "title 3" in kwargs["messages"][-1]["content"]:
+            raise RuntimeError("upstream error")
+        return SimpleNamespace(usage=SimpleNamespace(total_tokens=10),
+                               choices=[SimpleNamespace(message=SimpleNamespace(content=complete), finish_reason="stop")])
+
+    monkeypatch.setattr(api_mode.litellm, "completion", completion)
+    monkeypatch.setenv("AI_API_KEY", "test")
+    processor = make_processor(tmp_path, model="deepseek/deepseek-chat")
+    items = [HotspotItem(title=f"title {i}", url=f"https://example.com/{i}", source="s", category="c")
+             for i in range(5)]
+    processor.process(items)
+
+    assert [item.extra.get('ai_status') for item in items].count('pending') == 1
+    assert items[3].extra['ai_status'] == 'pending'
+    assert processor.scheduler.load_pending() == {"https://example.com/3"}
+
+
+def test_usage_recorded_once_when_parsing_fails(tmp_path, monkeypatch):
+    def completion(**kwargs):
+        return SimpleNamespace(usage=SimpleNamespace(total_tokens=123),
+                               choices=[SimpleNamespace(message=SimpleNamespace(content="x"), finish_reason="stop")])
+
+    def broken_done(batch):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(api_mode.litellm, "completion", completion)
+    monkeypatch.setenv("AI_API_KEY", "test")
+    processor = make_processor(tmp_path, model="deepseek/deepseek-chat")
+    monkeypatch.setattr(processor, "_parse_results", lambda batch, text: True)
+    monkeypatch.setattr(processor, "_batch_done", broken_done)
+    processor.scheduler.start()
+    item = HotspotItem(title="title", url="https://example.com/", source="s", category="c")
+    assert not processor._process_batch([item], True, True)
+    assert processor.scheduler.batch_count == 1
+    assert processor.scheduler.tokens_used == 123
@@ -0,0 +1,79 @@
+"""
+常驻模式: 数据源刷新失败时保留上一轮条目，单个数据源或生成出错不终止主循环
+"""
+from typing import List
+
+import yaml
+
+from src.collectors.base import BaseCollector, HotspotItem
+from src.daemon import Daemon
+
+
+class StubCollector(BaseCollector):
+    """按脚本返回结果的采集器：列表为条目，字符串为请求失败"""
+
+    def __init__(self, results):
+        super().__init__({"enabled": True, "interval_minutes": 1})
+        self.results = list(results)
+
+    @property
+    def name(self) -> str:
+        return "stub"
+
+    def collect(self) -> List[HotspotItem]:
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        if isinstance(result, str):
+            self.failures["stub:feed"] = result
+            return []
+        return result
+
+
+def make_daemon(tmp_path, collector, **daemon):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({"state_dir": str(tmp_path / "data"), "daemon": daemon}), encoding="utf-8")
+    instance = Daemon(str(path), mode="api")
+    instance.pipeline.collectors = [collector]
+    return instance
+
+
+def item(n: int) -> HotspotItem:
+    return HotspotItem(title=f"item {n}", url=f"https://example.com/{n}", source="stub", category="test")
+
+
+def test_failed_refresh_keeps_previous_items(tmp_path):
+    collector = StubCollector([[item(1), item(2)], "ReadTimeout", [], [item(3)]])
+    daemon = make_daemon(tmp_path, collector)
+    daemon._refresh(collector, now=0)
+    daemon._refresh(collector, now=60)
+    assert [i.url for i in daemon.pool["stub"]] == ["https://example.com/1", "https://example.com/2"]
+    daemon._refresh(collector, now=120)  # 熔断跳过：无失败记录但结果为空
+    assert len(daemon.pool["stub"]) == 2
+    daemon._refresh(collector, now=180)
+    assert [i.url for i in daemon.pool["stub"]] == ["https://example.com/3"]
+
+
+def test_previous_items_expire_after_stale_hours(tmp_path):
+    collector = StubCollector([[item(1)], "ReadTimeout", "ReadTimeout"])
+    daemon = make_daemon(tmp_path, collector, stale_hours=1)
+    daemon._refresh(collector, now=0)
+    daemon._refresh(collector, now=1800)
+    assert len(daemon.pool["stub"]) == 1
+    daemon._refresh(collector, now=3601)
+    assert daemon.pool["stub"] == []
+
+
+def test_tick_survives_collector_and_generator_errors(tmp_path, monkeypatch):
+    collector = StubCollector([[item(1)], RuntimeError("boom")])
+    daemon = make_daemon(tmp_path, collector)
+
+    def broken_run(items, force=False):
+        raise RuntimeError("LLM down")
+
+    monkeypatch.setattr(daemon.pipeline, "run", broken_run)
+    daemon.tick(now=0)
+    assert daemon.dirty  # 生成失败，下一轮重试
+    daemon.tick(now=3600)
+    assert len(daemon.pool["stub"]) == 1
+    assert daemon.next_due["stub"] == 3600 + 60
@@ -0,0 +1,91 @@
+"""
+分布式采集: 数据源请求失败（采集器内部吞掉异常、返回空列表）的工作单元重新排队
+"""
+import functools
+import http.server
+import socket
+import threading
+
+import yaml
+
+from conftest import FIXTURES
+from src.collectors.health import SourceHealth
+from src.collectors.reddit import RedditCollector
+from src.collectors.rss import RSSCollector
+from src.config import Config
+from src.distributed import DONE, FAILED, LEASED, PENDING, Coordinator, Worker
+
+
+def make_config(tmp_path, **distributed):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({"state_dir": str(tmp_path / "data"), "distributed": distributed}),
+                    encoding="utf-8")
+    return Config(str(path))
+
+
+def closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def reddit(base_url):
+    return RedditCollector({"enabled": True, "subreddits": ["artificial"], "base_url": base_url})
+
+
+def test_failing_source_is_requeued_until_max_attempts(tmp_path):
+    config = make_config(tmp_path, max_attempts=2)
+    collector = reddit(f"http://127.0.0.1:{closed_port()}")
+    coordinator = Coordinator(config)
+    run_id = coordinator.queue.create_run(coordinator.plan([collector]))
+    worker = Worker(config, run_id)
+
+    worker.execute(worker.queue.claim(worker.worker_id, run_id))
+    assert worker.queue.progress(run_id)[PENDING] == 1
+
+    worker.execute(worker.queue.claim(worker.worker_id, run_id))
+    assert worker.queue.progress(run_id)[FAILED] == 1
+    items, keys, failed = worker.queue.results(run_id)
+    assert items == [] and failed[0]["attempts"] == 2
+    assert "reddit:r/artificial" in failed[0]["error"]
+
+
+def test_complete_requires_lease_owner(tmp_path):
+    config = make_config(tmp_path)
+    coordinator = Coordinator(config)
+    run_id = coordinator.queue.create_run(coordinator.plan([reddit("http://127.0.0.1:1")]))
+    unit = coordinator.queue.claim("worker-a", run_id)
+
+    assert not coordinator.queue.complete(unit["id"], "worker-b", [], [])
+    assert coordinator.queue.progress(run_id)[LEASED] == 1
+    assert coordinator.queue.complete(unit["id"], "worker-a", [], [])
+    assert coordinator.queue.progress(run_id)[DONE] == 1
+
+
+def test_open_circuit_does_not_requeue_unit(tmp_path):
+    """熔断中的订阅源不算请求失败：单元一次完成，其余订阅源的结果照常提交"""
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(FIXTURES / "rss"))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    config = make_config(tmp_path, max_attempts=3)
+    health = SourceHealth(config.health, config.state_dir)
+    health.allow("rss:dead")
+    for _ in range(health.failure_threshold):
+        health.record_failure("rss:dead", "ConnectionError")
+    health.save()
+    try:
+        collector = RSSCollector({"enabled": True, "feeds_per_unit": 2, "feeds": [
+            {"name": "frontpage", "url": f"http://127.0.0.1:{server.server_port}/frontpage.xml"},
+            {"name": "dead", "url": f"http://127.0.0.1:{closed_port()}/feed.xml"},
+        ]})
+        coordinator = Coordinator(config)
+        run_id = coordinator.queue.create_run(coordinator.plan([collector]))
+        worker = Worker(config, run_id)
+        worker.execute(worker.queue.claim(worker.worker_id, run_id))
+    finally:
+        server.shutdown()
+
+    assert worker.queue.progress(run_id)[DONE] == 1
+    items, keys, failed = worker.queue.results(run_id)
+    assert items and failed == []
+    assert {"rss:frontpage", "rss:dead"} <= set(keys)
@@ -0,0 +1,35 @@
+"""
+RSS 解析: 快速路径与 feedparser 路径对同一文档得到相同的 HotspotItem
+"""
+import pytest
+
+from conftest import FIXTURES
+from src.collectors.feed_parse import _feedparser_parse, clean_text, fast_parse_feed
+from src.collectors.rss import RSSCollector
+
+FEEDS = ["frontpage.xml", "ai.atom.xml", "markup.rss.xml", "markup.atom.xml"]
+
+
+def build(entries):
+    return RSSCollector({"enabled": True})._build_items({"name": "fixture", "category": "RSS"}, entries)
+
+
+@pytest.mark.parametrize("name", FEEDS)
+def test_fast_path_matches_feedparser(name):
+    content = (FIXTURES / "rss" / name).read_bytes()
+    fast = build(fast_parse_feed(content, 100))  # 快速路径失败时抛出异常，不会静默回退
+    assert fast and fast == build(_feedparser_parse(content, 100))
+
+
+def test_titles_are_plain_text():
+    entries = fast_parse_feed((FIXTURES / "rss" / "markup.rss.xml").read_bytes(), 100)
+    assert [entry["title"] for entry in entries] == [
+        "AT&T unveils new model",
+        "Open-source agents & the developer’s toolkit",
+        "Benchmarks: 5 < 6 and other surprises",
+    ]
+    assert entries[0]["author"] == "Jane & John" and entries[0]["tags"] == ["R&D"]
+
+
+def test_clean_text_unescapes_once():
+    assert clean_text("&amp;amp; <b>x</b>") == "&amp; x"
@@ -0,0 +1,23 @@
+"""
+TrendTracker: 记录按快照时间排列，过期记录从头部删除
+"""
+from src.collectors.base import HotspotItem
+from src.analysis.trending import TrendTracker
+
+
+def item(n: int, score: int) -> HotspotItem:
+    return HotspotItem(title=f"item {n}", url=f"https://example.com/{n}", source="s", category="c",
+                       extra={"score": score})
+
+
+def test_short_interval_keeps_record_order(tmp_path):
+    tracker = TrendTracker({"forget_hours": 1, "min_interval_minutes": 10}, tmp_path)
+    tracker.update([item(1, 100)], now=0)
+    tracker.update([item(2, 100)], now=1800)
+    tracker.update([item(1, 120)], now=2100)  # 距上次快照 35 分钟，正常更新并移到末尾
+    tracker.update([item(2, 110)], now=2200)  # 距上次快照不足 10 分钟，不更新
+    assert list(tracker.records) == ["https://example.com/2", "https://example.com/1"]
+    assert [r["t"] for r in tracker.records.values()] == sorted(r["t"] for r in tracker.records.values())
+
+    tracker.update([], now=1800 + 3601)  # item 2 已过期，item 1 仍在窗口内
+    assert list(tracker.records) == ["https://example.com/1"]